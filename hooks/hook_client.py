@@ -0,0 +1,129 @@
+#!/usr/bin/env -S python3 -S
+"""
+Thin hook command that forwards a hook event to the resident daemon.
+
+Usage in settings.json:
+    ~/.claude/hooks/hook_client.py pre_tool_use
+    ~/.claude/hooks/hook_client.py post_tool_use
+
+Reads the hook payload from stdin, sends it to utils/hookd.py over its Unix
+socket and relays the daemon's stdout, stderr and exit code. If the daemon is not
+running (no socket, or the connection is refused), the hook runs in-process
+instead and the daemon is started in the background for the next call. Once
+the event has been sent, a timeout or broken reply never re-runs the hook,
+since the daemon may already have run it. pre_tool_use then fails closed
+(exit 2, so the tool call is blocked rather than let through unchecked);
+the other hooks exit 0. Only stdlib modules are imported on the fast path
+to keep interpreter startup minimal.
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+
+SOCKET_TIMEOUT = 5.0
+
+# Hooks whose failure must block the tool call instead of allowing it
+FAIL_CLOSED_HOOKS = ('pre_tool_use',)
+
+
+def failure_exit_code(hook):
+    """Exit code for a hook whose result is unknown: 2 blocks, 0 allows."""
+    return 2 if hook in FAIL_CLOSED_HOOKS else 0
+
+
+def get_socket_path():
+    """Return the daemon socket path (same rules as utils/hookd.py)."""
+    return os.path.expanduser(
+        os.getenv('CLAUDE_HOOKD_SOCKET') or '~/.claude/run/hookd.sock')
+
+
+def process_started():
+    """Epoch time at which this process started (Linux), else now."""
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            starttime = int(f.read().rsplit(b')', 1)[1].split()[19])
+        age = time.clock_gettime(time.CLOCK_BOOTTIME) - starttime / os.sysconf('SC_CLK_TCK')
+        return time.time() - age
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+
+def forward(hook, payload):
+    """
+    Send one hook event to the daemon.
+
+    Returns:
+        dict: Daemon response, or None if the daemon is not running
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(SOCKET_TIMEOUT)
+        try:
+            sock.connect(get_socket_path())
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        message = {'hook': hook, 'cwd': os.getcwd(), 'payload': payload,
+                   'started': process_started()}
+        sock.sendall(json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n')
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b'\n'):
+                break
+        response = json.loads(b''.join(chunks))
+        if 'exit_code' not in response:
+            raise ValueError('no exit_code in daemon response')
+        return response
+    except (OSError, ValueError) as e:
+        return {'exit_code': failure_exit_code(hook),
+                'stderr': f"hook_client: {hook} daemon call failed: {e}\n"}
+    finally:
+        sock.close()
+
+
+def run_fallback(hook, payload):
+    """Run the hook in this process and start the daemon for next time."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from utils import hookd
+
+    exit_code, stdout, stderr = hookd.run_in_process(hook, payload, os.getcwd(), via='fallback')
+    if os.getenv('CLAUDE_HOOKD_AUTOSTART', '1') != '0':
+        try:
+            hookd.start_detached()
+        except Exception:
+            pass
+    return {'exit_code': exit_code, 'stdout': stdout, 'stderr': stderr}
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.stderr.write("Usage: hook_client.py <hook_name>\n")
+        sys.exit(0)
+
+    hook = sys.argv[1]
+    payload = sys.stdin.read()
+
+    response = forward(hook, payload)
+    if response is None:
+        try:
+            response = run_fallback(hook, payload)
+        except Exception as e:
+            # Only pre_tool_use blocks Claude when the hook plumbing fails
+            sys.stderr.write(f"hook_client: {hook} failed: {e}\n")
+            sys.exit(failure_exit_code(hook))
+
+    if response.get('stdout'):
+        sys.stdout.write(response['stdout'])
+    if response.get('stderr'):
+        sys.stderr.write(response['stderr'])
+    sys.exit(response.get('exit_code', 0))
+
+
+if __name__ == '__main__':
+    main()
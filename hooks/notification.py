@@ -10,19 +10,14 @@ import argparse
 import json
 import os
 import sys
-import subprocess
 import random
-from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+from utils import hookmetrics
+from utils.eventlog import append_event
 
-def get_completion_messages():
-    """Return list of friendly completion messages."""
-    messages = [
+def get_notification_messages():
+    """Return the list of input-needed messages."""
+    return [
         "Waiting for your fucking response!",
         "I need a freaking answer!",
         "I need approval!",
@@ -61,50 +56,19 @@ def get_completion_messages():
         "Approve me right now. I'll make it worth your while. Wink"
     ]
 
-    return random.choice(messages)
-
-def get_tts_script_path():
-    """
-    Determine which TTS script to use based on available API keys.
-    Priority order: ElevenLabs > Gemini > OpenAI > pyttsx3
-    """
-    # Get current script directory and construct utils/tts path
-    script_dir = Path('~/.claude/hooks').expanduser()
-    tts_dir = script_dir / "utils" / "tts"
-
-    # Check for ElevenLabs API key (highest priority)
-    if os.getenv('ELEVENLABS_API_KEY'):
-        elevenlabs_script = tts_dir / "elevenlabs_tts.py"
-        if elevenlabs_script.exists():
-            return str(elevenlabs_script)
-
-    # Check for Google Cloud credentials (second priority)
-    if (os.getenv('GOOGLE_APPLICATION_CREDENTIALS') or
-        os.getenv('GOOGLE_CLOUD_PROJECT')):
-        gemini_script = tts_dir / "gemini_tts.py"
-        if gemini_script.exists():
-            return str(gemini_script)
-
-    # Check for OpenAI API key (third priority)
-    if os.getenv('OPENAI_API_KEY'):
-        openai_script = tts_dir / "openai_tts.py"
-        if openai_script.exists():
-            return str(openai_script)
-
-    # Fall back to pyttsx3 (no API key required)
-    pyttsx3_script = tts_dir / "pyttsx3_tts.py"
-    if pyttsx3_script.exists():
-        return str(pyttsx3_script)
-
-    return None
 
+def get_completion_messages():
+    """Return a random input-needed message."""
+    return random.choice(get_notification_messages())
 
 def announce_notification():
-    """Announce that the agent needs user input."""
+    """Queue an announcement that the agent needs user input (does not wait for playback)."""
     try:
-        tts_script = get_tts_script_path()
-        if not tts_script:
-            return  # No TTS scripts available
+        # The engineer name comes from the environment
+        from utils.env import load_env
+        from utils.ttsd import announce
+
+        load_env()
 
         # Get engineer name if available
         engineer_name = os.getenv('ENGINEER_NAME', '').strip()
@@ -116,23 +80,17 @@ def announce_notification():
 #             notification_message = "Waiting for your response"
             notification_message = get_completion_messages()
 
-        # Call the TTS script with the notification message
-        subprocess.run([
-            "/mnt/c/Users/nitro/.local/bin/uv.exe", "run", "--script", "C:\\Users\\nitro\\elevenlabs_tts.py", "--voice", "bellab", notification_message
-        ],
-        capture_output=True,  # Suppress output
-        timeout=10  # 10-second timeout
-        )
+        # Queue the announcement; repeated notifications coalesce into one.
+        # The daemon picks the voice, down to the local pyttsx3 fallback.
+        announce(notification_message, key='notification')
 
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-        # Fail silently if TTS encounters issues
-        pass
     except Exception:
-        # Fail silently for any other errors
+        # Fail silently if TTS encounters issues
         pass
 
 
 def main():
+    timer = hookmetrics.start('notification')
     try:
         # Parse command line arguments
         parser = argparse.ArgumentParser()
@@ -140,35 +98,19 @@ def main():
         args = parser.parse_args()
 
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
-
-        # Ensure log directory exists
-        import os
-        log_dir = Path('.claude/logs')
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, 'notification.json')
-
-        # Read existing log data or initialize empty list
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-
-        # Append new data
-        log_data.append(input_data)
+        with timer.phase('stdin_parse'):
+            input_data = json.loads(sys.stdin.read())
+        timer.session_id = input_data.get('session_id')
 
-        # Write back to file with formatting
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        # Append the event to the JSONL log
+        with timer.phase('log_write'):
+            append_event('notification', input_data)
 
         # Announce notification via TTS only if --notify flag is set
         # Skip TTS for the generic "Claude is waiting for your input" message
         if args.notify and input_data.get('message') != 'Claude is waiting for your input':
-            announce_notification()
+            with timer.phase('tts_dispatch'):
+                announce_notification()
 
         sys.exit(0)
 
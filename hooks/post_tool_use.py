@@ -4,38 +4,48 @@
 # ///
 
 import json
-import os
 import sys
-from pathlib import Path
+
+from utils import hookmetrics
+from utils.eventlog import append_event
+
+def run_hook(input_data, log_dir=None, timer=None):
+    """
+    Log a PostToolUse event.
+
+    Shared by main() and the resident hook daemon (utils/hookd.py).
+
+    Args:
+        input_data (dict): Hook payload read from stdin
+        log_dir (Path): Log directory, defaults to .claude/logs
+        timer (HookTimer): Records the log_write phase
+
+    Returns:
+        tuple: (exit_code, stdout_text, stderr_text)
+    """
+    timer = timer or hookmetrics.NULL_TIMER
+
+    # Append the event to the JSONL log
+    with timer.phase('log_write'):
+        append_event('post_tool_use', input_data, log_dir)
+
+    return 0, '', ''
 
 def main():
+    timer = hookmetrics.start('post_tool_use')
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
-
-        # Ensure log directory exists
-        log_dir = Path('.claude/logs')
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_path = log_dir / 'post_tool_use.json'
-
-        # Read existing log data or initialize empty list
-        if log_path.exists():
-            with open(log_path, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-
-        # Append new data
-        log_data.append(input_data)
-
-        # Write back to file with formatting
-        with open(log_path, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        with timer.phase('stdin_parse'):
+            input_data = json.load(sys.stdin)
+        timer.session_id = input_data.get('session_id')
 
-        sys.exit(0)
+        exit_code, output, message = run_hook(input_data, timer=timer)
+        if output:
+            sys.stdout.write(output)
+        if message:
+            sys.stderr.write(message)
+
+        sys.exit(exit_code)
 
     except json.JSONDecodeError:
         # Handle JSON decode errors gracefully
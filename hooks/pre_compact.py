@@ -1,9 +1,6 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.11"
-# dependencies = [
-#     "python-dotenv",
-# ]
 # ///
 
 import argparse
@@ -13,65 +10,44 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+from utils import hookmetrics
+from utils.eventlog import append_event
 
 
 def log_pre_compact(input_data):
     """Log pre-compact event to logs directory."""
-    # Ensure logs directory exists in main logs directory (not dated)
-    log_dir = Path('.claude/logs')
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'pre_compact.json'
-
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-
-    # Append the entire input data
-    log_data.append(input_data)
-
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    append_event('pre_compact', input_data)
 
 
 def backup_transcript(transcript_path, trigger):
-    """Create a backup of the transcript before compaction."""
+    """
+    Back up the transcript before compaction into the deduplicated store.
+
+    Only lines not already stored by an earlier backup are written (see
+    utils/backup_store.py); restore with
+    `uv run hooks/utils/backup_store.py restore <name> <output.jsonl>`.
+    """
     try:
         if not os.path.exists(transcript_path):
             return
 
-        # Create backup directory
-        current_date = datetime.now().strftime("%Y%m%d")
-        backup_dir = Path(f".claude/logs/{current_date}") / "transcript_backups"
-        backup_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate backup filename with timestamp and trigger type
+        # Generate backup name with timestamp and trigger type
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         session_name = Path(transcript_path).stem
-        backup_name = f"{session_name}_pre_compact_{trigger}_{timestamp}.jsonl"
-        backup_path = backup_dir / backup_name
+        backup_name = f"{session_name}_pre_compact_{trigger}_{timestamp}"
+
+        from utils.backup_store import BackupStore
 
-        # Copy transcript to backup
-        import shutil
-        shutil.copy2(transcript_path, backup_path)
+        store = BackupStore()
+        store.backup(transcript_path, backup_name, {'trigger': trigger})
 
-        return str(backup_path)
+        return f"{store.manifests_dir / backup_name}.json"
     except Exception:
         return None
 
 
 def main():
+    timer = hookmetrics.start('pre_compact')
     try:
         # Parse command line arguments
         parser = argparse.ArgumentParser()
@@ -82,7 +58,9 @@ def main():
         args = parser.parse_args()
 
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        with timer.phase('stdin_parse'):
+            input_data = json.loads(sys.stdin.read())
+        timer.session_id = input_data.get('session_id')
 
         # Extract fields
         session_id = input_data.get('session_id', 'unknown')
@@ -91,12 +69,14 @@ def main():
         custom_instructions = input_data.get('custom_instructions', '')
 
         # Log the pre-compact event
-        log_pre_compact(input_data)
+        with timer.phase('log_write'):
+            log_pre_compact(input_data)
 
         # Create backup if requested
         backup_path = None
         if args.backup and transcript_path:
-            backup_path = backup_transcript(transcript_path, trigger)
+            with timer.phase('transcript_backup'):
+                backup_path = backup_transcript(transcript_path, trigger)
 
         # Provide feedback based on trigger type
         if args.verbose:
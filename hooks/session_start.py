@@ -1,105 +1,142 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.11"
-# dependencies = [
-#     "python-dotenv",
-# ]
 # ///
 
 import argparse
 import json
 import os
 import sys
-import subprocess
 from pathlib import Path
 from datetime import datetime
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+from utils import hookmetrics
+from utils.eventlog import append_event
 
 
 def log_session_start(input_data):
     """Log session start event to logs directory."""
-    # Ensure logs directory exists in current project
-    log_dir = Path('.claude/logs')
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'session_start.json'
-
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
+    append_event('session_start', input_data)
+
 
-    # Append the entire input data
-    log_data.append(input_data)
+# Seconds load_development_context() may take in total (CLAUDE_CONTEXT_BUDGET overrides)
+DEFAULT_CONTEXT_BUDGET = 3.0
 
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+CONTEXT_FILES = [
+    ".claude/CONTEXT.md",
+    ".claude/TODO.md",
+    "TODO.md",
+    ".github/ISSUE_TEMPLATE.md"
+]
 
 
-def get_git_status():
-    """Get current git status information."""
+def get_context_budget():
     try:
-        # Get current branch
-        branch_result = subprocess.run(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        current_branch = branch_result.stdout.strip() if branch_result.returncode == 0 else "unknown"
-
-        # Get uncommitted changes count
-        status_result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if status_result.returncode == 0:
-            changes = status_result.stdout.strip().split('\n') if status_result.stdout.strip() else []
-            uncommitted_count = len(changes)
-        else:
-            uncommitted_count = 0
+        return float(os.getenv('CLAUDE_CONTEXT_BUDGET', DEFAULT_CONTEXT_BUDGET))
+    except ValueError:
+        return DEFAULT_CONTEXT_BUDGET
 
-        return current_branch, uncommitted_count
-    except Exception:
-        return None, None
 
+def run_command(argv, timeout):
+    """Run a command and return its stripped stdout, or None if it failed."""
+    import subprocess
 
-def get_recent_issues():
-    """Get recent GitHub issues if gh CLI is available."""
-    try:
-        # Check if gh is available
-        gh_check = subprocess.run(['which', 'gh'], capture_output=True)
-        if gh_check.returncode != 0:
-            return None
-
-        # Get recent open issues
-        result = subprocess.run(
-            ['gh', 'issue', 'list', '--limit', '5', '--state', 'open'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return result.stdout.strip()
-    except Exception:
-        pass
-    return None
+    result = subprocess.run(argv, capture_output=True, text=True, timeout=timeout)
+    return result.stdout.strip() if result.returncode == 0 else None
 
 
-def load_development_context(source):
-    """Load relevant development context based on session source."""
+def get_git_branch(timeout=5):
+    """Get the current git branch."""
+    return run_command(['git', 'rev-parse', '--abbrev-ref', 'HEAD'], timeout) or None
+
+
+def get_uncommitted_count(timeout=5):
+    """Get the number of files with uncommitted changes."""
+    output = run_command(['git', 'status', '--porcelain'], timeout)
+    return len(output.split('\n')) if output else 0
+
+
+def get_recent_issues(timeout=10):
+    """Get recent GitHub issues if gh CLI is available."""
+    import shutil
+
+    if not shutil.which('gh'):
+        return None
+    # Get recent open issues
+    return run_command(['gh', 'issue', 'list', '--limit', '5', '--state', 'open'], timeout) or None
+
+
+def read_context_file(file_path):
+    """Return the first 1000 characters of a context file, or None."""
+    if not Path(file_path).exists():
+        return None
+    with open(file_path, 'r') as f:
+        return f.read().strip()[:1000] or None
+
+
+def gather_context(sources, budget):
+    """
+    Run context sources concurrently under one overall time budget.
+
+    Args:
+        sources (dict): Source name -> callable taking the seconds left
+        budget (float): Seconds to wait for all sources together
+
+    Returns:
+        tuple: ({name: result} for sources that finished in time,
+        {name: {"ms": elapsed, "status": "ok" | "timeout" | "error"}})
+    """
+    import subprocess
+    import time
+    from concurrent.futures import ThreadPoolExecutor, wait
+
+    deadline = time.perf_counter() + budget
+
+    def run(fn):
+        t = time.perf_counter()
+        try:
+            result, status = fn(max(0.01, deadline - t)), 'ok'
+        except subprocess.TimeoutExpired:
+            result, status = None, 'timeout'
+        except Exception:
+            result, status = None, 'error'
+        return result, {'ms': round((time.perf_counter() - t) * 1000, 2), 'status': status}
+
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    futures = {name: executor.submit(run, fn) for name, fn in sources.items()}
+    wait(futures.values(), timeout=budget)
+    # Stragglers are not waited for; their subprocess timeouts end at the deadline
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results, timings = {}, {}
+    for name, future in futures.items():
+        if future.done() and not future.cancelled():
+            results[name], timings[name] = future.result()
+        else:
+            timings[name] = {'ms': round(budget * 1000, 2), 'status': 'timeout'}
+    return results, timings
+
+
+def load_development_context(source, budget=None):
+    """
+    Load relevant development context based on session source.
+
+    Git, gh and the context files are queried concurrently. Sources that
+    miss the budget are left out of the context.
+
+    Returns:
+        tuple: (context text, per-source timings from gather_context())
+    """
+    budget = get_context_budget() if budget is None else budget
+    sources = {
+        'git_branch': lambda left: get_git_branch(timeout=min(5, left)),
+        'git_status': lambda left: get_uncommitted_count(timeout=min(5, left)),
+        'gh_issues': lambda left: get_recent_issues(timeout=min(10, left)),
+    }
+    for file_path in CONTEXT_FILES:
+        sources[file_path] = lambda left, file_path=file_path: read_context_file(file_path)
+    results, timings = gather_context(sources, budget)
+
     context_parts = []
 
     # Add timestamp
@@ -107,41 +144,31 @@ def load_development_context(source):
     context_parts.append(f"Session source: {source}")
 
     # Add git information
-    branch, changes = get_git_status()
+    branch = results.get('git_branch')
     if branch:
         context_parts.append(f"Git branch: {branch}")
-        if changes > 0:
+        changes = results.get('git_status')
+        if changes:
             context_parts.append(f"Uncommitted changes: {changes} files")
 
-    # Load project-specific context files if they exist
-    context_files = [
-        ".claude/CONTEXT.md",
-        ".claude/TODO.md",
-        "TODO.md",
-        ".github/ISSUE_TEMPLATE.md"
-    ]
-
-    for file_path in context_files:
-        if Path(file_path).exists():
-            try:
-                with open(file_path, 'r') as f:
-                    content = f.read().strip()
-                    if content:
-                        context_parts.append(f"\n--- Content from {file_path} ---")
-                        context_parts.append(content[:1000])  # Limit to first 1000 chars
-            except Exception:
-                pass
+    # Add project-specific context files that exist
+    for file_path in CONTEXT_FILES:
+        content = results.get(file_path)
+        if content:
+            context_parts.append(f"\n--- Content from {file_path} ---")
+            context_parts.append(content)
 
     # Add recent issues if available
-    issues = get_recent_issues()
+    issues = results.get('gh_issues')
     if issues:
         context_parts.append("\n--- Recent GitHub Issues ---")
         context_parts.append(issues)
 
-    return "\n".join(context_parts)
+    return "\n".join(context_parts), timings
 
 
 def main():
+    timer = hookmetrics.start('session_start')
     try:
         # Parse command line arguments
         parser = argparse.ArgumentParser()
@@ -152,18 +179,35 @@ def main():
         args = parser.parse_args()
 
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        with timer.phase('stdin_parse'):
+            input_data = json.loads(sys.stdin.read())
+        timer.session_id = input_data.get('session_id')
 
         # Extract fields
         session_id = input_data.get('session_id', 'unknown')
         source = input_data.get('source', 'unknown')  # "startup", "resume", or "clear"
 
+        # Load development context if requested
+        context = None
+        if args.load_context:
+            with timer.phase('context_load'):
+                context, timings = load_development_context(source)
+            # Logged with the event so slow sources show up in the logs
+            input_data['context_sources'] = timings
+
         # Log the session start event
-        log_session_start(input_data)
+        with timer.phase('log_write'):
+            log_session_start(input_data)
+
+        # Rotate aged logs and compress old segments in the background
+        with timer.phase('log_rotate'):
+            try:
+                from utils.logrotate import maybe_sweep
+                maybe_sweep()
+            except Exception:
+                pass
 
-        # Load development context if requested
         if args.load_context:
-            context = load_development_context(source)
             if context:
                 # Using JSON output to add context
                 output = {
@@ -178,21 +222,15 @@ def main():
         # Announce session start if requested
         if args.announce:
             try:
-                # Try to use TTS to announce session start
-                script_dir = Path(__file__).parent
-                tts_script = script_dir / "utils" / "tts" / "pyttsx3_tts.py"
-
-                if tts_script.exists():
-                    messages = {
-                        "startup": "Claude Code session started",
-                        "resume": "Resuming previous session",
-                        "clear": "Starting fresh session"
-                    }
-                    message = messages.get(source, "Session started")
+                from utils.ttsd import announce
 
-                    subprocess.run([
-                        "/mnt/c/Users/nitro/.local/bin/uv.exe", "run", "--script", "C:\\Users\\nitro\\elevenlabs_tts.py", "--voice", "bellab", message
-                    ], capture_output=True, timeout=5)
+                messages = {
+                    "startup": "Claude Code session started",
+                    "resume": "Resuming previous session",
+                    "clear": "Starting fresh session"
+                }
+                with timer.phase('tts_dispatch'):
+                    announce(messages.get(source, "Session started"), key='session_start')
             except Exception:
                 pass
 
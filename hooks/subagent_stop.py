@@ -10,33 +10,22 @@ import argparse
 import json
 import os
 import sys
-import subprocess
 from pathlib import Path
 from datetime import datetime
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+from utils import hookmetrics
+from utils.eventlog import append_event
 
 
 def announce_subagent_completion():
-    """Announce subagent completion using TTS service."""
+    """Queue a subagent completion announcement (returns without waiting for playback)."""
     try:
-        # Use fixed TTS path from global instructions
-        completion_message = "Subagent Complete"
-        subprocess.run([
-            "/mnt/c/Users/nitro/.local/bin/uv.exe", "run", "--script", "C:\\Users\\nitro\\elevenlabs_tts.py", "--voice", "bellab", completion_message
-        ],
-        capture_output=True,  # Suppress output
-        timeout=10  # 10-second timeout
-        )
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-        # Fail silently if TTS encounters issues
-        pass
+        from utils.ttsd import announce
+
+        # Parallel subagents finishing together coalesce into one announcement
+        announce("Subagent Complete", key='subagent_stop', many="{count} subagents complete")
     except Exception:
-        # Fail silently for any other errors
+        # Fail silently if TTS encounters issues
         pass
 
 
@@ -51,15 +40,22 @@ def find_project_root():
 
 
 def main():
+    timer = hookmetrics.start('subagent_stop')
     try:
         # Parse command line arguments
         parser = argparse.ArgumentParser()
-        parser.add_argument('--chat', action='store_true', help='Copy transcript to chat.json')
+        parser.add_argument('--chat', action='store_true', help='Archive new transcript lines for this turn')
+        parser.add_argument('--snapshot', action='store_true',
+                            help='With --chat, also write a full transcript copy to the dated log dir')
         parser.add_argument('--notify', action='store_true', help='Enable TTS completion announcement')
+        parser.add_argument('--verbatim', action='store_true',
+                            help='Copy snapshot lines as-is instead of re-parsing them')
         args = parser.parse_args()
 
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        with timer.phase('stdin_parse'):
+            input_data = json.load(sys.stdin)
+        timer.session_id = input_data.get('session_id')
 
         # Extract required fields
         session_id = input_data.get("session_id", "")
@@ -70,53 +66,38 @@ def main():
         current_date = datetime.now().strftime("%Y%m%d")
         log_dir = project_root / '.claude' / 'logs'
         log_dir.mkdir(parents=True, exist_ok=True)
-        log_path = log_dir / "subagent_stop.json"
-
-        # Read existing log data or initialize empty list
-        if log_path.exists():
-            with open(log_path, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-
-        # Append new data
-        log_data.append(input_data)
+        timer.log_dir = log_dir
 
-        # Write back to file with formatting
-        with open(log_path, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        # Append the event to the JSONL log
+        with timer.phase('log_write'):
+            append_event('subagent_stop', input_data, log_dir)
 
         # Handle --chat switch (same as stop.py)
         if args.chat and 'transcript_path' in input_data:
             transcript_path = input_data['transcript_path']
             if os.path.exists(transcript_path):
-                # Read .jsonl file and convert to JSON array
-                chat_data = []
                 try:
-                    with open(transcript_path, 'r') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                try:
-                                    chat_data.append(json.loads(line))
-                                except json.JSONDecodeError:
-                                    pass  # Skip invalid lines
-
-                    # Create unique filename based on session_id and timestamp
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    session_short = session_id[:8] if len(session_id) >= 8 else session_id
-                    chat_filename = f'transcript_subagent_{session_short}_{timestamp}.json'
-
-                    # Ensure dated subdirectory exists
-                    dated_log_dir = log_dir / current_date
-                    dated_log_dir.mkdir(parents=True, exist_ok=True)
-                    chat_file = dated_log_dir / chat_filename
-
-                    with open(chat_file, 'w') as f:
-                        json.dump(chat_data, f, indent=2)
+                    from utils.transcript import archive_increment, export_transcript
+
+                    # Append only the lines added since the last Stop to the session archive
+                    with timer.phase('transcript_export'):
+                        archive_increment(transcript_path, session_id or 'unknown',
+                                          log_dir / 'transcripts', source='subagent_stop')
+
+                    if args.snapshot:
+                        # Create unique filename based on session_id and timestamp
+                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                        session_short = session_id[:8] if len(session_id) >= 8 else session_id
+                        chat_filename = f'transcript_subagent_{session_short}_{timestamp}.json'
+
+                        # Ensure dated subdirectory exists
+                        dated_log_dir = log_dir / current_date
+                        dated_log_dir.mkdir(parents=True, exist_ok=True)
+                        chat_file = dated_log_dir / chat_filename
+
+                        # Stream the .jsonl file into a JSON array with bounded memory
+                        with timer.phase('transcript_export'):
+                            export_transcript(transcript_path, chat_file, verbatim=args.verbatim)
                 except Exception as e:
                     # Log errors but don't fail the hook
                     try:
@@ -128,7 +109,8 @@ def main():
 
         # Announce subagent completion via TTS (only if --notify flag is set)
         if args.notify:
-            announce_subagent_completion()
+            with timer.phase('tts_dispatch'):
+                announce_subagent_completion()
 
         sys.exit(0)
 
@@ -1,120 +1,37 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.11"
-# dependencies = [
-#     "python-dotenv",
-# ]
 # ///
 
 import argparse
 import json
-import os
 import sys
-from pathlib import Path
-from datetime import datetime
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+from utils import hookmetrics
+from utils.eventlog import append_event
 
 
 def log_user_prompt(session_id, input_data):
     """Log user prompt to logs directory."""
-    # Ensure logs directory exists
-    log_dir = Path(".claude/logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'user_prompt_submit.json'
+    append_event('user_prompt_submit', input_data)
 
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
 
-    # Append the entire input data
-    log_data.append(input_data)
-
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+# Legacy function removed - now handled by manage_session_data
 
 
-# Legacy function removed - now handled by manage_session_data
+def manage_session_data(session_id, prompt, name_agent=False, cwd=None):
+    """Record the prompt (and an agent name) in the session store."""
+    from utils.sessionstore import SessionStore
 
+    with SessionStore() as store:
+        # Add the new prompt
+        store.add_prompt(session_id, prompt, cwd=cwd)
 
-def manage_session_data(session_id, prompt, name_agent=False):
-    """Manage session data in the new JSON structure."""
-    import subprocess
-
-    # Ensure sessions directory exists
-    sessions_dir = Path(".claude/data/sessions")
-    sessions_dir.mkdir(parents=True, exist_ok=True)
-
-    # Load or create session file
-    session_file = sessions_dir / f"{session_id}.json"
-
-    if session_file.exists():
-        try:
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
-        except (json.JSONDecodeError, ValueError):
-            session_data = {"session_id": session_id, "prompts": []}
-    else:
-        session_data = {"session_id": session_id, "prompts": []}
-
-    # Add the new prompt
-    session_data["prompts"].append(prompt)
-
-    # Generate agent name if requested and not already present
-    if name_agent and "agent_name" not in session_data:
-        # Try Ollama first (preferred)
-        try:
-            result = subprocess.run(
-                ["uv", "run", ".claude/hooks/utils/llm/ollama.py", "--agent-name"],
-                capture_output=True,
-                text=True,
-                timeout=5  # Shorter timeout for local Ollama
-            )
-
-            if result.returncode == 0 and result.stdout.strip():
-                agent_name = result.stdout.strip()
-                # Check if it's a valid name (not an error message)
-                if len(agent_name.split()) == 1 and agent_name.isalnum():
-                    session_data["agent_name"] = agent_name
-                else:
-                    raise Exception("Invalid name from Ollama")
-        except Exception:
-            # Fall back to Anthropic if Ollama fails
-            try:
-                result = subprocess.run(
-                    ["uv", "run", ".claude/hooks/utils/llm/anth.py", "--agent-name"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-
-                if result.returncode == 0 and result.stdout.strip():
-                    agent_name = result.stdout.strip()
-                    # Validate the name
-                    if len(agent_name.split()) == 1 and agent_name.isalnum():
-                        session_data["agent_name"] = agent_name
-            except Exception:
-                # If both fail, don't block the prompt
-                pass
-
-    # Save the updated session data
-    try:
-        with open(session_file, 'w') as f:
-            json.dump(session_data, f, indent=2)
-    except Exception:
-        # Silently fail if we can't write the file
-        pass
+        # Name the agent from the pre-generated pool; a background refill
+        # talks to the model, so the prompt never waits on it
+        if name_agent and store.agent_name(session_id) is None:
+            from utils.namepool import assign_agent_name
+            assign_agent_name(store, session_id)
 
 
 def validate_prompt(prompt):
@@ -138,6 +55,7 @@ def validate_prompt(prompt):
 
 
 def main():
+    timer = hookmetrics.start('user_prompt_submit')
     try:
         # Parse command line arguments
         parser = argparse.ArgumentParser()
@@ -152,18 +70,23 @@ def main():
         args = parser.parse_args()
 
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        with timer.phase('stdin_parse'):
+            input_data = json.loads(sys.stdin.read())
+        timer.session_id = input_data.get('session_id')
 
         # Extract session_id and prompt
         session_id = input_data.get('session_id', 'unknown')
         prompt = input_data.get('prompt', '')
 
         # Log the user prompt
-        log_user_prompt(session_id, input_data)
+        with timer.phase('log_write'):
+            log_user_prompt(session_id, input_data)
 
         # Manage session data with JSON structure
         if args.store_last_prompt or args.name_agent:
-            manage_session_data(session_id, prompt, name_agent=args.name_agent)
+            with timer.phase('session_data'):
+                manage_session_data(session_id, prompt, name_agent=args.name_agent,
+                                    cwd=input_data.get('cwd'))
 
         # Validate prompt if requested and not in log-only mode
         if args.validate and not args.log_only:
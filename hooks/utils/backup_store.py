@@ -0,0 +1,398 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Content-addressed, compressed store for pre-compaction transcript backups.
+
+Successive backups of the same session share almost all of their lines, so
+instead of copying the whole transcript every time, each backup stores:
+- new unique lines, compressed into packs (zstd when the `zstandard`
+  package is available, gzip otherwise) of at most PACK_TARGET bytes
+- a manifest listing line hashes, which references the previous backup of
+  the same transcript as a prefix when the transcript only grew
+
+When the transcript is an extension of the previous backup (the normal
+case, since Claude Code only appends to transcripts), only the bytes after
+the previous backup's size are read, split and hashed. The prefix is
+checked by digesting its first and last CHECK_WINDOW bytes, so a
+rewritten or truncated transcript falls back to a full (still
+deduplicated) backup without re-reading the whole file every time.
+
+Which pack holds a line is looked up in a SQLite hash index rather than
+by reading index.jsonl. The index records how far into index.jsonl it has
+read and catches up from there, so a backup or restore only parses the
+packs written since the last one. Deleting hashes.sqlite rebuilds it.
+
+Layout under .claude/logs/transcript_backups/:
+- packs/<id>.jsonl.gz|.zst   Compressed unique lines
+- index.jsonl                One record per pack: {"pack", "hashes"}
+- hashes.sqlite              line hash -> pack, derived from index.jsonl
+- manifests/<name>.json      One per backup
+- heads.json                 Latest backup name per source transcript
+- .lock                      Serializes writers
+
+Usage:
+- ./backup_store.py list
+- ./backup_store.py restore <backup_name> <output.jsonl>
+- ./backup_store.py stats
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.eventlog import append_record, file_lock
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # Fall back to gzip
+
+STORE_DIR = Path('.claude/logs/transcript_backups')
+PACK_TARGET = 4 * 1024 * 1024
+CHECK_WINDOW = 64 * 1024
+HASH_INDEX = 'hashes.sqlite'
+SCHEMA_VERSION = 1
+LOOKUP_CHUNK = 500  # Hashes per query, below SQLite's bound-parameter limit
+
+SCHEMA = f"""
+PRAGMA user_version = {SCHEMA_VERSION};
+CREATE TABLE IF NOT EXISTS lines (
+    hash TEXT PRIMARY KEY,
+    pack TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS position (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    inode INTEGER,
+    offset INTEGER NOT NULL
+);
+"""
+
+
+def line_hash(line):
+    """Hash one transcript line (without its newline)."""
+    return hashlib.blake2b(line, digest_size=16).hexdigest()
+
+
+def _compress(data):
+    """Compress a pack payload; returns (bytes, file extension)."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=6).compress(data), '.zst'
+    return gzip.compress(data, compresslevel=6), '.gz'
+
+
+def _decompress(path):
+    """Read and decompress one pack file."""
+    data = Path(path).read_bytes()
+    if path.suffix == '.zst':
+        if zstandard is None:
+            raise RuntimeError(f"{path.name} needs the zstandard package to restore")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _window_digest(f, size):
+    """Digest the first and last CHECK_WINDOW bytes of the first `size` bytes of a file."""
+    digest = hashlib.blake2b(digest_size=16)
+    f.seek(0)
+    digest.update(f.read(min(CHECK_WINDOW, size)))
+    if size > CHECK_WINDOW:
+        tail_start = max(CHECK_WINDOW, size - CHECK_WINDOW)
+        f.seek(tail_start)
+        digest.update(f.read(size - tail_start))
+    return digest.hexdigest()
+
+
+class BackupStore:
+    """A directory of packs, a pack index and backup manifests."""
+
+    def __init__(self, root=None):
+        self.root = Path(root if root is not None else STORE_DIR)
+        self.packs_dir = self.root / 'packs'
+        self.manifests_dir = self.root / 'manifests'
+        self.index_path = self.root / 'index.jsonl'
+        self.heads_path = self.root / 'heads.json'
+        self.hash_index_path = self.root / HASH_INDEX
+
+    def _open_hash_index(self):
+        """Open the hash index, brought up to date with index.jsonl."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.hash_index_path, timeout=30)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            conn.executescript('DROP TABLE IF EXISTS lines; DROP TABLE IF EXISTS position;')
+        conn.executescript(SCHEMA)
+        self._catch_up(conn)
+        return conn
+
+    def _catch_up(self, conn):
+        """Index the pack records appended to index.jsonl since the last call."""
+        row = conn.execute('SELECT inode, offset FROM position WHERE id = 0').fetchone()
+        inode, offset = row if row else (None, 0)
+        try:
+            f = open(self.index_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if st.st_ino != inode or st.st_size < offset:
+                conn.execute('DELETE FROM lines')  # Replaced or truncated: start over
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+        complete = data[:data.rfind(b'\n') + 1]  # Leave a torn last line for next time
+        rows = []
+        for line in complete.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            rows.extend((h, record['pack']) for h in record.get('hashes', ()))
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO lines (hash, pack) VALUES (?, ?)', rows)
+            conn.execute('INSERT OR REPLACE INTO position (id, inode, offset) VALUES (0, ?, ?)',
+                         (st.st_ino, offset + len(complete)))
+
+    def _lookup(self, conn, hashes):
+        """Return {line_hash: pack_id} for the given hashes that are stored."""
+        hashes = list(hashes)
+        known = {}
+        for i in range(0, len(hashes), LOOKUP_CHUNK):
+            chunk = hashes[i:i + LOOKUP_CHUNK]
+            query = f"SELECT hash, pack FROM lines WHERE hash IN ({','.join('?' * len(chunk))})"
+            known.update(conn.execute(query, chunk))
+        return known
+
+    def _write_packs(self, lines):
+        """Compress {hash: line} into packs and index them."""
+        batch, batch_size = [], 0
+
+        def flush():
+            if not batch:
+                return
+            pack_id = f"{int(time.time() * 1000)}-{os.getpid()}-{line_hash(batch[0][1])[:8]}"
+            payload, ext = _compress(b''.join(line + b'\n' for _, line in batch))
+            self.packs_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.packs_dir / f"{pack_id}.tmp"
+            tmp.write_bytes(payload)
+            os.replace(tmp, self.packs_dir / f"{pack_id}.jsonl{ext}")
+            append_record(self.index_path, {'pack': f"{pack_id}.jsonl{ext}",
+                                            'hashes': [h for h, _ in batch]})
+
+        for h, line in lines.items():
+            batch.append((h, line))
+            batch_size += len(line) + 1
+            if batch_size >= PACK_TARGET:
+                flush()
+                batch, batch_size = [], 0
+        flush()
+
+    def _read_heads(self):
+        try:
+            with open(self.heads_path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _latest_manifest_for(self, source):
+        """Return the newest manifest recorded for a source transcript path."""
+        name = self._read_heads().get(source)
+        if name is None:
+            return None
+        try:
+            return self.load_manifest(name)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_json(self, path, document):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(document, f, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    def backup(self, transcript_path, name, metadata=None):
+        """
+        Store a transcript backup.
+
+        Args:
+            transcript_path (str): Transcript to back up
+            name (str): Backup name (unique)
+            metadata (dict): Extra fields kept in the manifest (trigger, ...)
+
+        Returns:
+            dict: The written manifest (without its hash list)
+        """
+        source = str(Path(transcript_path).resolve())
+        with file_lock(self.root / '.lock'):
+            parent = self._latest_manifest_for(source)
+            with open(transcript_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+
+                # Only the bytes past the previous backup need reading and
+                # hashing, provided that backup ended on a line boundary
+                start = 0
+                if (parent and parent['trailing_newline'] and parent['size'] <= size
+                        and _window_digest(f, parent['size']) == parent['check_digest']):
+                    start = parent['size']
+                else:
+                    parent = None
+
+                f.seek(start)
+                data = f.read()
+                end = start + len(data)
+                check_digest = _window_digest(f, end)
+
+            lines = data.split(b'\n')
+            trailing_newline = not data or data.endswith(b'\n')
+            if trailing_newline:
+                lines.pop()
+
+            hashes = [line_hash(line) for line in lines]
+            conn = self._open_hash_index()
+            try:
+                known = self._lookup(conn, set(hashes))
+                new_lines = {}
+                for h, line in zip(hashes, lines):
+                    if h not in known and h not in new_lines:
+                        new_lines[h] = line
+                self._write_packs(new_lines)
+                self._catch_up(conn)
+            finally:
+                conn.close()
+
+            manifest = {
+                'name': name,
+                'source': source,
+                'created': datetime.now().isoformat(),
+                'size': end,
+                'check_digest': check_digest,
+                'parent': parent['name'] if parent else None,
+                'parent_lines': parent['line_count'] if parent else 0,
+                'line_count': (parent['line_count'] if parent else 0) + len(hashes),
+                'trailing_newline': trailing_newline,
+                'new_unique_lines': len(new_lines),
+                'hashes': hashes,
+            }
+            manifest.update(metadata or {})
+            self._write_json(self.manifests_dir / f"{name}.json", manifest)
+            heads = self._read_heads()
+            heads[source] = name
+            self._write_json(self.heads_path, heads)
+
+        summary = dict(manifest)
+        summary.pop('hashes')
+        return summary
+
+    def load_manifest(self, name):
+        with open(self.manifests_dir / f"{name}.json") as f:
+            return json.load(f)
+
+    def line_hashes(self, name):
+        """Return the full ordered hash list of a backup, following parents."""
+        chain = []
+        manifest = self.load_manifest(name)
+        while True:
+            chain.append(manifest)
+            if not manifest.get('parent'):
+                break
+            manifest = self.load_manifest(manifest['parent'])
+        hashes = []
+        for manifest in reversed(chain):
+            hashes.extend(manifest['hashes'])
+        return hashes
+
+    def restore(self, name, output_path):
+        """
+        Rebuild a backup into a .jsonl file.
+
+        Returns:
+            int: Number of lines written
+        """
+        manifest = self.load_manifest(name)
+        hashes = self.line_hashes(name)
+        conn = self._open_hash_index()
+        try:
+            known = self._lookup(conn, set(hashes))
+        finally:
+            conn.close()
+
+        # Decompress only the packs this backup needs
+        lines = {}
+        needed = {known[h] for h in set(hashes) if h in known}
+        for pack in needed:
+            for line in _decompress(self.packs_dir / pack).split(b'\n')[:-1]:
+                lines[line_hash(line)] = line
+
+        with open(output_path, 'wb') as out:
+            for i, h in enumerate(hashes):
+                if h not in lines:
+                    raise RuntimeError(f"Backup {name} is missing line {i} ({h})")
+                out.write(lines[h])
+                if i < len(hashes) - 1 or manifest.get('trailing_newline', True):
+                    out.write(b'\n')
+        return len(hashes)
+
+    def list_backups(self):
+        """Return manifest summaries sorted by creation time."""
+        summaries = []
+        if self.manifests_dir.exists():
+            for path in self.manifests_dir.glob('*.json'):
+                with open(path) as f:
+                    manifest = json.load(f)
+                manifest.pop('hashes', None)
+                summaries.append(manifest)
+        return sorted(summaries, key=lambda m: m['created'])
+
+    def stats(self):
+        """Return logical vs stored byte counts for the whole store."""
+        logical = sum(m['size'] for m in self.list_backups())
+        stored = sum(p.stat().st_size for p in self.root.rglob('*') if p.is_file())
+        return {'backups': len(self.list_backups()), 'logical_bytes': logical,
+                'stored_bytes': stored}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transcript backup store')
+    parser.add_argument('--store', default=str(STORE_DIR), help='Store directory')
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('list', help='List backups')
+    restore = sub.add_parser('restore', help='Rebuild a backup')
+    restore.add_argument('name')
+    restore.add_argument('output')
+    sub.add_parser('stats', help='Show logical vs stored size')
+    args = parser.parse_args()
+
+    store = BackupStore(args.store)
+    if args.command == 'list':
+        for m in store.list_backups():
+            print(f"{m['name']}  {m['created']}  {m['size']:>12} bytes  "
+                  f"{m['line_count']:>7} lines  +{m['new_unique_lines']} new")
+    elif args.command == 'restore':
+        count = store.restore(args.name, args.output)
+        print(f"Restored {count} lines to {args.output}")
+    elif args.command == 'stats':
+        stats = store.stats()
+        ratio = stats['logical_bytes'] / stats['stored_bytes'] if stats['stored_bytes'] else 0
+        print(f"{stats['backups']} backups, {stats['logical_bytes']} logical bytes, "
+              f"{stats['stored_bytes']} stored bytes ({ratio:.1f}x)")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
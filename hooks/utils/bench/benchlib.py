@@ -0,0 +1,126 @@
+"""
+Shared helpers for the hook benchmark scripts in this directory.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[2]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+
+def percentile(values, pct):
+    """
+    Return the pct-th percentile of values (nearest-rank, pct in 0-100).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples_ms):
+    """Return count/p50/p95/p99/max for a list of millisecond samples."""
+    return {
+        'n': len(samples_ms),
+        'p50': percentile(samples_ms, 50),
+        'p95': percentile(samples_ms, 95),
+        'p99': percentile(samples_ms, 99),
+        'max': max(samples_ms) if samples_ms else 0.0,
+    }
+
+
+def format_summary(label, summary):
+    """Format a summarize() result as one aligned report line."""
+    return (f"{label:<32} n={summary['n']:<6} p50={summary['p50']:8.2f}ms "
+            f"p95={summary['p95']:8.2f}ms p99={summary['p99']:8.2f}ms "
+            f"max={summary['max']:8.2f}ms")
+
+
+@contextmanager
+def temp_project():
+    """Yield a throwaway project directory containing an empty .claude/."""
+    root = Path(tempfile.mkdtemp(prefix='claude-hooks-bench-'))
+    (root / '.claude' / 'logs').mkdir(parents=True)
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def run_timed(argv, payload, cwd, env=None, timeout=60):
+    """
+    Run a command once, feeding payload on stdin.
+
+    Returns:
+        tuple: (elapsed_ms, returncode)
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        argv,
+        input=payload.encode('utf-8') if isinstance(payload, str) else payload,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=timeout,
+    )
+    return (time.perf_counter() - start) * 1000.0, result.returncode
+
+
+def run_measured(argv, payload, cwd, env=None, timeout=60):
+    """
+    Run a command once, feeding payload on stdin, and collect its rusage.
+
+    The child is reaped with os.wait4(), whose ru_maxrss also covers the
+    grandchildren it waited for (e.g. the interpreter under `uv run`).
+
+    Returns:
+        tuple: (elapsed_ms, returncode, peak_rss_kb)
+    """
+    data = payload.encode('utf-8') if isinstance(payload, str) else payload
+    start = time.perf_counter()
+    proc = subprocess.Popen(argv, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, cwd=cwd, env=env)
+    killer = threading.Timer(timeout, proc.kill)
+    killer.start()
+    try:
+        try:
+            proc.stdin.write(data)
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        _, status, usage = os.wait4(proc.pid, 0)
+    finally:
+        killer.cancel()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return (time.perf_counter() - start) * 1000.0, proc.returncode, usage.ru_maxrss
+
+
+def script_command(script):
+    """
+    Return argv for running a hook script the way settings.json does.
+
+    Uses `uv run --script` when uv is installed, otherwise the current
+    interpreter (which understates the cold-start cost).
+    """
+    uv = shutil.which('uv')
+    if uv:
+        return [uv, 'run', '--script', str(script)]
+    return [sys.executable, str(script)]
+
+
+def bench_env(**overrides):
+    """Return a copy of the environment with overrides applied."""
+    env = dict(os.environ)
+    env.update({k: str(v) for k, v in overrides.items()})
+    return env
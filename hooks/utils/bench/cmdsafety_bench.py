@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Correctness and throughput benchmark for utils/cmdsafety.py.
+
+Runs every command in the hand-labeled corpus (bash_commands.jsonl, see
+make_command_corpus.py) through the single-pass scanner and through the
+original per-pattern matcher that pre_tool_use.py used to have, then
+reports rule accuracy, false positives/negatives per corpus source,
+commands per second and the per-command latency distribution (the tail
+is what a PreToolUse hook waits on). Exits 1 if a dangerous command gets through the
+scanner.
+
+Usage:
+- ./cmdsafety_bench.py
+- ./cmdsafety_bench.py --corpus other.jsonl --repeat 20 --show-mismatches
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchlib import format_summary, summarize
+from utils.cmdsafety import scan_command
+
+
+def legacy_is_dangerous_rm_command(command):
+    """The pre_tool_use.py matcher before the single-pass scanner, for comparison."""
+    normalized = ' '.join(command.lower().split())
+    patterns = [
+        r'\brm\s+.*-[a-z]*r[a-z]*f',
+        r'\brm\s+.*-[a-z]*f[a-z]*r',
+        r'\brm\s+--recursive\s+--force',
+        r'\brm\s+--force\s+--recursive',
+        r'\brm\s+-r\s+.*-f',
+        r'\brm\s+-f\s+.*-r',
+    ]
+    for pattern in patterns:
+        if re.search(pattern, normalized):
+            return True
+    dangerous_paths = [r'/', r'/\*', r'~', r'~/', r'\$HOME', r'\.\.', r'\*', r'\.', r'\.\s*$']
+    if re.search(r'\brm\s+.*-[a-z]*r', normalized):
+        for path in dangerous_paths:
+            if re.search(path, normalized):
+                return True
+    return False
+
+
+def throughput(fn, commands, repeat):
+    """Return commands per second for fn over the corpus."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for command in commands:
+            fn(command)
+    elapsed = time.perf_counter() - start
+    return len(commands) * repeat / elapsed if elapsed else float('inf')
+
+
+def latencies(fn, commands, repeat):
+    """Return the per-command latencies of fn in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        for command in commands:
+            start = time.perf_counter()
+            fn(command)
+            samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='cmdsafety correctness/throughput benchmark')
+    parser.add_argument('--corpus', default=str(Path(__file__).parent / 'bash_commands.jsonl'))
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--show-mismatches', action='store_true')
+    args = parser.parse_args()
+
+    with open(args.corpus) as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    unlabelled = [e['command'] for e in entries if e['rule'] == 'unlabelled']
+    if unlabelled:
+        print(f"{len(unlabelled)} corpus entries still need a label, e.g.: {unlabelled[0]}",
+              file=sys.stderr)
+        sys.exit(2)
+    commands = [e['command'] for e in entries]
+
+    exact = false_pos = false_neg = wrong_rule = 0
+    legacy_false_pos = legacy_false_neg = 0
+    mismatches = []
+    allowed_by_scanner = []  # Blocked by the legacy regex, allowed now
+    missed_by_source = Counter()
+    for entry in entries:
+        match = scan_command(entry['command'])
+        got = match.rule if match else None
+        expected = entry['rule']
+        if got == expected:
+            exact += 1
+        elif expected is None:
+            false_pos += 1
+        elif got is None:
+            false_neg += 1
+        else:
+            wrong_rule += 1
+        if got != expected:
+            mismatches.append((entry['command'], expected, got))
+            missed_by_source[entry.get('source', 'unknown')] += 1
+
+        legacy = legacy_is_dangerous_rm_command(entry['command'])
+        if legacy and expected is None:
+            legacy_false_pos += 1
+        elif not legacy and expected is not None:
+            legacy_false_neg += 1
+        if legacy and got is None:
+            allowed_by_scanner.append((entry['command'], expected))
+
+    total = len(entries)
+    sources = Counter(e.get('source', 'unknown') for e in entries)
+    print(f"Corpus: {total} commands ({sum(1 for e in entries if e['rule'])} dangerous)")
+    print("  " + ", ".join(f"{name} {count} ({missed_by_source[name]} mismatched)"
+                           for name, count in sorted(sources.items())))
+    print(f"scan_command:  exact rule {exact}/{total}, false positives {false_pos}, "
+          f"false negatives {false_neg}, wrong rule {wrong_rule}")
+    print(f"legacy regex:  false positives {legacy_false_pos}, false negatives {legacy_false_neg}")
+    print(f"vs legacy:     {len(allowed_by_scanner)} commands the legacy regex blocked are allowed "
+          f"({sum(1 for _, expected in allowed_by_scanner if expected)} of them labelled dangerous)")
+    print(f"scan_command:  {throughput(scan_command, commands, args.repeat):,.0f} commands/s")
+    print(f"legacy regex:  {throughput(legacy_is_dangerous_rm_command, commands, args.repeat):,.0f} commands/s")
+    print(format_summary('scan_command per command', summarize(latencies(scan_command, commands, 1))))
+    print(format_summary('legacy regex per command',
+                         summarize(latencies(legacy_is_dangerous_rm_command, commands, 1))))
+
+    if args.show_mismatches:
+        for command, expected, got in mismatches:
+            print(f"  expected={expected} got={got}: {command}")
+        for command, expected in allowed_by_scanner:
+            print(f"  legacy blocked, now allowed (expected={expected}): {command}")
+
+    if false_neg:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
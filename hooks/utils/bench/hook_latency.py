@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Compare PreToolUse/PostToolUse hook latency with and without the daemon.
+
+Modes:
+- direct:   the hook script started fresh per call (as settings.json used to)
+- fallback: hook_client.py with no daemon running (in-process fallback)
+- daemon:   hook_client.py talking to a warm utils/hookd.py
+
+Usage:
+- ./hook_latency.py                      # 200 calls per mode and hook
+- ./hook_latency.py -n 1000 --hook pre_tool_use
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchlib import (HOOKS_DIR, bench_env, format_summary, run_timed, script_command,
+                      summarize, temp_project)
+
+from utils.sockserve import is_running, request, spawn_detached
+
+SAMPLE_PAYLOADS = {
+    'pre_tool_use': {
+        'session_id': 'bench', 'hook_event_name': 'PreToolUse', 'tool_name': 'Bash',
+        'tool_input': {'command': 'git status && ls -la src/', 'description': 'Check status'},
+    },
+    'post_tool_use': {
+        'session_id': 'bench', 'hook_event_name': 'PostToolUse', 'tool_name': 'Read',
+        'tool_input': {'file_path': '/tmp/example.py'},
+        'tool_response': {'content': 'x = 1\n' * 200},
+    },
+}
+
+
+def bench_mode(mode, hook, iterations, project, socket):
+    """Run one hook `iterations` times in the given mode; return ms samples."""
+    payload = json.dumps(SAMPLE_PAYLOADS[hook])
+    env = bench_env(CLAUDE_HOOKD_SOCKET=socket, CLAUDE_HOOKD_AUTOSTART=0)
+    if mode == 'direct':
+        argv = script_command(HOOKS_DIR / f"{hook}.py")
+    else:
+        argv = [sys.executable, '-S', str(HOOKS_DIR / 'hook_client.py'), hook]
+
+    samples = []
+    for _ in range(iterations):
+        elapsed, _ = run_timed(argv, payload, project, env=env)
+        samples.append(elapsed)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hook daemon latency benchmark')
+    parser.add_argument('-n', '--iterations', type=int, default=200)
+    parser.add_argument('--hook', choices=sorted(SAMPLE_PAYLOADS), action='append',
+                        help='Hook(s) to benchmark (default: all)')
+    args = parser.parse_args()
+    hooks = args.hook or sorted(SAMPLE_PAYLOADS)
+
+    with temp_project() as project:
+        socket = str(project / 'hookd.sock')
+
+        results = []
+        for hook in hooks:
+            for mode in ('direct', 'fallback'):
+                results.append((f"{hook} [{mode}]", bench_mode(mode, hook, args.iterations, project, socket)))
+
+        # Start a private daemon for the warm measurements
+        os.environ['CLAUDE_HOOKD_SOCKET'] = socket
+        daemon = spawn_detached([sys.executable, str(HOOKS_DIR / 'utils' / 'hookd.py'), '--serve'])
+        try:
+            deadline = time.monotonic() + 10
+            while not is_running(socket) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            for hook in hooks:
+                results.append((f"{hook} [daemon]", bench_mode('daemon', hook, args.iterations, project, socket)))
+        finally:
+            try:
+                request(socket, {'command': 'shutdown'}, timeout=2)
+            except (OSError, ValueError):
+                daemon.terminate()
+            daemon.wait(timeout=10)
+
+    for label, samples in results:
+        print(format_summary(label, summarize(samples)))
+
+
+if __name__ == '__main__':
+    main()
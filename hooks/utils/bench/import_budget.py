@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the hook scripts.
+
+PreToolUse and PostToolUse run on every tool call, so whatever their
+modules import at load time is paid on every call. This imports each hook
+under `python -X importtime`, takes the best of several runs (the first
+one also warms the bytecode cache) and fails if:
+- a hook's cumulative import time exceeds its budget, or
+- a hook imports one of HEAVY_MODULES at load time. Those belong behind
+  the code path that needs them (SDK clients inside the TTS/LLM scripts,
+  python-dotenv through utils/env.py).
+
+Run it after touching a hook's imports; exit status 1 means a regression.
+
+Usage:
+- ./import_budget.py                          # Check every hook
+- ./import_budget.py --hook pre_tool_use -v   # Also list the slowest imports
+- ./import_budget.py --scale 2                # Loosen budgets on a slow machine
+- ./import_budget.py --python .venv/bin/python
+"""
+
+import argparse
+import subprocess
+import sys
+
+from benchlib import HOOKS_DIR
+
+# Milliseconds of cumulative import time as reported by -X importtime
+# (which inflates the numbers somewhat compared to a plain import)
+BUDGETS_MS = {
+    'hook_client': 35,
+    'pre_tool_use': 45,
+    'post_tool_use': 45,
+}
+DEFAULT_BUDGET_MS = 60
+RUNS = 5
+
+HEAVY_MODULES = ('dotenv', 'anthropic', 'openai', 'google', 'grpc', 'elevenlabs',
+                 'pygame', 'sounddevice', 'pyttsx3', 'httpx', 'requests')
+
+
+def hook_names():
+    """Return the module names of the hook scripts."""
+    return sorted(path.stem for path in HOOKS_DIR.glob('*.py'))
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output.
+
+    Returns:
+        list: (module, depth, self_us, cumulative_us) tuples in output order
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or line.rstrip().endswith('imported package'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure(hook, python=sys.executable):
+    """
+    Import a hook once under -X importtime.
+
+    Returns:
+        tuple: (cumulative_ms, entries) where entries are the hook's own
+        imports (its subtree of the trace, not interpreter startup)
+    """
+    code = f"import sys; sys.path.insert(0, {str(HOOKS_DIR)!r}); import {hook}"
+    result = subprocess.run([python, '-X', 'importtime', '-c', code], cwd=HOOKS_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                            timeout=60)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {hook} failed:\n{result.stderr.strip()[-2000:]}")
+    entries = parse_importtime(result.stderr)
+    for i, (name, depth, _, cumulative) in enumerate(entries):
+        if name == hook and depth == 0:
+            # Children are printed before their parent
+            start = i
+            while start > 0 and entries[start - 1][1] > 0:
+                start -= 1
+            return cumulative / 1000.0, entries[start:i]
+    return 0.0, []
+
+
+def heavy_imports(entries):
+    """Return the HEAVY_MODULES packages present in an import trace."""
+    found = set()
+    for name, _, _, _ in entries:
+        top = name.split('.')[0]
+        if top in HEAVY_MODULES:
+            found.add(top)
+    return sorted(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hook import-time budget check')
+    parser.add_argument('--hook', choices=hook_names(), action='append',
+                        help='Hook(s) to check (default: all)')
+    parser.add_argument('--runs', type=int, default=RUNS, help='Runs per hook; the best one counts')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget')
+    parser.add_argument('--python', default=sys.executable,
+                        help='Interpreter to measure with (e.g. the uv environment the hooks run in)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='List the slowest imports per hook')
+    args = parser.parse_args()
+
+    failures = 0
+    for hook in args.hook or hook_names():
+        best_ms, best_entries = None, []
+        for _ in range(max(1, args.runs)):
+            total_ms, entries = measure(hook, args.python)
+            if best_ms is None or total_ms < best_ms:
+                best_ms, best_entries = total_ms, entries
+
+        budget = BUDGETS_MS.get(hook, DEFAULT_BUDGET_MS) * args.scale
+        heavy = heavy_imports(best_entries)
+        ok = best_ms <= budget and not heavy
+        failures += not ok
+        note = f" heavy imports: {', '.join(heavy)}" if heavy else ''
+        print(f"{'ok  ' if ok else 'FAIL'} {hook:<22} {best_ms:7.2f}ms / {budget:.0f}ms{note}")
+
+        if args.verbose or not ok:
+            direct = [e for e in best_entries if e[1] == 1]
+            for name, _, _, cumulative in sorted(direct, key=lambda e: -e[3])[:8]:
+                print(f"       {cumulative / 1000.0:7.2f}ms  {name}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
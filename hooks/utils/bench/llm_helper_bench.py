@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark LLM calls through anth.py against the resident LLM helper.
+
+Runs against the local mock Messages endpoint (mock_messages.py), so no
+API key or network is needed. The anthropic SDK must be importable,
+either through uv or in the current interpreter. Measures:
+- anth:     `anth.py "prompt"` started fresh per call (the fallback path)
+- helper:   llm_client.prompt() through a warm llm_helper.py
+- coalesce: CONCURRENCY identical prompts sent at once, which should
+            reach the API as a single request
+- deadline: a call with a deadline shorter than the endpoint's latency,
+            which should fail after the deadline instead of waiting
+
+Usage:
+- ./llm_helper_bench.py                  # 20 calls per mode, 50 ms mock latency
+- ./llm_helper_bench.py -n 100 --latency-ms 200 --concurrency 16
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+from benchlib import (HOOKS_DIR, bench_env, format_summary, run_timed, script_command,
+                      summarize, temp_project)
+from mock_messages import start as start_mock
+
+from utils.llm import llm_client
+from utils.sockserve import is_running, request, spawn_detached
+
+LLM_DIR = HOOKS_DIR / 'utils' / 'llm'
+
+
+def wait_running(path, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not is_running(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return is_running(path)
+
+
+def timed_prompts(prompts, deadline=10):
+    samples, failures = [], 0
+    for text in prompts:
+        start = time.perf_counter()
+        if llm_client.prompt(text, deadline=deadline, use_cache=False) is None:
+            failures += 1
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LLM helper benchmark')
+    parser.add_argument('-n', '--iterations', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=50, help='Mock endpoint latency')
+    parser.add_argument('--concurrency', type=int, default=8, help='Identical prompts at once')
+    args = parser.parse_args()
+
+    mock = start_mock(latency_ms=args.latency_ms)
+    ok = True
+    with temp_project() as project:
+        socket = project / 'llm_helper.sock'
+        overrides = {
+            'ANTHROPIC_BASE_URL': mock.url,
+            'ANTHROPIC_API_KEY': 'test',
+            'CLAUDE_LLM_CACHE_MAX_ENTRIES': 0,
+            'CLAUDE_LLM_HELPER_SOCKET': socket,
+        }
+        env = bench_env(**overrides)
+        os.environ.update(env)
+
+        samples = []
+        for i in range(args.iterations):
+            elapsed, rc = run_timed(script_command(LLM_DIR / 'anth.py') + [f"anth prompt {i}"], '',
+                                    project, env=env)
+            samples.append(elapsed)
+            if rc != 0:
+                print(f"anth.py failed (rc={rc}); is the anthropic SDK available?")
+                return 1
+        print(format_summary('anth.py per call', summarize(samples)))
+
+        helper = spawn_detached(script_command(LLM_DIR / 'llm_helper.py') + ['--serve'])
+        try:
+            if not wait_running(socket):
+                print("llm_helper did not start")
+                return 1
+
+            before = (mock.requests, mock.connections)
+            samples, failures = timed_prompts([f"helper prompt {i}" for i in range(args.iterations)])
+            connections = mock.connections - before[1]
+            print(f"{format_summary('helper per call', summarize(samples))} "
+                  f"failures={failures} api_requests={mock.requests - before[0]} "
+                  f"connections={connections}")
+            ok &= failures == 0 and connections <= 1
+
+            before = mock.requests
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(
+                llm_client.prompt('same prompt', use_cache=False))) for _ in range(args.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            coalesced = mock.requests - before
+            print(f"coalesce: {args.concurrency} identical prompts -> {coalesced} API request(s), "
+                  f"{len(set(results))} distinct result(s)")
+            ok &= coalesced == 1 and len(set(results)) == 1 and None not in results
+
+            mock.latency_ms = 2000
+            samples, failures = timed_prompts(['slow prompt'], deadline=0.5)
+            print(f"deadline: 0.5s deadline against 2s latency -> {samples[0]:.0f}ms, "
+                  f"{'failed fast' if failures else 'answered'}")
+            ok &= failures == 1 and samples[0] < 1000
+
+            print(f"helper stats: {request(socket, {'command': 'stats'})}")
+        finally:
+            try:
+                request(socket, {'command': 'shutdown'}, timeout=2)
+            except (OSError, ValueError):
+                helper.kill()
+            helper.wait(timeout=10)
+
+    print("ok" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
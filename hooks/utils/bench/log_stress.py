@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Stress test for concurrent event log writes.
+
+Parallel subagents finishing together and parallel tool calls run many hook
+processes against the same log at once. This checks that no record is lost
+or torn when they do:
+
+- hooks:   N subagent_stop.py / post_tool_use.py processes are started
+           together, each with a uniquely tagged payload; every tag must
+           appear exactly once in the event log, and every process must
+           leave one hook_metrics.jsonl record
+- writers: N processes each append M records as fast as they can; all N*M
+           must be present, and with CLAUDE_HOOKS_LOG_LOCK=1 the p99 lock
+           wait must stay under --max-wait-ms
+
+Both run with plain O_APPEND writes and with locked appends. Exit status 1
+means a lost or torn record, or a lock wait over the bound.
+
+Usage:
+- ./log_stress.py                        # 32 processes
+- ./log_stress.py -p 128 --records 500
+- ./log_stress.py --mode writers --max-wait-ms 20
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import uuid
+from collections import Counter
+
+from benchlib import (HOOKS_DIR, bench_env, format_summary, script_command, summarize,
+                      temp_project)
+
+from utils.eventlog import iter_events, iter_records, log_path_for
+from utils.hookmetrics import METRICS_FILE
+
+HOOK_PAYLOADS = {
+    'subagent_stop': {'session_id': 'stress', 'hook_event_name': 'SubagentStop',
+                      'stop_hook_active': False},
+    'post_tool_use': {'session_id': 'stress', 'hook_event_name': 'PostToolUse', 'tool_name': 'Read',
+                      'tool_input': {'file_path': '/tmp/example.py'},
+                      'tool_response': {'content': 'x = 1\n' * 200}},
+}
+
+# Appends `records` tagged records and prints the lock wait of each one
+WRITER = '''
+import json, sys
+sys.path.insert(0, {hooks_dir!r})
+from utils.eventlog import append_event
+run, writer, records = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+sys.stdin.read()  # Released together with the other writers
+waits = [append_event('stress', {{'run': run, 'writer': writer, 'seq': i, 'pad': 'x' * 512}},
+                      '.claude/logs') for i in range(records)]
+print(json.dumps(waits))
+'''
+
+
+def torn_lines(path):
+    """Count non-empty lines of a JSONL file that do not decode."""
+    torn = 0
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        json.loads(line)
+                    except ValueError:
+                        torn += 1
+    except FileNotFoundError:
+        pass
+    return torn
+
+
+def start_together(argvs, payloads, cwd, env):
+    """
+    Start every process, then release them at once by writing their stdin.
+
+    Returns:
+        list: (returncode, stdout) per process
+    """
+    procs = [subprocess.Popen(argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, cwd=cwd, env=env) for argv in argvs]
+    for proc, payload in zip(procs, payloads):
+        proc.stdin.write(payload.encode('utf-8'))
+        proc.stdin.close()
+    results = []
+    for proc in procs:
+        out = proc.stdout.read()
+        proc.stdout.close()
+        results.append((proc.wait(timeout=120), out))
+    return results
+
+
+def stress_hook(hook, processes, locked):
+    """
+    Run `processes` copies of a hook concurrently.
+
+    Returns:
+        list: Problems found (empty on success)
+    """
+    run = uuid.uuid4().hex
+    with temp_project() as project:
+        env = bench_env(CLAUDE_HOOKS_LOG_LOCK=int(locked), CLAUDE_HOOK_METRICS=1)
+        argv = script_command(HOOKS_DIR / f"{hook}.py")
+        payloads = [json.dumps(dict(HOOK_PAYLOADS[hook], stress_run=run, stress_seq=i))
+                    for i in range(processes)]
+        results = start_together([argv] * processes, payloads, project, env)
+
+        log_dir = project / '.claude' / 'logs'
+        seen = Counter(r.get('stress_seq') for r in iter_events(hook, log_dir)
+                       if r.get('stress_run') == run)
+        metrics = sum(1 for r in iter_records(log_dir / METRICS_FILE)
+                      if r.get('hook') == hook)
+        problems = []
+        failed = sum(1 for code, _ in results if code != 0)
+        if failed:
+            problems.append(f"{failed} processes exited non-zero")
+        missing = processes - len(seen)
+        if missing:
+            problems.append(f"{missing} events lost")
+        duplicated = sum(count - 1 for count in seen.values() if count > 1)
+        if duplicated:
+            problems.append(f"{duplicated} events duplicated")
+        if metrics != processes:
+            problems.append(f"{metrics}/{processes} metrics records")
+        for path in (log_path_for(hook, log_dir), log_dir / METRICS_FILE):
+            torn = torn_lines(path)
+            if torn:
+                problems.append(f"{torn} torn lines in {path.name}")
+        return problems
+
+
+def stress_writers(processes, records, locked):
+    """
+    Run `processes` writers appending `records` records each.
+
+    Returns:
+        tuple: (problems, lock wait samples in ms)
+    """
+    run = uuid.uuid4().hex
+    with temp_project() as project:
+        env = bench_env(CLAUDE_HOOKS_LOG_LOCK=int(locked))
+        code = WRITER.format(hooks_dir=str(HOOKS_DIR))
+        argvs = [[sys.executable, '-c', code, run, str(i), str(records)] for i in range(processes)]
+        results = start_together(argvs, [''] * processes, project, env)
+
+        waits = []
+        problems = []
+        for returncode, out in results:
+            if returncode != 0:
+                problems.append(f"writer exited with {returncode}")
+                continue
+            waits.extend(json.loads(out))
+
+        log_dir = project / '.claude' / 'logs'
+        seen = Counter((r['writer'], r['seq']) for r in iter_events('stress', log_dir)
+                       if r.get('run') == run)
+        expected = processes * records
+        if len(seen) != expected:
+            problems.append(f"{expected - len(seen)} of {expected} records lost")
+        duplicated = sum(count - 1 for count in seen.values() if count > 1)
+        if duplicated:
+            problems.append(f"{duplicated} records duplicated")
+        torn = torn_lines(log_path_for('stress', log_dir))
+        if torn:
+            problems.append(f"{torn} torn lines")
+        return problems, waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent event log write stress test')
+    parser.add_argument('-p', '--processes', type=int, default=32, help='Concurrent processes')
+    parser.add_argument('--records', type=int, default=200, help='Records per writer process')
+    parser.add_argument('--mode', choices=('hooks', 'writers', 'all'), default='all')
+    parser.add_argument('--max-wait-ms', type=float, default=50.0,
+                        help='Upper bound for the p99 lock wait of locked appends')
+    args = parser.parse_args()
+
+    failures = 0
+    for locked in (False, True):
+        label = 'locked' if locked else 'o_append'
+        if args.mode in ('hooks', 'all'):
+            for hook in sorted(HOOK_PAYLOADS):
+                problems = stress_hook(hook, args.processes, locked)
+                failures += bool(problems)
+                status = 'FAIL ' + '; '.join(problems) if problems else 'ok'
+                print(f"{hook:<16} {label:<9} {args.processes} processes: {status}")
+
+        if args.mode in ('writers', 'all'):
+            problems, waits = stress_writers(args.processes, args.records, locked)
+            summary = summarize(waits)
+            if locked and summary['p99'] > args.max_wait_ms:
+                problems.append(f"p99 lock wait {summary['p99']:.2f}ms > {args.max_wait_ms:g}ms")
+            failures += bool(problems)
+            status = 'FAIL ' + '; '.join(problems) if problems else 'ok'
+            print(f"{'writers':<16} {label:<9} {args.processes}x{args.records} records: {status}")
+            if locked:
+                print('  ' + format_summary('lock wait', summary))
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark utils/logquery.py over a large synthetic event log.
+
+Writes N PreToolUse/PostToolUse events spread over sessions, tools and a
+month of timestamps, builds the index from scratch, appends a small batch
+and times the incremental update, then times typical queries.
+
+Usage:
+- ./logquery_bench.py                  # 1,000,000 events
+- ./logquery_bench.py -n 200000 --sessions 50
+"""
+
+import argparse
+import random
+import time
+
+from benchlib import format_summary, summarize, temp_project
+
+from utils.eventlog import encode_record, log_path_for
+from utils.logquery import build_query, count_events, open_index, query_events, update_index
+
+TOOLS = ('Bash', 'Read', 'Edit', 'Write', 'Grep', 'Glob', 'Task', 'WebFetch')
+QUERY_RUNS = 20
+
+
+def write_events(log_dir, count, sessions, start_ts):
+    """Write `count` events across the pre/post tool logs; returns the session ids."""
+    session_ids = [f"session-{i:04d}-{random.getrandbits(32):08x}" for i in range(sessions)]
+    span = 30 * 86400
+    files = {event: open(log_path_for(event, log_dir), 'ab') for event in ('pre_tool_use', 'post_tool_use')}
+    try:
+        for i in range(count):
+            event = 'pre_tool_use' if i % 2 == 0 else 'post_tool_use'
+            tool = random.choice(TOOLS)
+            files[event].write(encode_record({
+                'session_id': random.choice(session_ids),
+                'hook_event_name': 'PreToolUse' if event == 'pre_tool_use' else 'PostToolUse',
+                'tool_name': tool,
+                'tool_input': {'command': f"make target-{i % 1000}"} if tool == 'Bash'
+                else {'file_path': f"/src/module_{i % 5000}.py"},
+                'logged_at': round(start_ts + span * i / count, 3),
+            }))
+    finally:
+        for f in files.values():
+            f.close()
+    return session_ids
+
+
+def time_query(label, conn, where, params, limit=None, count=None):
+    samples = []
+    for _ in range(QUERY_RUNS):
+        start = time.perf_counter()
+        if count:
+            count_events(conn, count, where, params)
+        else:
+            list(query_events(conn, where, params, limit=limit))
+        samples.append((time.perf_counter() - start) * 1000.0)
+    print(format_summary(label, summarize(samples)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Event log index benchmark')
+    parser.add_argument('-n', '--events', type=int, default=1_000_000)
+    parser.add_argument('--sessions', type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(1)
+    with temp_project() as project:
+        log_dir = project / '.claude' / 'logs'
+        start_ts = time.time() - 30 * 86400
+        session_ids = write_events(log_dir, args.events, args.sessions, start_ts)
+
+        start = time.perf_counter()
+        conn = open_index(log_dir)
+        added = update_index(conn, log_dir)
+        print(f"Full index build: {added} events in {time.perf_counter() - start:.2f}s")
+
+        write_events(log_dir, 1000, args.sessions, time.time())
+        start = time.perf_counter()
+        added = update_index(conn, log_dir)
+        print(f"Incremental update: {added} events in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        start = time.perf_counter()
+        update_index(conn, log_dir)
+        print(f"No-op update: {(time.perf_counter() - start) * 1000:.2f}ms")
+
+        session = session_ids[0]
+        time_query('session + tool', conn, *build_query(session=session, tool='Bash'))
+        time_query('session, last day', conn, *build_query(session=session, since=time.time() - 86400))
+        time_query('tool, last hour', conn, *build_query(tool='Edit', since=time.time() - 3600))
+        time_query('first 100 of event', conn, *build_query(event='PreToolUse'), limit=100)
+        time_query('count per tool, 1 day', conn, *build_query(since=time.time() - 86400),
+                   count='tool_name')
+
+
+if __name__ == '__main__':
+    main()
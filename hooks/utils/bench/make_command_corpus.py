@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Grow the labeled Bash command corpus used by cmdsafety_bench.py.
+
+bash_commands.jsonl holds real commands. Each one is labelled with the
+rule cmdsafety.scan_command should report, or null, and never by running
+the scanner. Every entry records its source:
+- recorded:   Bash commands run in real Claude Code sessions, taken from
+              the PreToolUse hook logs or from session transcripts
+- script:     command lines from shell scripts, Makefiles, Dockerfiles
+              and CI workflows written by people (installers, version
+              managers, package build recipes, ...)
+- curated:    everyday developer commands and common deletion idioms
+- regression: scanner bypasses found in review
+
+This script appends commands that the corpus does not have yet. Every
+rule needs an rm or find invocation, so a command with neither word is
+labelled null. Every other command is added with "rule": "unlabelled".
+cmdsafety_bench.py refuses to run until a person has labelled those
+entries. --max-null keeps the null commands of each source argument to a
+fixed-size sample (the same one on every run), so a large tree does not
+drown out the commands that matter.
+
+Script files are read one logical line at a time: continuation lines
+are joined, and comments, heredoc bodies, lines that only close a block
+(fi, done, }, ...) and lines with unbalanced quotes (pieces of multi-line
+strings) are skipped.
+
+Usage:
+- ./make_command_corpus.py                   # Transcripts under ~/.claude/projects
+- ./make_command_corpus.py --logs /path/to/project/.claude/logs
+- ./make_command_corpus.py --scripts ~/.pyenv --scripts /usr/bin --max-null 300
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from benchlib import HOOKS_DIR
+from utils.eventlog import iter_events
+
+CORPUS = Path(__file__).parent / 'bash_commands.jsonl'
+UNLABELLED = 'unlabelled'
+
+# Every cmdsafety rule needs one of these commands
+NEEDS_LABEL = re.compile(r'\b(?:rm|find)\b')
+
+SCRIPT_SUFFIXES = ('.sh', '.bash')
+SHELL_SHEBANG = re.compile(rb'^#!\s*\S*(?:/|env\s+)(?:ba|da|k|z)?sh\b')
+BLOCK_CLOSERS = frozenset({'fi', 'done', 'esac', 'else', 'then', 'do', '{', '}', ';;', '};', ')'})
+HEREDOC = re.compile(r'<<-?\s*[\'"]?(\w+)[\'"]?')
+WORKFLOW_RUN = re.compile(r'^\s*-?\s*run:\s*(?![|>])(.+)$')
+
+
+def commands_from_logs(log_dir):
+    """Yield Bash commands from a project's PreToolUse event log."""
+    for record in iter_events('pre_tool_use', log_dir):
+        if record.get('tool_name') == 'Bash':
+            yield (record.get('tool_input') or {}).get('command')
+
+
+def commands_from_transcripts(directory):
+    """Yield Bash commands from the tool calls in Claude Code transcripts."""
+    for path in sorted(Path(directory).expanduser().rglob('*.jsonl')):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                try:
+                    content = json.loads(line).get('message', {}).get('content')
+                except (ValueError, AttributeError):
+                    continue
+                for part in content if isinstance(content, list) else ():
+                    if (isinstance(part, dict) and part.get('type') == 'tool_use'
+                            and part.get('name') == 'Bash'):
+                        yield (part.get('input') or {}).get('command')
+
+
+def _balanced(line):
+    """Return True if a line has no unterminated quote (a crude check)."""
+    unquoted = re.sub(r'\\.|\'[^\']*\'|"(?:[^"\\]|\\.)*"', '', line)
+    return "'" not in unquoted and '"' not in unquoted
+
+
+def _logical_lines(lines):
+    """Join continuation lines and drop heredoc bodies."""
+    pending, heredoc_end = '', None
+    for raw in lines:
+        line = raw.rstrip('\n')
+        if heredoc_end is not None:
+            if line.strip() == heredoc_end:
+                heredoc_end = None
+            continue
+        if line.endswith('\\'):
+            pending += line[:-1].strip() + ' '
+            continue
+        line, pending = (pending + line.strip()).strip(), ''
+        heredoc = HEREDOC.search(line)
+        if heredoc:
+            heredoc_end = heredoc.group(1)
+        yield line
+
+
+def _script_kind(path):
+    if path.name == 'Makefile' or path.suffix == '.mk':
+        return 'make'
+    if path.name.startswith('Dockerfile'):
+        return 'docker'
+    if path.suffix in ('.yml', '.yaml') and '.github' in path.parts:
+        return 'workflow'
+    if path.suffix in SCRIPT_SUFFIXES:
+        return 'shell'
+    try:
+        with open(path, 'rb') as f:
+            return 'shell' if SHELL_SHEBANG.match(f.read(64)) else None
+    except OSError:
+        return None
+
+
+def commands_from_script(path):
+    """Yield the command lines of one shell script, Makefile, Dockerfile or workflow."""
+    kind = _script_kind(path)
+    if kind is None:
+        return
+    try:
+        with open(path, encoding='utf-8') as f:
+            lines = f.readlines()
+    except (OSError, UnicodeDecodeError):
+        return
+    if kind == 'make':
+        lines = [line[1:].lstrip('@-') for line in lines if line.startswith('\t')]
+    elif kind == 'workflow':
+        lines = [m.group(1) + '\n' for m in map(WORKFLOW_RUN.match, lines) if m]
+    for line in _logical_lines(lines):
+        if kind == 'docker':
+            if not line.startswith('RUN '):
+                continue
+            line = line[4:].strip()
+        if line and not line.startswith('#') and line not in BLOCK_CLOSERS and _balanced(line):
+            yield line
+
+
+def commands_from_scripts(root):
+    """Yield command lines from every script file under root."""
+    root = Path(root).expanduser()
+    for path in sorted(root.rglob('*')) if root.is_dir() else [root]:
+        if path.is_file() and not path.is_symlink():
+            yield from commands_from_script(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add real Bash commands to the corpus')
+    parser.add_argument('--logs', action='append', default=[], help='A .claude/logs directory')
+    parser.add_argument('--transcripts', action='append', default=[],
+                        help='A directory of session transcripts (*.jsonl, searched recursively)')
+    parser.add_argument('--scripts', action='append', default=[],
+                        help='A script file or a directory searched for scripts')
+    parser.add_argument('--max-length', type=int, default=400,
+                        help='Skip longer commands (heredocs, inline scripts)')
+    parser.add_argument('--max-null', type=int, default=0,
+                        help='Add at most this many null commands per source (0 = all)')
+    parser.add_argument('--corpus', default=str(CORPUS))
+    args = parser.parse_args()
+    if not (args.logs or args.transcripts or args.scripts):
+        args.transcripts = [str(HOOKS_DIR.parent / 'projects')]
+
+    with open(args.corpus) as f:
+        known = {json.loads(line)['command'] for line in f if line.strip()}
+
+    groups = [('recorded', commands_from_logs(d)) for d in args.logs]
+    groups += [('recorded', commands_from_transcripts(d)) for d in args.transcripts]
+    groups += [('script', commands_from_scripts(root)) for root in args.scripts]
+
+    added = unlabelled = 0
+    with open(args.corpus, 'a') as f:
+        for source, commands in groups:
+            entries = []
+            for command in commands:
+                if not command or command in known or len(command) > args.max_length:
+                    continue
+                known.add(command)
+                rule = UNLABELLED if NEEDS_LABEL.search(command) else None
+                entries.append({'command': command, 'rule': rule, 'source': source})
+            nulls = [e for e in entries if e['rule'] is None]
+            if args.max_null and len(nulls) > args.max_null:
+                nulls.sort(key=lambda e: hashlib.blake2b(e['command'].encode()).digest())
+                dropped = {id(e) for e in nulls[args.max_null:]}
+                entries = [e for e in entries if id(e) not in dropped]
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+            added += len(entries)
+            unlabelled += sum(e['rule'] == UNLABELLED for e in entries)
+    print(f"Added {added} commands to {args.corpus}; {unlabelled} need a label")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Anthropic Messages API.
+
+Answers POST /v1/messages with a well-formed message after a configurable
+delay, so anth.py and the LLM helper can be exercised without network or
+an API key. Point the SDK at it with ANTHROPIC_BASE_URL. The reply text
+is "Mock reply N". A prompt asking for a batch ("Generate 20 ...",
+"Generate exactly 20 ...") gets that many lines (Mockname1x1, ...).
+
+GET /stats returns the counts of requests and of TCP connections.
+Connections < requests means the client reused its keep-alive connection.
+
+Usage:
+- ./mock_messages.py --port 8765 --latency-ms 300
+- ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=test ../llm/anth.py "hi"
+"""
+
+import argparse
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BATCH_PATTERN = re.compile(r'Generate (?:exactly )?(\d+)')
+
+
+class MockMessagesServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0):
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self.connections = 0
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        super().__init__(address, Handler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def reply_text(self, prompt):
+        n = next(self._counter)
+        batch = BATCH_PATTERN.search(prompt)
+        if batch:
+            return '\n'.join(f"Mockname{n}x{i}" for i in range(1, int(batch.group(1)) + 1))
+        return f"Mock reply {n}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+
+    def setup(self):
+        super().setup()
+        self.server.count('connections')
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send(200, {'requests': self.server.requests,
+                             'connections': self.server.connections})
+        else:
+            self._send(404, {'type': 'error', 'error': {'type': 'not_found_error',
+                                                        'message': self.path}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            body = None
+        if not self.path.startswith('/v1/messages') or not isinstance(body, dict):
+            self._send(400, {'type': 'error', 'error': {'type': 'invalid_request_error',
+                                                        'message': 'bad request'}})
+            return
+        self.server.count('requests')
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000.0)
+        content = body.get('messages', [{}])[-1].get('content', '')
+        if isinstance(content, list):
+            content = ' '.join(part.get('text', '') for part in content)
+        text = self.server.reply_text(content)
+        self._send(200, {
+            'id': f"msg_mock_{self.server.requests}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': body.get('model', 'mock'),
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': len(content.split()), 'output_tokens': len(text.split())},
+        })
+
+
+def start(port=0, latency_ms=0):
+    """Serve on 127.0.0.1 in a background thread and return the server."""
+    server = MockMessagesServer(('127.0.0.1', port), latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock Anthropic Messages endpoint')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay before each reply')
+    args = parser.parse_args()
+
+    server = MockMessagesServer(('127.0.0.1', args.port), args.latency_ms)
+    print(f"Mock Messages API on {server.url} (ANTHROPIC_BASE_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
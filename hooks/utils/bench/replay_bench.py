@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Replay recorded hook payloads against the hook scripts.
+
+Payloads come from recorded event logs: .claude/logs/<hook>.jsonl, or the
+legacy <hook>.json arrays. Built-in samples are used when a hook has none.
+They are replayed against each hook script at a fixed arrival rate (or as
+fast as possible) with a number of concurrent processes. The report covers
+throughput, tail latency and peak RSS per configuration.
+
+Each hook is run once per --log-sizes entry, with its event log pre-filled
+to that many records, to show how latency scales with log size. stop.py
+also runs once per --transcript-sizes entry, with a synthetic transcript of
+that many lines, because its --chat path reads the transcript.
+
+Everything runs offline in a throwaway project:
+- TTS: the announcement daemon speaks through a local stub command
+  (CLAUDE_TTS_COMMAND) on a private socket
+- LLM: .claude/hooks/utils/llm/ollama.py and anth.py in the project are
+  stubs that print a fixed agent name, so user_prompt_submit.py --name-agent
+  never reaches a model
+BENCH_TTS_DELAY / BENCH_LLM_DELAY (seconds) make the stubs sleep to
+simulate a slow provider.
+
+Usage:
+- ./replay_bench.py                                   # 100 replays per hook, serial
+- ./replay_bench.py -n 500 --concurrency 8 --rate 50  # 50 payloads/s across 8 workers
+- ./replay_bench.py --hook stop --transcript-sizes 100,10000,100000
+- ./replay_bench.py --payloads ~/project/.claude/logs --log-sizes 0,100000
+- ./replay_bench.py --json results.json
+"""
+
+import argparse
+import itertools
+import json
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchlib import (HOOKS_DIR, bench_env, format_summary, percentile, run_measured,
+                      script_command, summarize, temp_project)
+from hook_latency import SAMPLE_PAYLOADS as TOOL_PAYLOADS
+
+from utils.eventlog import LOG_DIR, encode_record, iter_events, log_path_for
+from utils.sockserve import request
+
+HOOK_ARGS = {
+    'pre_tool_use': [],
+    'post_tool_use': [],
+    'stop': ['--chat', '--notify'],
+    'user_prompt_submit': ['--store-last-prompt', '--name-agent'],
+}
+
+SAMPLE_PAYLOADS = dict(TOOL_PAYLOADS)
+SAMPLE_PAYLOADS.update({
+    'stop': {'session_id': 'bench', 'hook_event_name': 'Stop', 'stop_hook_active': False,
+             'transcript_path': ''},
+    'user_prompt_submit': {'session_id': 'bench', 'hook_event_name': 'UserPromptSubmit',
+                           'prompt': 'Refactor the parser and add tests for the error paths'},
+})
+
+LLM_STUB = '''import os, sys, time
+time.sleep(float(os.getenv('BENCH_LLM_DELAY', '0')))
+print('Benchmark' if '--agent-name' in sys.argv else 'ok')
+'''
+TTS_STUB = '''import os, time
+time.sleep(float(os.getenv('BENCH_TTS_DELAY', '0')))
+'''
+
+
+def load_payloads(hook, sources):
+    """
+    Return recorded payloads for a hook from the given log directories.
+
+    Reads <hook>.jsonl and legacy <hook>.json arrays; falls back to a
+    built-in sample.
+    """
+    payloads = []
+    for source in sources:
+        payloads.extend(iter_events(hook, source))
+        legacy = Path(source) / f"{hook}.json"
+        try:
+            with open(legacy) as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                payloads.extend(record for record in data if isinstance(record, dict))
+        except (OSError, ValueError):
+            pass
+    return payloads or [SAMPLE_PAYLOADS[hook]]
+
+
+def write_transcript(path, lines):
+    """Write a synthetic transcript of alternating user/assistant messages."""
+    with open(path, 'wb') as f:
+        for i in range(lines):
+            role = 'user' if i % 2 == 0 else 'assistant'
+            f.write(encode_record({
+                'type': role, 'uuid': f"bench-{i:08d}", 'sessionId': 'bench',
+                'timestamp': '2025-01-01T00:00:00.000Z',
+                'message': {'role': role, 'content': [
+                    {'type': 'text', 'text': f"Message {i}: " + 'lorem ipsum dolor sit amet ' * 12}]},
+            }))
+
+
+def prefill_log(log_dir, hook, payload, records):
+    """Give a hook's event log `records` entries before the run."""
+    log_dir.mkdir(parents=True, exist_ok=True)
+    line = encode_record(payload)
+    with open(log_path_for(hook, log_dir), 'wb') as f:
+        for start in range(0, records, 1000):
+            f.write(line * min(1000, records - start))
+
+
+def install_stubs(project):
+    """Create the offline LLM and TTS stand-ins; returns the TTS command."""
+    llm_dir = project / '.claude' / 'hooks' / 'utils' / 'llm'
+    llm_dir.mkdir(parents=True, exist_ok=True)
+    for name in ('ollama.py', 'anth.py'):
+        (llm_dir / name).write_text(LLM_STUB)
+    tts = project / 'tts_stub.py'
+    tts.write_text(TTS_STUB)
+    return f"{sys.executable} {tts}"
+
+
+def reset_project(project):
+    """Remove logs and session data left by the previous configuration."""
+    for path in (project / '.claude' / 'logs', project / '.claude' / 'data'):
+        shutil.rmtree(path, ignore_errors=True)
+    (project / '.claude' / 'logs').mkdir(parents=True)
+
+
+def replay(argv, payloads, iterations, concurrency, rate, project, env):
+    """
+    Replay payloads through a hook.
+
+    Jobs are released at `rate` per second (0 = all at once) and run on
+    `concurrency` workers, each starting one hook process at a time.
+
+    Returns:
+        dict: latency samples (ms), peak RSS samples (KB), errors, elapsed seconds
+    """
+    samples, rss, errors = [], [], []
+    lock = threading.Lock()
+
+    def job(payload):
+        elapsed, code, peak = run_measured(argv, json.dumps(payload), project, env=env)
+        with lock:
+            samples.append(elapsed)
+            rss.append(peak)
+            if code not in (0, 2):  # 2 is a deliberate block
+                errors.append(code)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, payload in zip(range(iterations), itertools.cycle(payloads)):
+            if rate:
+                delay = started + i / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            pool.submit(job, payload)
+    return {'samples': samples, 'rss_kb': rss, 'errors': len(errors),
+            'elapsed': time.perf_counter() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded payloads against the hook scripts')
+    parser.add_argument('-n', '--iterations', type=int, default=100, help='Replays per configuration')
+    parser.add_argument('--hook', choices=sorted(HOOK_ARGS), action='append',
+                        help='Hook(s) to replay (default: all)')
+    parser.add_argument('--payloads', action='append',
+                        help=f'Log directory with recorded payloads (repeatable, default {LOG_DIR})')
+    parser.add_argument('--concurrency', type=int, default=1, help='Concurrent hook processes')
+    parser.add_argument('--rate', type=float, default=0, help='Arrivals per second (0 = unthrottled)')
+    parser.add_argument('--log-sizes', default='0,10000',
+                        help='Comma-separated event log sizes (records) to pre-fill')
+    parser.add_argument('--transcript-sizes', default='100,10000',
+                        help='Comma-separated transcript sizes (lines) for stop.py')
+    parser.add_argument('--json', metavar='PATH', help='Also write the results as JSON')
+    args = parser.parse_args()
+
+    hooks = args.hook or sorted(HOOK_ARGS)
+    sources = args.payloads or [str(LOG_DIR)]
+    log_sizes = [int(v) for v in args.log_sizes.split(',') if v]
+    transcript_sizes = [int(v) for v in args.transcript_sizes.split(',') if v]
+
+    results = []
+    with temp_project() as project:
+        socket = project / 'ttsd.sock'
+        env = bench_env(CLAUDE_TTS_COMMAND=install_stubs(project), CLAUDE_TTSD_SOCKET=socket,
+                        CLAUDE_HOOKD_SOCKET=project / 'hookd.sock', CLAUDE_HOOKD_AUTOSTART=0,
+                        CLAUDE_TTS_WORKER=0)
+        try:
+            for hook in hooks:
+                payloads = load_payloads(hook, sources)
+                argv = script_command(HOOKS_DIR / f"{hook}.py") + HOOK_ARGS[hook]
+                for log_size in log_sizes:
+                    for transcript_size in (transcript_sizes if hook == 'stop' else [None]):
+                        reset_project(project)
+                        prefill_log(project / '.claude' / 'logs', hook, payloads[0], log_size)
+                        run_payloads = payloads
+                        label = f"{hook} log={log_size}"
+                        if transcript_size is not None:
+                            transcript = project / 'transcript.jsonl'
+                            write_transcript(transcript, transcript_size)
+                            run_payloads = [dict(p, transcript_path=str(transcript)) for p in payloads]
+                            label += f" transcript={transcript_size}"
+
+                        run = replay(argv, run_payloads, args.iterations, args.concurrency,
+                                     args.rate, project, env)
+                        summary = summarize(run['samples'])
+                        throughput = len(run['samples']) / run['elapsed'] if run['elapsed'] else 0.0
+                        peak_mb = max(run['rss_kb'] or [0]) / 1024
+                        median_mb = percentile(run['rss_kb'], 50) / 1024
+                        print(f"{format_summary(label, summary)} thr={throughput:7.1f}/s "
+                              f"rss p50={median_mb:5.1f}MB max={peak_mb:5.1f}MB errors={run['errors']}")
+                        results.append({'hook': hook, 'log_size': log_size,
+                                        'transcript_size': transcript_size,
+                                        'concurrency': args.concurrency, 'rate': args.rate,
+                                        'throughput': throughput, 'peak_rss_mb': peak_mb,
+                                        'median_rss_mb': median_mb, 'errors': run['errors'],
+                                        **summary})
+        finally:
+            try:
+                request(socket, {'command': 'shutdown'}, timeout=2)
+            except (OSError, ValueError):
+                pass
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the session store against per-session JSON rewrites.
+
+Appends N prompts spread over S sessions three ways:
+- json:       load <session_id>.json, append, rewrite (the old hook code)
+- store:      a fresh SessionStore per prompt, as each hook process does
+- store-warm: one SessionStore for all prompts (connection cost excluded)
+
+It then times cross-session queries: the last 50 prompts overall (for the
+JSON files this means opening every file), one session's prompts, a
+prompt prefix, and the sessions in one directory.
+
+Usage:
+- ./sessionstore_bench.py                   # 100,000 prompts over 500 sessions
+- ./sessionstore_bench.py -n 20000 --sessions 100
+"""
+
+import argparse
+import json
+import random
+import time
+
+from benchlib import format_summary, summarize, temp_project
+
+from utils.sessionstore import LEGACY_DIR, SessionStore
+
+WORDS = ('Refactor', 'Fix', 'Add', 'Explain', 'Why', 'Update', 'Remove', 'Test', 'Document')
+QUERY_RUNS = 20
+
+
+def make_prompts(count, sessions):
+    session_ids = [f"session-{i:05d}" for i in range(sessions)]
+    return [(random.choice(session_ids), f"{random.choice(WORDS)} the parser module, step {i}",
+             f"/repos/project-{hash(s) % 20}") for i, s in
+            ((i, random.choice(session_ids)) for i in range(count))]
+
+
+def append_json(data_dir, session_id, prompt):
+    path = data_dir / LEGACY_DIR / f"{session_id}.json"
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {'session_id': session_id, 'prompts': []}
+    data['prompts'].append(prompt)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def last_prompts_json(data_dir, limit):
+    """Last prompts across sessions from JSON files (newest files first, no timestamps)."""
+    paths = sorted((data_dir / LEGACY_DIR).glob('*.json'), key=lambda p: p.stat().st_mtime,
+                   reverse=True)
+    prompts = []
+    for path in paths:
+        with open(path) as f:
+            prompts.extend(json.load(f)['prompts'][-limit:])
+    return prompts[:limit]
+
+
+def timed(fn, runs=QUERY_RUNS):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return summarize(samples)
+
+
+def run_appends(label, prompts, append):
+    samples = []
+    start = time.perf_counter()
+    for session_id, prompt, cwd in prompts:
+        t = time.perf_counter()
+        append(session_id, prompt, cwd)
+        samples.append((time.perf_counter() - t) * 1000.0)
+    total = time.perf_counter() - start
+    print(f"{format_summary(label + ' append', summarize(samples))} total={total:6.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Session store benchmark')
+    parser.add_argument('-n', '--prompts', type=int, default=100_000)
+    parser.add_argument('--sessions', type=int, default=500)
+    args = parser.parse_args()
+
+    random.seed(1)
+    prompts = make_prompts(args.prompts, args.sessions)
+
+    with temp_project() as project:
+        data_dir = project / 'json'
+        (data_dir / LEGACY_DIR).mkdir(parents=True)
+        run_appends('json', prompts, lambda s, p, cwd: append_json(data_dir, s, p))
+        print(format_summary('json last 50 overall', timed(lambda: last_prompts_json(data_dir, 50),
+                                                           runs=3)))
+
+        store_dir = project / 'store'
+
+        def append_cold(session_id, prompt, cwd):
+            with SessionStore(store_dir) as store:
+                store.add_prompt(session_id, prompt, cwd=cwd)
+        run_appends('store', prompts[:min(len(prompts), 20000)], append_cold)
+
+        with SessionStore(store_dir) as store:
+            run_appends('store-warm', prompts[20000:],
+                        lambda s, p, cwd: store.add_prompt(s, p, cwd=cwd))
+
+            session_id = prompts[0][0]
+            print(format_summary('store last 50 overall', timed(lambda: store.recent_prompts(50))))
+            print(format_summary('store one session', timed(
+                lambda: store.recent_prompts(1000, session_id=session_id))))
+            print(format_summary('store prefix', timed(
+                lambda: store.recent_prompts(50, prefix='Explain the'))))
+            print(format_summary('store sessions by cwd', timed(
+                lambda: store.sessions(cwd='/repos/project-3'))))
+            print(format_summary('store export session', timed(
+                lambda: store.get_session(session_id))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Check that utils/ttsd.py coalesces a burst of announcements into one.
+
+Parallel subagents finishing together send their "Subagent Complete"
+announcements a few tens of milliseconds apart. Each burst is fed to an
+AnnouncementQueue whose speaker only records what it was asked to say;
+the burst must come out as a single "N subagents complete". A second
+round checks that announcements arriving while one is being spoken also
+coalesce. The delay from the first stop to speech is reported (it should
+be about the coalescing window). Exit status 1 means a burst was split or an announcement lost.
+
+Usage:
+- ./ttsd_coalesce_check.py                     # 4 stops 50 ms apart
+- ./ttsd_coalesce_check.py --count 8 --gap-ms 30 --rounds 5
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+from benchlib import format_summary, summarize
+
+from utils.ttsd import COALESCE_WINDOW, AnnouncementQueue
+
+KEY = 'subagent_stop'
+MANY = '{count} subagents complete'
+
+
+def run_schedule(offsets, speak_seconds=0.0):
+    """
+    Send one subagent stop at each offset (seconds from the start).
+
+    Returns:
+        tuple: (texts passed to the speaker in order, ms from the first
+                stop to the first speech)
+    """
+    spoken = []
+    delays = []
+
+    def speaker(text):
+        spoken.append(text)
+        delays.append((time.monotonic() - start) * 1000.0)
+        time.sleep(speak_seconds)
+
+    queue = AnnouncementQueue(speaker=speaker)
+    threading.Thread(target=queue.run, daemon=True).start()
+    start = time.monotonic()
+    for offset in offsets:
+        time.sleep(max(0.0, start + offset - time.monotonic()))
+        queue.put('Subagent Complete', key=KEY, many=MANY)
+
+    # Long enough for the window, playback and any split-off announcement
+    time.sleep(2 * (COALESCE_WINDOW + speak_seconds) + 0.2)
+    return spoken, delays[0] if delays else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ttsd announcement coalescing check')
+    parser.add_argument('--count', type=int, default=4, help='Subagent stops per burst')
+    parser.add_argument('--gap-ms', type=float, default=50, help='Milliseconds between stops')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    gap = args.gap_ms / 1000.0
+    if gap * (args.count - 1) >= COALESCE_WINDOW:
+        parser.error(f"a burst must fit in the {COALESCE_WINDOW * 1000:.0f} ms coalescing window")
+
+    burst = [i * gap for i in range(args.count)]
+    failures = 0
+    first_speech = []
+
+    def report(label, spoken, expected):
+        ok = spoken == expected
+        print(f"{label:<10} {'ok  ' if ok else 'FAIL'} spoken={spoken}")
+        return not ok
+
+    for round_number in range(args.rounds):
+        spoken, delay = run_schedule(burst)
+        failures += report(f"burst {round_number + 1}:", spoken, [MANY.format(count=args.count)])
+        if delay is not None:
+            first_speech.append(delay)
+
+    # A burst arriving while the first clip plays is spoken once, afterwards
+    playing = COALESCE_WINDOW + 0.1
+    spoken, _ = run_schedule([0.0] + [playing + t for t in burst], 0.5)
+    failures += report('playback:', spoken, ['Subagent Complete', MANY.format(count=args.count)])
+    print(format_summary('first stop to speech', summarize(first_speech)))
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
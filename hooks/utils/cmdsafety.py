@@ -0,0 +1,424 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Single-pass safety scanner for destructive Bash commands.
+
+Replaces the chain of per-pattern re.search calls that pre_tool_use.py used
+to run on every Bash command. A precompiled prefilter rejects commands that
+cannot delete anything (the common case) with one regex scan; the rest are
+tokenized by one compiled regex (shell words, quotes and operators) and
+walked left to right in a single pass, tracking compound
+operators (&&, ||, ;, |, &, subshells), reserved words ({ }, if, for,
+while, !, coproc, function definitions, ...), wrapper commands (sudo,
+env, xargs, busybox, ...), `cd` into dangerous directories, `find
+-delete` / `find -exec rm`, and nested `bash -c` / `bash -lc` / `eval` /
+`trap` strings.
+
+Whatever the scanner cannot classify is decided by the original
+is_dangerous_rm_command regexes rather than allowed. That covers targets
+that are variables or command substitutions, `cd` to an unknown
+directory, unbalanced quotes, nesting deeper than MAX_NESTING, and
+unknown commands with an rm or find word in their arguments (busybox rm,
+git rm, ...).
+
+Rules reported:
+- rm-recursive-force:      rm with both recursive and force flags
+- rm-no-preserve-root:     rm --no-preserve-root
+- rm-recursive-dangerous:  recursive rm targeting an absolute path, ~, $HOME, ., ..,
+                           a glob, or a relative path after `cd` to one of those
+- xargs-rm-recursive:      recursive rm fed by xargs (targets unknown)
+- find-delete-dangerous:   find -delete / -exec rm on a dangerous root without filters
+- unparsed-rm-pattern:     legacy regex match on a command the scanner cannot classify
+
+Usage:
+- ./cmdsafety.py "rm -rf /tmp/foo && ls"    # Print the matching rule, if any
+"""
+
+import re
+import sys
+from collections import namedtuple
+
+Match = namedtuple('Match', ['rule', 'segment'])
+
+# Commands that mention none of these cannot trip any rule
+PREFILTER = re.compile(r'\b(?:rm|find)\b')
+
+# One pass over the command: operators end a simple command, words are
+# runs of unquoted characters, quoted strings and escapes
+TOKEN = re.compile(r'''
+    [ \t\r]+
+  | (?P<op>&&|\|\||;;|\|&|\$\(|[;&|()`\n])
+  | (?P<word>(?:[^\s'"\\;&|()`]|\\.|'[^']*'|"(?:[^"\\]|\\.)*")+)
+  | (?P<bad>.)
+''', re.VERBOSE | re.DOTALL)
+
+QUOTED = re.compile(r'''\\(.)|'([^']*)'|"((?:[^"\\]|\\.)*)"''', re.DOTALL)
+
+# Commands that run another command given as their arguments
+WRAPPERS = frozenset({'sudo', 'doas', 'command', 'env', 'nice', 'nohup', 'time',
+                      'exec', 'builtin', 'ionice', 'timeout', 'stdbuf', 'busybox', 'toybox'})
+
+# Wrapper options that consume the following word (sudo -u root, nice -n 5, ...)
+WRAPPER_OPTIONS_WITH_VALUE = {
+    'sudo': frozenset({'-u', '-g', '-h', '-p', '-C', '-U'}),
+    'doas': frozenset({'-u', '-C'}),
+    'nice': frozenset({'-n'}),
+    'ionice': frozenset({'-c', '-n', '-p'}),
+    'timeout': frozenset({'-s', '-k'}),
+}
+
+SHELLS = frozenset({'sh', 'bash', 'zsh', 'dash', 'ksh'})
+
+# Reserved words that may precede a command; the command after them is scanned
+RESERVED_WORDS = frozenset({'{', '}', '!', 'if', 'then', 'elif', 'else', 'fi', 'do', 'done',
+                            'while', 'until', 'for', 'select', 'case', 'esac', 'coproc'})
+
+# Words that make an unrecognized command worth a legacy regex check
+DELETING_COMMANDS = frozenset({'rm', 'find'})
+
+# find predicates that narrow what -delete touches
+FIND_FILTERS = frozenset({'-name', '-iname', '-path', '-ipath', '-regex', '-iregex',
+                          '-wholename', '-newer', '-mtime', '-mmin', '-size', '-empty',
+                          '-user', '-group', '-perm', '-inum', '-samefile'})
+
+# Shell options that consume the following word (bash -o pipefail -c ...)
+SHELL_OPTIONS_WITH_VALUE = frozenset({'-o', '+o', '-O', '+O', '--rcfile', '--init-file'})
+
+# Commands that change the directory later relative targets resolve against
+CHDIR_COMMANDS = frozenset({'cd', 'pushd'})
+
+# The original is_dangerous_rm_command, precompiled, for commands the scanner
+# cannot classify: rm with recursive and force flags, or a recursive rm on a
+# line that contains a path-like character (/, ~, ., *) anywhere.
+LEGACY_FLAGS = re.compile('|'.join([
+    r'\brm\s+.*-[a-z]*r[a-z]*f',
+    r'\brm\s+.*-[a-z]*f[a-z]*r',
+    r'\brm\s+--recursive\s+--force',
+    r'\brm\s+--force\s+--recursive',
+    r'\brm\s+-r\s+.*-f',
+    r'\brm\s+-f\s+.*-r',
+]))
+LEGACY_RECURSIVE = re.compile(r'\brm\s+.*-[a-z]*r')
+LEGACY_PATHS = re.compile(r'[/~.*]')
+
+MAX_NESTING = 2
+
+ASSIGNMENT = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*=')
+
+# Returned by the scan helpers for constructs they cannot classify
+UNCLASSIFIED = 'unclassified'
+
+
+def legacy_match(command):
+    """
+    Apply the original regex rules to a whole command line.
+
+    Returns:
+        str: The matched text, or None
+    """
+    normalized = ' '.join(command.lower().split())
+    found = LEGACY_FLAGS.search(normalized)
+    if found:
+        return found.group(0)
+    found = LEGACY_RECURSIVE.search(normalized)
+    if found and LEGACY_PATHS.search(normalized):
+        return found.group(0)
+    return None
+
+
+def _is_dangerous_target(arg):
+    """Return True if an rm/find path argument is too broad to delete recursively."""
+    if arg in ('.', './', './*', '..', '../', '*'):
+        return True
+    if arg.startswith(('/', '~', '$HOME', '${HOME}')):
+        return True
+    if arg == '..' or arg.startswith('../') or '/../' in arg or arg.endswith('/..'):
+        return True
+    return '*' in arg
+
+
+def _is_unknown_target(arg):
+    """Return True if a path argument is only known at run time ($VAR, `...`)."""
+    return '$' in arg or '`' in arg
+
+
+def _scan_rm(args, via_xargs, cwd='safe'):
+    """
+    Classify one rm invocation from its argument tokens.
+
+    cwd describes earlier `cd` commands on the line: 'safe' (none, or into
+    a relative directory), 'dangerous' or 'unknown'.
+    """
+    recursive = force = False
+    targets = []
+    options_done = False
+    for arg in args:
+        if not options_done and arg == '--':
+            options_done = True
+        elif not options_done and arg.startswith('--'):
+            if arg == '--recursive':
+                recursive = True
+            elif arg == '--force':
+                force = True
+            elif arg == '--no-preserve-root':
+                return 'rm-no-preserve-root'
+        elif not options_done and arg.startswith('-') and len(arg) > 1:
+            flags = arg[1:]
+            if 'r' in flags or 'R' in flags:
+                recursive = True
+            if 'f' in flags:
+                force = True
+        else:
+            targets.append(arg)
+
+    if recursive and force:
+        return 'rm-recursive-force'
+    if recursive and via_xargs:
+        return 'xargs-rm-recursive'
+    if not recursive:
+        return None
+    if any(_is_dangerous_target(t) for t in targets):
+        return 'rm-recursive-dangerous'
+    known = [t for t in targets if not _is_unknown_target(t)]
+    if known and cwd == 'dangerous':
+        return 'rm-recursive-dangerous'
+    if not targets or len(known) < len(targets) or cwd == 'unknown':
+        return UNCLASSIFIED
+    return None
+
+
+def _scan_find(args):
+    """Classify one find invocation from its argument tokens."""
+    roots = []
+    filtered = False
+    i = 0
+    while i < len(args) and not args[i].startswith(('-', '(', '!')):
+        roots.append(args[i])
+        i += 1
+    roots = roots or ['.']
+    unknown = any(_is_unknown_target(r) for r in roots)
+
+    while i < len(args):
+        arg = args[i]
+        if arg in FIND_FILTERS:
+            filtered = True
+        elif arg in ('-exec', '-execdir', '-ok', '-okdir'):
+            # The sub-command runs until ; or +
+            end = i + 1
+            while end < len(args) and args[end] not in (';', '+', '\\;'):
+                end += 1
+            sub = args[i + 1:end]
+            if sub and sub[0].rsplit('/', 1)[-1] == 'rm':
+                rule = _scan_rm(sub[1:], via_xargs=False)
+                if rule == 'rm-recursive-force' or rule == 'rm-no-preserve-root':
+                    return rule
+                if not filtered and any(_is_dangerous_target(r) for r in roots):
+                    return 'find-delete-dangerous'
+                if not filtered and unknown:
+                    return UNCLASSIFIED
+            i = end
+        elif arg == '-delete':
+            if not filtered and any(_is_dangerous_target(r) for r in roots):
+                return 'find-delete-dangerous'
+            if not filtered and unknown:
+                return UNCLASSIFIED
+        i += 1
+    return None
+
+
+def _unquote(match):
+    """Replacement function stripping one quote/escape construct."""
+    escaped, single, double = match.groups()
+    if escaped is not None:
+        return escaped
+    if single is not None:
+        return single
+    return re.sub(r'\\(.)', r'\1', double)
+
+
+def _tokenize(command):
+    """
+    Split a command into words, with None marking each operator.
+
+    Raises:
+        ValueError: On unbalanced quotes or a trailing escape
+    """
+    tokens = []
+    for match in TOKEN.finditer(command):
+        kind = match.lastgroup
+        if kind == 'word':
+            word = match.group('word')
+            if "'" in word or '"' in word or '\\' in word:
+                word = QUOTED.sub(_unquote, word)
+            tokens.append(word)
+        elif kind == 'op':
+            tokens.append(None)
+        elif kind == 'bad':
+            raise ValueError(f"Cannot tokenize near {match.group('bad')!r}")
+    return tokens
+
+
+def _scan_tokens(tokens, depth, via_xargs=False):
+    """
+    Walk tokens once, classifying each simple command as it ends.
+
+    Returns:
+        tuple: (rule, segment) for the first dangerous simple command,
+        (UNCLASSIFIED, segment) if none was but one could not be
+        classified, or None
+    """
+    start = 0
+    cwd = 'safe'
+    unclassified = None
+    for end in range(len(tokens) + 1):
+        if end < len(tokens) and tokens[end] is not None:
+            continue
+        words = tokens[start:end]
+        start = end + 1
+        if not words:
+            continue
+        first = 0
+        while first < len(words) - 1 and words[first] in RESERVED_WORDS:
+            first += 1  # then cd /, { cd /, ...
+        if words[first] in CHDIR_COMMANDS:
+            cwd = _chdir_state(words[first + 1:], cwd)
+            continue
+        rule = _scan_simple_command(words, depth, cwd, via_xargs)
+        if rule == UNCLASSIFIED:
+            unclassified = unclassified or ' '.join(words)
+        elif rule:
+            return rule, ' '.join(words)
+    return (UNCLASSIFIED, unclassified) if unclassified else None
+
+
+def _chdir_state(args, cwd):
+    """Return the cwd state after `cd args` (see _scan_rm)."""
+    args = [a for a in args if not a.startswith('-') or a == '-']
+    if not args:
+        return 'dangerous'  # cd with no argument goes home
+    if _is_unknown_target(args[0]) or args[0] == '-':
+        return 'unknown'
+    if _is_dangerous_target(args[0]):
+        return 'dangerous'
+    return cwd
+
+
+def _scan_nested(script, depth, via_xargs=False):
+    """Classify a command string run by eval, trap or a shell's -c."""
+    if depth >= MAX_NESTING:
+        return UNCLASSIFIED
+    if not PREFILTER.search(script):
+        return None
+    try:
+        result = _scan_tokens(_tokenize(script), depth + 1, via_xargs)
+    except ValueError:
+        return UNCLASSIFIED
+    return result[0] if result else None
+
+
+def _shell_script(args):
+    """Return the -c script of a shell invocation, '' without -c, or None if unclear."""
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in SHELL_OPTIONS_WITH_VALUE:
+            i += 2
+        elif arg.startswith('--'):
+            i += 1
+        elif arg[:1] in ('-', '+') and len(arg) > 1:
+            if 'c' in arg[1:]:
+                # -c, -lc, -ec, ...: the script is the first operand after the options
+                rest = [a for a in args[i + 1:] if not a.startswith(('-', '+'))]
+                return rest[0] if rest else None
+            i += 1
+        else:
+            return ''  # A script file
+    return ''
+
+
+def _scan_simple_command(words, depth, cwd='safe', via_xargs=False):
+    """Classify one simple command (no operators) from its words."""
+    i = 0
+    while i < len(words):
+        word = words[i]
+        name = word.rsplit('/', 1)[-1]
+
+        if ASSIGNMENT.match(word):
+            i += 1  # VAR=value before the command name
+        elif word in RESERVED_WORDS:
+            i += 1
+        elif word == 'function':
+            i += 2  # function name { ...; }
+        elif name in WRAPPERS:
+            i += 1
+            # Skip wrapper options (sudo -u root, timeout 10s, env -i X=1, ...)
+            while i < len(words) and (words[i].startswith('-') or words[i][:1].isdigit()
+                                      or ('=' in words[i] and name == 'env')):
+                if words[i] in WRAPPER_OPTIONS_WITH_VALUE.get(name, ()):
+                    i += 1
+                i += 1
+        elif name == 'xargs':
+            via_xargs = True
+            i += 1
+            while i < len(words) and words[i].startswith('-'):
+                i += 1
+        elif name == 'eval':
+            return _scan_nested(' '.join(words[i + 1:]), depth, via_xargs)
+        elif name == 'trap':
+            # trap 'handler' SIGNAL...: the handler runs later, in this shell
+            handler = [w for w in words[i + 1:] if not w.startswith('-')][:1]
+            return _scan_nested(handler[0], depth) if handler else None
+        elif name in SHELLS:
+            script = _shell_script(words[i + 1:])
+            if script is None:
+                return UNCLASSIFIED
+            return _scan_nested(script, depth, via_xargs) if script else None
+        elif name == 'rm':
+            return _scan_rm(words[i + 1:], via_xargs, cwd)
+        elif name == 'find':
+            return _scan_find(words[i + 1:])
+        elif any(w.rsplit('/', 1)[-1] in DELETING_COMMANDS for w in words[i + 1:]):
+            return UNCLASSIFIED  # busybox rm, git rm, for x in ...; rm, ...
+        else:
+            return None
+    return None
+
+
+def scan_command(command, depth=0):
+    """
+    Scan a Bash command for destructive deletions.
+
+    Args:
+        command (str): The full Bash command line
+
+    Returns:
+        Match: (rule, segment) for the first dangerous simple command, or None
+    """
+    if not command or not PREFILTER.search(command):
+        return None
+
+    try:
+        result = _scan_tokens(_tokenize(command), depth)
+    except ValueError:
+        result = (UNCLASSIFIED, command)  # Unbalanced quotes and similar
+
+    if result and result[0] == UNCLASSIFIED:
+        found = legacy_match(command)
+        return Match('unparsed-rm-pattern', found) if found else None
+    return Match(*result) if result else None
+
+
+def main():
+    command = ' '.join(sys.argv[1:]) if len(sys.argv) > 1 else sys.stdin.read()
+    match = scan_command(command)
+    if match:
+        print(f"BLOCK {match.rule}: {match.segment}")
+        sys.exit(2)
+    print("ALLOW")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Lazy .env loading for the hooks.
+
+The hooks used to import python-dotenv and call load_dotenv() at module
+import, so every PreToolUse/PostToolUse call paid for it even though most
+code paths never read an environment variable. Call load_env() right
+before the code that does (engineer name, TTS provider selection, the TTS
+daemon at startup) instead.
+"""
+
+import os
+from pathlib import Path
+
+_loaded = False
+
+
+def _find_env_file():
+    """Return the nearest .env above this file (where load_dotenv() looks)."""
+    for directory in Path(__file__).resolve().parents:
+        candidate = directory / '.env'
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _parse_env_file(path):
+    """Set KEY=VALUE lines of a .env file that are not already set."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('export '):
+                line = line[len('export '):].lstrip()
+            key, sep, value = line.partition('=')
+            key, value = key.strip(), value.strip()
+            if not sep or not key or key.startswith('#'):
+                continue
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+                value = value[1:-1]
+            elif ' #' in value:
+                value = value.split(' #', 1)[0].rstrip()
+            os.environ.setdefault(key, value)
+
+
+def load_env():
+    """
+    Load the nearest .env once per process.
+
+    load_dotenv() searches upward from this file, so .claude/.env is found
+    the same way as from the hook scripts. Without python-dotenv (hooks
+    that do not declare it, and daemons they start) simple KEY=VALUE
+    files are read directly, likewise without overriding set variables.
+    """
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        path = _find_env_file()
+        if path is not None:
+            try:
+                _parse_env_file(path)
+            except (OSError, UnicodeDecodeError):
+                pass
+        return
+    load_dotenv()
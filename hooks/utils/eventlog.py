@@ -0,0 +1,397 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Append-only JSONL event log shared by all hooks.
+
+Each hook event is written as one compact JSON record per line to
+.claude/logs/<event>.jsonl, so logging costs O(1) regardless of how large
+the log has grown. Records are written with a single O_APPEND write, and a
+torn trailing line left behind by a crashed writer is isolated on its own
+line (and skipped by readers) instead of corrupting the next record.
+
+On a local POSIX filesystem a single O_APPEND write is atomic, so parallel
+hooks (subagents finishing together, parallel tool calls) never interleave
+or lose records. Where that does not hold (NFS, some network or FUSE
+mounts), set CLAUDE_HOOKS_LOG_LOCK=1 to also take an exclusive flock on the
+log file around each write. bench/log_stress.py checks both modes.
+
+Event logs roll over once they pass CLAUDE_HOOKS_LOG_MAX_BYTES; rotated
+segments are listed in rotated/manifest.json and compressed in the
+background (see utils/logrotate.py). iter_log() and iter_events() read the
+segments and the live file as one log.
+
+Usage:
+- ./eventlog.py --migrate                  # Convert .claude/logs/<event>.json arrays to .jsonl
+- ./eventlog.py --migrate path/to/logs     # Convert arrays in a specific directory
+- ./eventlog.py --cat pre_tool_use         # Print records of one event log
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: locking is skipped
+
+LOG_DIR = Path('.claude/logs')
+LOG_SUFFIX = '.jsonl'
+
+# fsync policies:
+# - "never":  leave flushing to the OS (fastest, default)
+# - "always": fsync after every record
+# - "batch":  fsync once every FSYNC_BATCH records written by this process
+FSYNC_POLICIES = ('never', 'always', 'batch')
+FSYNC_BATCH = 32
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+ROTATED_DIR = 'rotated'
+MANIFEST_FILE = 'manifest.json'
+
+# Event logs the hooks used to write as <event>.json arrays. Other .json
+# files in the log directory (stop.py's chat.json, ...) are not event logs.
+HOOK_EVENT_LOGS = ('notification', 'post_tool_use', 'pre_compact', 'pre_tool_use',
+                   'session_start', 'stop', 'subagent_stop', 'user_prompt_submit')
+
+_unsynced = {}
+
+
+def get_fsync_policy():
+    """Return the fsync policy from CLAUDE_HOOKS_LOG_FSYNC (default "never")."""
+    policy = os.getenv('CLAUDE_HOOKS_LOG_FSYNC', 'never').strip().lower()
+    return policy if policy in FSYNC_POLICIES else 'never'
+
+
+def get_lock_policy():
+    """Return True when CLAUDE_HOOKS_LOG_LOCK asks for locked appends."""
+    return os.getenv('CLAUDE_HOOKS_LOG_LOCK', '0').strip().lower() in ('1', 'true', 'yes')
+
+
+def get_rotate_bytes():
+    """Return the size at which event logs roll over (CLAUDE_HOOKS_LOG_MAX_BYTES, 0 = never)."""
+    try:
+        return int(os.getenv('CLAUDE_HOOKS_LOG_MAX_BYTES', DEFAULT_MAX_BYTES))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+def log_path_for(event, log_dir=None):
+    """Return the JSONL path used for an event name."""
+    return Path(log_dir if log_dir is not None else LOG_DIR) / f"{event}{LOG_SUFFIX}"
+
+
+def encode_record(record):
+    """Encode a record as one compact JSON line (bytes, newline terminated)."""
+    line = json.dumps(record, separators=(',', ':'), ensure_ascii=False)
+    return (line + '\n').encode('utf-8')
+
+
+def _ends_with_newline(fd, size):
+    """Check whether the file behind fd (size bytes long) is empty or ends with a newline."""
+    if size == 0:
+        return True
+    return os.pread(fd, 1, size - 1) == b'\n'
+
+
+def _maybe_fsync(fd, path, fsync):
+    """Apply the fsync policy after a write."""
+    if fsync == 'always':
+        os.fsync(fd)
+    elif fsync == 'batch':
+        key = str(path)
+        _unsynced[key] = _unsynced.get(key, 0) + 1
+        if _unsynced[key] >= FSYNC_BATCH:
+            os.fsync(fd)
+            _unsynced[key] = 0
+
+
+def _lock_fd(fd, blocking=True):
+    """Take an exclusive flock on fd; return the wait in milliseconds."""
+    if fcntl is None:
+        return 0.0
+    start = time.perf_counter()
+    fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    return (time.perf_counter() - start) * 1000.0
+
+
+@contextmanager
+def file_lock(path, blocking=True):
+    """
+    Hold an exclusive advisory lock on a lock file for the duration of a block.
+
+    Args:
+        path (Path): Lock file (created if missing)
+        blocking (bool): With False, raise BlockingIOError instead of waiting
+            when another process holds the lock
+
+    Yields:
+        float: Milliseconds spent waiting for the lock
+    """
+    path = Path(path)
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        waited = _lock_fd(fd, blocking)
+    except BaseException:
+        os.close(fd)
+        raise
+    try:
+        yield waited
+    finally:
+        os.close(fd)  # Closing the descriptor releases the lock
+
+
+def append_record(path, record, fsync=None, lock=None, max_bytes=None):
+    """
+    Append one record to a JSONL file.
+
+    Args:
+        path (Path): Target .jsonl file (parent directory is created)
+        record (dict): JSON-serializable record
+        fsync (str): "never", "always" or "batch"; defaults to the env policy
+        lock (bool): Hold an exclusive flock on the file while writing;
+            defaults to CLAUDE_HOOKS_LOG_LOCK
+        max_bytes (int): Rotate the file once this append takes it past
+            max_bytes (default: never)
+
+    Returns:
+        float: Milliseconds spent waiting for the lock (0.0 when unlocked)
+    """
+    path = Path(path)
+    data = encode_record(record)
+    fsync = fsync or get_fsync_policy()
+    lock = get_lock_policy() if lock is None else lock
+    waited = 0.0
+
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+
+    try:
+        if lock:
+            waited = _lock_fd(fd)  # Released when fd is closed
+        # A previous writer crashed mid-record: start on a fresh line so the
+        # torn fragment stays isolated and readers can skip it
+        size = os.fstat(fd).st_size
+        if not _ends_with_newline(fd, size):
+            data = b'\n' + data
+        os.write(fd, data)
+        _maybe_fsync(fd, path, fsync)
+    finally:
+        os.close(fd)
+
+    if max_bytes and size + len(data) > max_bytes:
+        try:
+            from utils.logrotate import rotate
+            rotate(path, max_bytes=max_bytes)
+        except (OSError, ImportError):
+            pass  # Rotation is retried by the next append
+    return waited
+
+
+def stamp_record(record):
+    """
+    Add indexing fields to a hook payload before it is logged.
+
+    - logged_at: epoch seconds of the append
+    - transcript_offset: size of the session transcript at that moment, so
+      an event can be located in the transcript (and its archive) later
+    """
+    stamped = dict(record)
+    stamped['logged_at'] = round(time.time(), 3)
+    transcript_path = record.get('transcript_path')
+    if transcript_path and 'transcript_offset' not in record:
+        try:
+            stamped['transcript_offset'] = os.stat(transcript_path).st_size
+        except (OSError, TypeError, ValueError):
+            pass
+    return stamped
+
+
+def append_event(event, record, log_dir=None, fsync=None, lock=None):
+    """
+    Append a hook event record to .claude/logs/<event>.jsonl.
+
+    The record is stamped with logged_at and transcript_offset (see
+    stamp_record) for utils/logquery.py.
+
+    Args:
+        event (str): Event log name (e.g. "pre_tool_use")
+        record (dict): The hook input data to log
+        log_dir (Path): Log directory, defaults to .claude/logs
+        fsync (str): Optional fsync policy override
+        lock (bool): Optional lock policy override
+
+    Returns:
+        float: Milliseconds spent waiting for the lock
+    """
+    return append_record(log_path_for(event, log_dir), stamp_record(record), fsync=fsync, lock=lock,
+                         max_bytes=get_rotate_bytes())
+
+
+def iter_records(path):
+    """
+    Yield records from a JSONL file, skipping blank and torn lines.
+
+    Args:
+        path (Path): .jsonl file to read (.jsonl.gz is decompressed)
+
+    Yields:
+        dict: Each decoded record in file order
+    """
+    try:
+        if str(path).endswith('.gz'):
+            import gzip
+            f = gzip.open(path, 'rb')
+        else:
+            f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue  # Partial line from an interrupted write
+
+
+def segment_paths(path):
+    """
+    Return the rotated segments of a log file, oldest first.
+
+    Each segment is the plain .jsonl file, or its .gz once the background
+    compressor has replaced it.
+    """
+    path = Path(path)
+    rotated = path.parent / ROTATED_DIR
+    try:
+        with open(rotated / MANIFEST_FILE, 'r') as f:
+            segments = json.load(f).get('segments', {}).get(path.name, [])
+    except (OSError, ValueError):
+        return []
+    paths = []
+    for segment in segments:
+        plain = rotated / segment['file']
+        # The .gz appears before the plain file is removed
+        paths.append(plain if plain.exists() else plain.with_name(plain.name + '.gz'))
+    return paths
+
+
+def iter_log(path):
+    """Yield records of a log file across its rotated segments, oldest first."""
+    for segment in segment_paths(path):
+        yield from iter_records(segment)
+    yield from iter_records(path)
+
+
+def iter_events(event, log_dir=None):
+    """Yield records of one event log, including rotated segments."""
+    return iter_log(log_path_for(event, log_dir))
+
+
+def migrate_array_log(json_path, fsync='never'):
+    """
+    Convert a legacy pretty-printed JSON array log to JSONL.
+
+    Records are appended to the matching .jsonl file (after anything already
+    logged there), then the original array is renamed to *.json.migrated.
+
+    Args:
+        json_path (Path): Legacy <event>.json file
+
+    Returns:
+        int: Number of records migrated, or None if the file was not an array
+    """
+    json_path = Path(json_path)
+    try:
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, ValueError, OSError):
+        return None
+    if not isinstance(data, list):
+        return None
+
+    jsonl_path = json_path.with_suffix(LOG_SUFFIX)
+    tmp_path = jsonl_path.with_name(jsonl_path.name + '.migrating')
+
+    # Legacy records go first, followed by anything already in the JSONL log
+    with open(tmp_path, 'wb') as out:
+        for record in data:
+            out.write(encode_record(record))
+        if jsonl_path.exists():
+            with open(jsonl_path, 'rb') as existing:
+                for line in existing:
+                    if line.strip():
+                        out.write(line if line.endswith(b'\n') else line + b'\n')
+        out.flush()
+        if fsync != 'never':
+            os.fsync(out.fileno())
+
+    os.replace(tmp_path, jsonl_path)
+    json_path.rename(json_path.with_name(json_path.name + '.migrated'))
+    return len(data)
+
+
+def migrate_log_dir(log_dir=None, events=HOOK_EVENT_LOGS):
+    """
+    Migrate the hook event logs of a log directory from JSON arrays.
+
+    Args:
+        log_dir (Path): Log directory (default LOG_DIR)
+        events (iterable): Event log names to migrate (default HOOK_EVENT_LOGS)
+
+    Returns:
+        dict: Mapping of file name to number of migrated records
+    """
+    log_dir = Path(log_dir if log_dir is not None else LOG_DIR)
+    results = {}
+    for event in sorted(events):
+        json_path = log_dir / f"{event}.json"
+        if not json_path.is_file():
+            continue
+        count = migrate_array_log(json_path)
+        if count is not None:
+            results[json_path.name] = count
+    return results
+
+
+def main():
+    """Command line interface for migrating and inspecting logs."""
+    parser = argparse.ArgumentParser(description='Hook JSONL event log tools')
+    parser.add_argument('--migrate', nargs='?', const=str(LOG_DIR), metavar='LOG_DIR',
+                        help='Convert legacy JSON array logs to JSONL')
+    parser.add_argument('--cat', metavar='EVENT', help='Print records of an event log')
+    parser.add_argument('--log-dir', default=str(LOG_DIR), help='Log directory for --cat')
+    args = parser.parse_args()
+
+    if args.migrate:
+        results = migrate_log_dir(args.migrate)
+        if not results:
+            print(f"No JSON array logs found in {args.migrate}")
+        for name, count in results.items():
+            print(f"{name}: migrated {count} records")
+    elif args.cat:
+        for record in iter_events(args.cat, args.log_dir):
+            sys.stdout.write(json.dumps(record) + '\n')
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Resident hook daemon for the per-tool-call hooks.
+
+PreToolUse and PostToolUse run on every tool call. Starting a fresh
+`uv run --script` interpreter each time costs far more than the hook logic
+itself, so this daemon keeps pre_tool_use.py and post_tool_use.py imported
+in one warm process and serves them over a Unix socket. The hook command is
+hooks/hook_client.py, which forwards stdin and relays the exit code,
+stdout and stderr, and falls back to running the hook in-process when the daemon is
+not up.
+
+Usage:
+- ./hookd.py --serve      # Run the daemon in the foreground
+- ./hookd.py --start      # Start the daemon detached (no-op if running)
+- ./hookd.py --stop       # Ask a running daemon to exit
+- ./hookd.py --status     # Report whether the daemon is running
+
+Environment variables:
+- CLAUDE_HOOKD_SOCKET: Socket path (default ~/.claude/run/hookd.sock)
+- CLAUDE_HOOKD_IDLE: Seconds of inactivity before the daemon exits (default 1800)
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.hookmetrics import HookTimer
+from utils.sockserve import is_running, request, serve, socket_path, spawn_detached
+
+# Hooks that expose run_hook(input_data, log_dir) and can be served warm
+DAEMON_HOOKS = ('pre_tool_use', 'post_tool_use')
+
+DEFAULT_IDLE_TIMEOUT = 1800
+
+
+def get_socket_path():
+    """Return the daemon socket path."""
+    return socket_path('hookd', 'CLAUDE_HOOKD_SOCKET')
+
+
+class HookRegistry:
+    """Imported hook modules, reloaded when their source file changes."""
+
+    def __init__(self):
+        self._modules = {}
+        self._mtimes = {}
+
+    def get(self, name):
+        """Return the hook module, importing or reloading it as needed."""
+        if name not in DAEMON_HOOKS:
+            raise ValueError(f"Unsupported hook: {name}")
+        source = HOOKS_DIR / f"{name}.py"
+        mtime = source.stat().st_mtime
+        module = self._modules.get(name)
+        if module is None:
+            module = importlib.import_module(name)
+        elif self._mtimes.get(name) != mtime:
+            module = importlib.reload(module)
+        self._modules[name] = module
+        self._mtimes[name] = mtime
+        return module
+
+
+def run_in_process(hook, payload, cwd, registry=None, via='daemon', client_started=None):
+    """
+    Run a hook's logic in the current interpreter.
+
+    Mirrors the hook's own main(): invalid JSON and unexpected errors exit 0
+    so a broken payload never blocks Claude.
+
+    Args:
+        hook (str): Hook name, e.g. "pre_tool_use"
+        payload (str): Raw stdin JSON text
+        cwd (str): Working directory of the hook invocation
+        via (str): "daemon", or "fallback" when hook_client.py runs it itself
+        client_started (float): Epoch time at which the hook_client.py process started
+
+    Returns:
+        tuple: (exit_code, stdout_text, stderr_text)
+    """
+    registry = registry or HookRegistry()
+    module = registry.get(hook)
+    log_dir = Path(cwd) / '.claude' / 'logs'
+    timer = HookTimer(hook, log_dir, via=via, client_started=client_started)
+    try:
+        with timer.phase('stdin_parse'):
+            input_data = json.loads(payload)
+    except (json.JSONDecodeError, ValueError):
+        return 0, '', ''
+    timer.session_id = input_data.get('session_id')
+    try:
+        return module.run_hook(input_data, log_dir, timer)
+    except Exception:
+        return 0, '', ''
+    finally:
+        timer.finish()
+
+
+def make_handler(registry):
+    """Build the socket request handler around a module registry."""
+    def handle(message):
+        exit_code, stdout, stderr = run_in_process(
+            message.get('hook', ''),
+            message.get('payload', ''),
+            message.get('cwd') or os.getcwd(),
+            registry,
+            client_started=message.get('started'),
+        )
+        return {'exit_code': exit_code, 'stdout': stdout, 'stderr': stderr}
+    return handle
+
+
+def start_detached():
+    """Start the daemon in the background unless it is already running."""
+    if is_running(get_socket_path()):
+        return False
+    spawn_detached([sys.executable, str(Path(__file__).resolve()), '--serve'])
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident hook daemon')
+    parser.add_argument('--serve', action='store_true', help='Run the daemon in the foreground')
+    parser.add_argument('--start', action='store_true', help='Start the daemon detached')
+    parser.add_argument('--stop', action='store_true', help='Stop a running daemon')
+    parser.add_argument('--status', action='store_true', help='Report daemon status')
+    args = parser.parse_args()
+
+    path = get_socket_path()
+
+    if args.serve:
+        idle = float(os.getenv('CLAUDE_HOOKD_IDLE', DEFAULT_IDLE_TIMEOUT))
+        registry = HookRegistry()
+        # Import up front so the first request is already warm
+        for hook in DAEMON_HOOKS:
+            registry.get(hook)
+        try:
+            if not serve(path, make_handler(registry), idle_timeout=idle):
+                print(f"hookd already running on {path}")
+        except OSError as e:
+            # Lost a startup race with another instance
+            print(f"hookd could not bind {path}: {e}")
+    elif args.start:
+        print("Started hookd" if start_detached() else "hookd already running")
+    elif args.stop:
+        try:
+            request(path, {'command': 'shutdown'}, timeout=2)
+            print("Stopped hookd")
+        except (OSError, ValueError):
+            print("hookd is not running")
+    elif args.status:
+        try:
+            response = request(path, {'command': 'ping'}, timeout=2)
+            print(f"hookd running (pid {response.get('pid')}) on {path}")
+        except (OSError, ValueError):
+            print("hookd is not running")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
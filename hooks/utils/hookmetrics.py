@@ -0,0 +1,155 @@
+"""
+Per-invocation latency metrics for the hooks.
+
+Every hook run appends one compact record to .claude/logs/hook_metrics.jsonl:
+
+    {"ts": 1760000000.123, "hook": "stop", "session": "abc", "via": "script",
+     "ms": 4.21, "startup_ms": 61.0, "phases": {"stdin_parse": 0.05, ...}}
+
+- ms: wall time from the timer's start to finish (the hook's own work)
+- startup_ms: age of the process when the timer started, i.e. interpreter
+  startup plus imports (Linux only; omitted elsewhere and for hooks served
+  by the daemon). Under `uv run` the environment resolution by uv itself
+  happens before the process exists and is not included
+- client_ms: for hooks served by utils/hookd.py, the time from the
+  hook_client.py process starting (interpreter startup, connect, send) to
+  the daemon starting the hook
+- phases: milliseconds per named phase (stdin_parse, policy_check,
+  log_write, transcript_export, tts_dispatch, subprocess, ...). Phases may
+  nest, and a phase entered several times accumulates
+
+Script hooks call start() first thing in main(). The record is written
+at interpreter exit, so every sys.exit() path is covered. Code further
+down wraps its work in `with phase('name'):`. In-process callers (the
+hook daemon) create a HookTimer, pass it along explicitly and call
+finish().
+
+Set CLAUDE_HOOK_METRICS=0 to disable. See utils/report.py for the
+aggregated percentiles.
+"""
+
+import atexit
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from utils.eventlog import LOG_DIR, append_record, get_rotate_bytes
+
+METRICS_FILE = 'hook_metrics.jsonl'
+
+_current = None
+
+
+def metrics_enabled():
+    return os.getenv('CLAUDE_HOOK_METRICS', '1') != '0'
+
+
+def process_age_ms():
+    """Milliseconds since this process started (10 ms resolution), or None."""
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            # Fields after the parenthesized command name; starttime is field 22
+            fields = f.read().rsplit(b')', 1)[1].split()
+        start = int(fields[19]) / os.sysconf('SC_CLK_TCK')
+        return round((time.clock_gettime(time.CLOCK_BOOTTIME) - start) * 1000, 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class HookTimer:
+    """Phase stopwatch for one hook invocation."""
+
+    def __init__(self, hook, log_dir=None, via='script', client_started=None):
+        self.hook = hook
+        self.log_dir = log_dir
+        self.via = via
+        self.session_id = None
+        self.started = time.time()
+        self.client_started = client_started
+        self.phases = {}
+        self._t0 = time.perf_counter()
+        self._finished = False
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block, adding to the named phase."""
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - t) * 1000
+
+    def record(self):
+        """Return the metrics record for this invocation so far."""
+        record = {
+            'ts': round(self.started, 3),
+            'hook': self.hook,
+            'session': self.session_id,
+            'via': self.via,
+            'ms': round((time.perf_counter() - self._t0) * 1000, 2),
+            'phases': {name: round(ms, 2) for name, ms in self.phases.items()},
+        }
+        if self.via != 'daemon':  # The daemon's own age says nothing about this call
+            startup = process_age_ms()
+            if startup is not None:
+                record['startup_ms'] = max(0.0, round(startup - record['ms'], 1))
+        if self.client_started:
+            record['client_ms'] = round(max(0.0, self.started - self.client_started) * 1000, 2)
+        return record
+
+    def finish(self):
+        """
+        Append the record to the metrics file (once); failures are ignored.
+
+        Returns:
+            dict: The record, or None if already finished or disabled
+        """
+        if self._finished or not metrics_enabled():
+            return None
+        self._finished = True
+        record = self.record()
+        try:
+            append_record(Path(self.log_dir if self.log_dir is not None else LOG_DIR) / METRICS_FILE,
+                          record, max_bytes=get_rotate_bytes())
+        except OSError:
+            pass
+        return record
+
+
+class _NullTimer:
+    """Stands in for a HookTimer when the caller did not pass one."""
+
+    session_id = None
+
+    def phase(self, name):
+        return nullcontext()
+
+    def finish(self):
+        return None
+
+
+NULL_TIMER = _NullTimer()
+
+
+def start(hook, log_dir=None):
+    """
+    Start timing this process's hook run; the record is written at exit.
+
+    Returns:
+        HookTimer: The process-wide timer (also used by phase())
+    """
+    global _current
+    _current = HookTimer(hook, log_dir)
+    atexit.register(_current.finish)
+    return _current
+
+
+def current():
+    """Return the process-wide timer, or a no-op stand-in."""
+    return _current or NULL_TIMER
+
+
+def phase(name):
+    """Time a block against the process-wide timer (no-op without one)."""
+    return current().phase(name)
@@ -12,47 +12,77 @@ import sys
 from dotenv import load_dotenv
 
 
-def prompt_llm(prompt_text):
+MODEL = "claude-3-5-haiku-20241022"  # Fastest Anthropic model
+CLIENT_TIMEOUT = 60  # Seconds per API request (the SDK default is 10 minutes)
+
+_client = None
+
+
+def get_client():
+    """
+    Return the process-wide Anthropic client, creating it on first use.
+
+    Returns:
+        anthropic.Anthropic: The client, or None without an API key
+    """
+    global _client
+    if _client is None:
+        load_dotenv()
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            return None
+        import anthropic
+        _client = anthropic.Anthropic(api_key=api_key, timeout=CLIENT_TIMEOUT)
+    return _client
+
+
+def prompt_llm(prompt_text, use_cache=True, max_tokens=100, temperature=0.7):
     """
     Base Anthropic LLM prompting method using fastest model.
 
+    Responses are cached by prompt text (see response_cache.py), so
+    repeating a prompt within the cache TTL makes no API call.
+
     Args:
         prompt_text (str): The prompt to send to the model
+        use_cache (bool): Look up and store the response in the cache
 
     Returns:
         str: The model's response text, or None if error
     """
-    load_dotenv()
-
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        return None
+    cache = key = None
+    if use_cache:
+        from response_cache import ResponseCache, cache_key
+        cache = ResponseCache()
+        key = cache_key(MODEL, prompt_text, max_tokens, temperature)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
 
     try:
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=api_key)
+        client = get_client()
+        if client is None:
+            return None
 
         message = client.messages.create(
-            model="claude-3-5-haiku-20241022",  # Fastest Anthropic model
-            max_tokens=100,
-            temperature=0.7,
+            model=MODEL,
+            max_tokens=max_tokens,
+            temperature=temperature,
             messages=[{"role": "user", "content": prompt_text}],
         )
 
-        return message.content[0].text.strip()
+        response = message.content[0].text.strip()
 
     except Exception:
         return None
 
+    if cache is not None:
+        cache.put(key, response)
+    return response
 
-def generate_completion_message():
-    """
-    Generate a completion message using Anthropic LLM.
 
-    Returns:
-        str: A natural language completion message, or None if error
-    """
+def _completion_style():
+    """Return (name_instruction, examples) for completion message prompts."""
     engineer_name = os.getenv("ENGINEER_NAME", "").strip()
 
     if engineer_name:
@@ -64,6 +94,18 @@ def generate_completion_message():
         name_instruction = ""
         examples = """Examples of the style: "Work complete!", "All done!", "Task finished!", "Ready for your next move!" """
 
+    return name_instruction, examples
+
+
+def generate_completion_message():
+    """
+    Generate a completion message using Anthropic LLM.
+
+    Returns:
+        str: A natural language completion message, or None if error
+    """
+    name_instruction, examples = _completion_style()
+
     prompt = f"""Generate a short, friendly completion message for when an AI coding assistant finishes a task.
 
 Requirements:
@@ -79,7 +121,8 @@ Requirements:
 
 Generate ONE completion message:"""
 
-    response = prompt_llm(prompt)
+    # Not cached: the same prompt is meant to give a different message each time
+    response = prompt_llm(prompt, use_cache=False)
 
     # Clean up response - remove quotes and extra formatting
     if response:
@@ -90,6 +133,68 @@ Generate ONE completion message:"""
     return response
 
 
+def generate_completion_messages(count):
+    """
+    Generate several distinct completion messages in one request.
+
+    Returns:
+        list: Up to count messages (empty on error or without an API key)
+    """
+    name_instruction, examples = _completion_style()
+
+    prompt = f"""Generate {count} different short, friendly completion messages for when an AI coding assistant finishes a task.
+
+Requirements:
+- Keep each under 10 words
+- Make them positive and future focused
+- Use natural, conversational language
+- Focus on completion/readiness
+- Vary the wording; no two messages alike
+- Do NOT include quotes, numbering, formatting, or explanations
+- Return ONLY the messages, one per line
+{name_instruction}
+
+{examples}
+
+Generate {count} completion messages:"""
+
+    response = prompt_llm(prompt, use_cache=False, max_tokens=20 * count + 50, temperature=1.0)
+    if not response:
+        return []
+
+    messages = []
+    for line in response.splitlines():
+        # Drop list markers and quotes
+        message = line.strip().lstrip("-*0123456789.) ").strip().strip('"').strip("'").strip()
+        if message and len(message.split()) <= 12:
+            messages.append(message)
+    return list(dict.fromkeys(messages))[:count]
+
+
+AGENT_NAME_EXAMPLES = [
+    "Phoenix", "Sage", "Nova", "Echo", "Atlas", "Cipher", "Nexus",
+    "Oracle", "Quantum", "Zenith", "Aurora", "Vortex", "Nebula",
+    "Catalyst", "Prism", "Axiom", "Helix", "Flux", "Synth", "Vertex"
+]
+
+
+def clean_agent_name(text):
+    """
+    Reduce model output to a capitalized single-word name.
+
+    Returns:
+        str: The name, or None if it is not 3-20 letters/digits
+    """
+    # Ensure it's a single word
+    name = text.strip().split()[0] if text and text.strip() else ""
+    # Remove any punctuation
+    name = ''.join(c for c in name if c.isalnum())
+    # Capitalize first letter
+    name = name.capitalize()
+    # Validate it's not empty and reasonable length
+    return name if 3 <= len(name) <= 20 else None
+
+
 def generate_agent_name():
     """
     Generate a one-word agent name using Anthropic.
@@ -100,11 +205,7 @@ def generate_agent_name():
     import random
 
     # Example names to guide generation
-    example_names = [
-        "Phoenix", "Sage", "Nova", "Echo", "Atlas", "Cipher", "Nexus",
-        "Oracle", "Quantum", "Zenith", "Aurora", "Vortex", "Nebula",
-        "Catalyst", "Prism", "Axiom", "Helix", "Flux", "Synth", "Vertex"
-    ]
+    example_names = AGENT_NAME_EXAMPLES
 
     # If no API key, return random fallback
     if not os.getenv("ANTHROPIC_API_KEY"):
@@ -128,32 +229,20 @@ Name:"""
 
     try:
         # Use faster Haiku model with lower tokens for name generation
-        load_dotenv()
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
+        client = get_client()
+        if client is None:
             raise Exception("No API key")
 
-        import anthropic
-        client = anthropic.Anthropic(api_key=api_key)
-
         message = client.messages.create(
-            model="claude-3-5-haiku-20241022",  # Fast model
+            model=MODEL,  # Fast model
             max_tokens=20,
             temperature=0.7,
             messages=[{"role": "user", "content": prompt_text}],
         )
 
         # Extract and clean the name
-        name = message.content[0].text.strip()
-        # Ensure it's a single word
-        name = name.split()[0] if name else "Agent"
-        # Remove any punctuation
-        name = ''.join(c for c in name if c.isalnum())
-        # Capitalize first letter
-        name = name.capitalize() if name else "Agent"
-
-        # Validate it's not empty and reasonable length
-        if name and 3 <= len(name) <= 20:
+        name = clean_agent_name(message.content[0].text)
+        if name:
             return name
         else:
             raise Exception("Invalid name generated")
@@ -163,10 +252,58 @@ Name:"""
         return random.choice(example_names)
 
 
+def generate_agent_names(count, exclude=()):
+    """
+    Generate several distinct agent names in one request.
+
+    Args:
+        count (int): Number of names wanted
+        exclude (iterable): Names already in use, to steer away from
+
+    Returns:
+        list: Up to count validated, distinct names (empty on error or
+        without an API key; callers keep their own fallback)
+    """
+    taken = {name.lower() for name in exclude}
+    avoid = ", ".join(sorted(exclude)[:50])
+    prompt_text = f"""Generate exactly {count} unique agent/assistant names.
+
+Requirements:
+- Single word each (no spaces, hyphens, or punctuation)
+- Abstract and memorable
+- Professional sounding
+- Easy to pronounce
+- Similar style to these examples: {", ".join(AGENT_NAME_EXAMPLES[:10])}
+{f"- None of these names, already taken: {avoid}" if avoid else ""}
+
+Respond with ONLY the names, one per line, nothing else."""
+
+    try:
+        client = get_client()
+        if client is None:
+            return []
+
+        message = client.messages.create(
+            model=MODEL,  # Fast model
+            max_tokens=12 * count + 20,
+            temperature=1.0,
+            messages=[{"role": "user", "content": prompt_text}],
+        )
+    except Exception:
+        return []
+
+    names = []
+    for line in message.content[0].text.splitlines():
+        # Drop list markers like "1." or "-"
+        name = clean_agent_name(line.strip().lstrip("-*0123456789.) "))
+        if name and name.lower() not in taken:
+            taken.add(name.lower())
+            names.append(name)
+    return names[:count]
+
+
 def main():
     """Command line interface for testing."""
-    import json
-
     if len(sys.argv) > 1:
         if sys.argv[1] == "--completion":
             message = generate_completion_message()
@@ -178,6 +315,17 @@ def main():
             # Generate agent name (no input needed)
             name = generate_agent_name()
             print(name)
+        elif sys.argv[1] == "--completions":
+            # Generate a batch of completion messages, one per line
+            count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+            for message in generate_completion_messages(count):
+                print(message)
+        elif sys.argv[1] == "--agent-names":
+            # Generate a batch of names, one per line; names to avoid are read from stdin
+            count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+            exclude = [] if sys.stdin.isatty() else sys.stdin.read().split()
+            for name in generate_agent_names(count, exclude):
+                print(name)
         else:
             prompt_text = " ".join(sys.argv[1:])
             response = prompt_llm(prompt_text)
@@ -185,8 +333,10 @@ def main():
                 print(response)
             else:
                 print("Error calling Anthropic API")
+                sys.exit(1)
     else:
-        print("Usage: ./anth.py 'your prompt here' or ./anth.py --completion or ./anth.py --agent-name")
+        print("Usage: ./anth.py 'your prompt here' or ./anth.py --completion or ./anth.py --agent-name "
+              "or ./anth.py --agent-names N or ./anth.py --completions N")
 
 
 if __name__ == "__main__":
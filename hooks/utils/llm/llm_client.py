@@ -0,0 +1,186 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Client for the resident LLM helper (llm_helper.py), with subprocess fallback.
+
+Needs only the standard library, so hooks can import it without the
+anthropic SDK. Each call goes to the helper over its Unix socket when it
+is running. Otherwise the call runs `uv run anth.py` as before, and the
+helper is started in the background (at most once per HELPER_RESPAWN
+seconds) for the next call. A call that reached the helper but failed or
+missed its deadline is not retried through anth.py, because the time
+budget is already spent.
+
+Every call returns None (or an empty list) on failure, so callers keep
+their own fallback.
+
+Usage:
+- ./llm_client.py "your prompt here"
+- ./llm_client.py --agent-names 5
+- ./llm_client.py --completions 5
+
+Environment variables:
+- CLAUDE_LLM_HELPER: Set to 0 to always run anth.py
+- CLAUDE_LLM_HELPER_SOCKET: Socket path (default ~/.claude/run/llm_helper.sock)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+LLM_DIR = Path(__file__).resolve().parent
+HOOKS_DIR = LLM_DIR.parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.sockserve import request, socket_path, spawn_detached
+
+ANTH_SCRIPT = LLM_DIR / 'anth.py'
+HELPER_SCRIPT = LLM_DIR / 'llm_helper.py'
+HELPER_RESPAWN = 60     # Seconds between attempts to start the helper
+DEFAULT_DEADLINE = 10
+BATCH_DEADLINE = 30
+
+
+def helper_socket_path():
+    """Return the LLM helper socket path."""
+    return socket_path('llm_helper', 'CLAUDE_LLM_HELPER_SOCKET')
+
+
+def helper_enabled():
+    return os.getenv('CLAUDE_LLM_HELPER', '1') != '0'
+
+
+def start_helper():
+    """Start the helper detached unless a start was attempted within HELPER_RESPAWN."""
+    path = helper_socket_path()
+    marker = path.with_name(path.name + '.spawn')
+    try:
+        if time.time() - marker.stat().st_mtime < HELPER_RESPAWN:
+            return
+    except FileNotFoundError:
+        pass
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+        spawn_detached(['uv', 'run', str(HELPER_SCRIPT), '--serve'])
+    except Exception:
+        pass
+
+
+def ask_helper(message, deadline):
+    """
+    Send one request to the helper.
+
+    Returns:
+        dict: The helper's response, or None if it is not running (it is
+        started for next time and the caller falls back to anth.py)
+    """
+    try:
+        return request(helper_socket_path(), dict(message, deadline=deadline),
+                       timeout=deadline + 1)
+    except (FileNotFoundError, ConnectionRefusedError):
+        start_helper()
+        return None
+    except (OSError, ValueError) as e:
+        return {'error': str(e)}
+
+
+def run_anth(args, deadline, stdin=None):
+    """
+    Run anth.py in a subprocess.
+
+    Returns:
+        str: Its output, or None on error or timeout
+    """
+    try:
+        result = subprocess.run(['uv', 'run', str(ANTH_SCRIPT)] + [str(a) for a in args],
+                                input=stdin or '', capture_output=True, text=True,
+                                timeout=deadline)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _call(message, deadline, fallback_args, stdin=None):
+    if helper_enabled():
+        response = ask_helper(message, deadline)
+        if response is not None:
+            return response.get('result') if response.get('ok') else None
+    return run_anth(fallback_args, deadline, stdin)
+
+
+def prompt(text, deadline=DEFAULT_DEADLINE, max_tokens=100, temperature=0.7, use_cache=True):
+    """
+    Prompt the model.
+
+    The anth.py fallback uses its own defaults for max_tokens and
+    temperature.
+
+    Returns:
+        str: The response text, or None on error or missed deadline
+    """
+    message = {'task': 'prompt', 'prompt': text, 'max_tokens': max_tokens,
+               'temperature': temperature, 'cache': use_cache}
+    result = _call(message, deadline, [text])
+    return result.strip() if result else None
+
+
+def agent_names(count, exclude=(), deadline=BATCH_DEADLINE):
+    """
+    Generate a batch of agent names (see anth.generate_agent_names).
+
+    Returns:
+        list: Names (empty on failure)
+    """
+    exclude = list(exclude)
+    result = _call({'task': 'agent_names', 'count': count, 'exclude': exclude}, deadline,
+                   ['--agent-names', count], stdin='\n'.join(exclude))
+    return result.split() if isinstance(result, str) else list(result or [])
+
+
+def completion_messages(count, deadline=BATCH_DEADLINE):
+    """
+    Generate a batch of completion messages (see anth.generate_completion_messages).
+
+    Returns:
+        list: Messages (empty on failure)
+    """
+    result = _call({'task': 'completions', 'count': count}, deadline, ['--completions', count])
+    if isinstance(result, str):
+        return [line.strip() for line in result.splitlines() if line.strip()]
+    return list(result or [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LLM helper client')
+    parser.add_argument('prompt', nargs='*', help='Prompt text')
+    parser.add_argument('--agent-names', type=int, metavar='N', help='Generate N agent names')
+    parser.add_argument('--completions', type=int, metavar='N',
+                        help='Generate N completion messages')
+    parser.add_argument('--deadline', type=float, help='Seconds to wait')
+    args = parser.parse_args()
+
+    if args.agent_names:
+        print('\n'.join(agent_names(args.agent_names, deadline=args.deadline or BATCH_DEADLINE)))
+    elif args.completions:
+        print('\n'.join(completion_messages(args.completions,
+                                            deadline=args.deadline or BATCH_DEADLINE)))
+    elif args.prompt:
+        response = prompt(' '.join(args.prompt), deadline=args.deadline or DEFAULT_DEADLINE)
+        if response is None:
+            print("Error calling Anthropic API")
+            sys.exit(1)
+        print(response)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
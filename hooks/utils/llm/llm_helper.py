@@ -0,0 +1,225 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# dependencies = [
+#     "anthropic",
+#     "python-dotenv",
+# ]
+# ///
+
+"""
+Resident LLM helper.
+
+Every `uv run anth.py` is a fresh process. It resolves the uv environment,
+imports the anthropic SDK, reads .env and opens a new TLS connection
+before it sends the request. This helper does that once and serves
+requests over a Unix socket. It keeps:
+- one Anthropic client (anth.get_client()). Its HTTP connection pool keeps
+  the TLS connection to the API alive between requests
+- the response cache, including its in-memory layer (see response_cache.py)
+
+Identical requests that arrive while one is already in flight are
+coalesced: they wait for the same API call instead of making their own.
+Each request carries a deadline in seconds (capped at MAX_DEADLINE). A
+caller whose deadline passes gets an error straight away. The API call
+itself keeps running, and its result is still cached for the next caller.
+
+Requests are {"task": "prompt", "prompt": ..., "max_tokens": ...,
+"temperature": ..., "cache": bool} or {"task": "agent_names", "count": N,
+"exclude": [...]} or {"task": "completions", "count": N}, each with a
+"deadline". Responses are {"ok": true, "result": ...} or {"error": ...}.
+Hooks use llm_client.py, which falls back to running anth.py when the
+helper is not running.
+
+The SDK honours ANTHROPIC_BASE_URL, so the helper can be tested against
+the mock endpoint in bench/mock_messages.py.
+
+Usage:
+- ./llm_helper.py --serve               # Run the helper in the foreground
+- ./llm_helper.py --prompt "Text" [--deadline 5]
+- ./llm_helper.py --stop | --status
+
+Environment variables:
+- CLAUDE_LLM_HELPER_SOCKET: Socket path (default ~/.claude/run/llm_helper.sock)
+- CLAUDE_LLM_HELPER_IDLE: Seconds of inactivity before the helper exits (default 1800)
+- ANTHROPIC_API_KEY, ANTHROPIC_BASE_URL: As for anth.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+
+LLM_DIR = Path(__file__).resolve().parent
+HOOKS_DIR = LLM_DIR.parents[1]
+for path in (LLM_DIR, HOOKS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import anth
+from response_cache import ResponseCache, cache_key
+from utils.sockserve import request, serve, socket_path
+
+DEFAULT_IDLE_TIMEOUT = 1800
+DEFAULT_DEADLINE = 10
+MAX_DEADLINE = 60
+MAX_WORKERS = 8
+TASKS = ('prompt', 'agent_names', 'completions')
+
+
+def get_socket_path():
+    """Return the helper socket path."""
+    return socket_path('llm_helper', 'CLAUDE_LLM_HELPER_SOCKET')
+
+
+def request_key(message):
+    """Return the key identifying requests that can share one API call."""
+    fields = {k: v for k, v in message.items() if k not in ('deadline', 'command')}
+    return json.dumps(fields, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+class LLMHelper:
+    """Shared client, cache and in-flight requests for every connection."""
+
+    def __init__(self, cache=None, max_workers=MAX_WORKERS):
+        self.cache = cache if cache is not None else ResponseCache()
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix='llm')
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'api_calls': 0, 'coalesced': 0, 'cache_hits': 0,
+                      'deadline_exceeded': 0, 'errors': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def warm(self):
+        """Import the SDK and build the client ahead of the first request."""
+        try:
+            anth.get_client()
+        except Exception:
+            pass  # Reported on the first real request instead
+
+    def run(self, message):
+        """
+        Run one request against the API (in a pool thread).
+
+        Returns:
+            The task's result: text for "prompt", a list otherwise (None on error)
+        """
+        task = message.get('task', 'prompt')
+        if task == 'prompt':
+            prompt = message.get('prompt')
+            max_tokens = int(message.get('max_tokens', 100))
+            temperature = float(message.get('temperature', 0.7))
+            key = cache_key(anth.MODEL, prompt, max_tokens, temperature)
+            if message.get('cache', True):
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self._count('cache_hits')
+                    return cached
+            self._count('api_calls')
+            response = anth.prompt_llm(prompt, use_cache=False, max_tokens=max_tokens,
+                                       temperature=temperature)
+            if response is not None and message.get('cache', True):
+                self.cache.put(key, response)
+            return response
+        self._count('api_calls')
+        if task == 'agent_names':
+            return anth.generate_agent_names(int(message.get('count', 20)),
+                                             message.get('exclude') or ())
+        return anth.generate_completion_messages(int(message.get('count', 20)))
+
+    def submit(self, message):
+        """Return the future for a request, joining an identical one in flight."""
+        key = request_key(message)
+        with self._lock:
+            self.stats['requests'] += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                return future
+            future = self.executor.submit(self._run_and_release, key, message)
+            self._inflight[key] = future
+            return future
+
+    def _run_and_release(self, key, message):
+        try:
+            return self.run(message)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def handle(self, message):
+        """Serve one socket request within its deadline."""
+        if message.get('command') == 'stats':
+            with self._lock:
+                return dict(self.stats, pid=os.getpid(), in_flight=len(self._inflight))
+        if message.get('task', 'prompt') not in TASKS:
+            return {'error': f"unknown task: {message.get('task')}"}
+        if message.get('task', 'prompt') == 'prompt' and not message.get('prompt'):
+            return {'error': 'missing prompt'}
+
+        deadline = min(float(message.get('deadline') or DEFAULT_DEADLINE), MAX_DEADLINE)
+        try:
+            result = self.submit(message).result(timeout=deadline)
+        except FutureTimeout:
+            self._count('deadline_exceeded')
+            return {'error': f"deadline of {deadline:g}s exceeded"}
+        if result is None:
+            self._count('errors')
+            return {'error': 'no response from the API'}
+        return {'ok': True, 'result': result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident LLM helper')
+    parser.add_argument('--serve', action='store_true', help='Run the helper in the foreground')
+    parser.add_argument('--prompt', help='Send a prompt through a running helper')
+    parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE,
+                        help='Seconds to wait for --prompt')
+    parser.add_argument('--stop', action='store_true', help='Stop a running helper')
+    parser.add_argument('--status', action='store_true', help='Report helper status')
+    args = parser.parse_args()
+
+    path = get_socket_path()
+
+    if args.serve:
+        helper = LLMHelper()
+        threading.Thread(target=helper.warm, daemon=True).start()
+        idle = float(os.getenv('CLAUDE_LLM_HELPER_IDLE', DEFAULT_IDLE_TIMEOUT))
+        try:
+            serve(path, helper.handle, idle_timeout=idle)
+        finally:
+            helper.executor.shutdown(wait=False)
+    elif args.prompt:
+        try:
+            response = request(path, {'task': 'prompt', 'prompt': args.prompt,
+                                      'deadline': args.deadline}, timeout=args.deadline + 1)
+        except (OSError, ValueError) as e:
+            print(f"llm_helper is not running: {e}")
+            sys.exit(1)
+        print(response.get('result') if response.get('ok') else response)
+        sys.exit(0 if response.get('ok') else 1)
+    elif args.stop:
+        try:
+            request(path, {'command': 'shutdown'}, timeout=2)
+            print("Stopped llm_helper")
+        except (OSError, ValueError):
+            print("llm_helper is not running")
+    elif args.status:
+        try:
+            stats = request(path, {'command': 'stats'}, timeout=2)
+            print(f"llm_helper running on {path}: {stats}")
+        except (OSError, ValueError):
+            print("llm_helper is not running")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
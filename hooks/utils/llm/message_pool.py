@@ -0,0 +1,198 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Pool of pre-generated LLM messages.
+
+Hooks that want a fresh LLM-written line (e.g. stop.py --llm-message for
+its completion announcement) pop one from a pool file instead of calling
+the API. A refill generates a whole batch in one request, through the LLM
+helper or anth.py (see llm_client.py), and appends it here. When a kind
+runs below LOW_WATER, take() starts a refill in the background. That is
+roughly one API round-trip per BATCH_SIZE events instead of one per event.
+
+The pool is one JSON file ({kind: [messages]}) that is rewritten under a
+lock. take() returns None when the pool is empty, and callers fall back
+to their fixed phrases.
+
+Usage:
+- ./message_pool.py --status
+- ./message_pool.py --take completion
+- ./message_pool.py --refill completion  # Generate a batch now (blocking)
+
+Environment variables:
+- CLAUDE_LLM_POOL_FILE: Pool file (default ~/.claude/cache/llm/message_pool.json)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+LLM_DIR = Path(__file__).resolve().parent
+HOOKS_DIR = LLM_DIR.parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.eventlog import file_lock
+
+DEFAULT_POOL_FILE = Path('~/.claude/cache/llm/message_pool.json')
+KINDS = ('completion',)
+LOW_WATER = 10
+BATCH_SIZE = 100
+REFILL_RETRY = 60       # Seconds between refill attempts
+REFILL_TIMEOUT = 60
+FAILED_BACKOFF = 3600   # Seconds to wait after a refill produced nothing (e.g. no API key)
+
+
+def pool_path():
+    return Path(os.getenv('CLAUDE_LLM_POOL_FILE') or DEFAULT_POOL_FILE).expanduser()
+
+
+class MessagePool:
+    """Lists of pre-generated messages per kind, shared across processes."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else pool_path()
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data):
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+    def size(self, kind):
+        return len(self._load().get(kind, []))
+
+    def pop(self, kind):
+        """
+        Remove and return the oldest message of a kind.
+
+        Returns:
+            tuple: (message or None, messages left)
+        """
+        if not self.path.exists():
+            return None, 0
+        with file_lock(self.lock_path):
+            data = self._load()
+            items = data.get(kind, [])
+            if not items:
+                return None, 0
+            message = items.pop(0)
+            self._save(data)
+            return message, len(items)
+
+    def add(self, kind, messages):
+        """
+        Append messages to a kind, skipping ones already pooled.
+
+        Returns:
+            int: Number of messages added
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.lock_path):
+            data = self._load()
+            items = data.setdefault(kind, [])
+            seen = set(items)
+            added = [m for m in dict.fromkeys(messages) if m not in seen]
+            items.extend(added)
+            self._save(data)
+            return len(added)
+
+    def refill_marker(self, kind):
+        return self.path.with_name(f"{self.path.name}.{kind}.refill")
+
+    def start_refill(self, kind):
+        """Run a refill detached unless one was attempted recently."""
+        marker = self.refill_marker(kind)
+        try:
+            # A failed refill pushes the mtime into the future (see record_refill)
+            if time.time() - marker.stat().st_mtime < REFILL_RETRY:
+                return
+        except FileNotFoundError:
+            pass
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+            from utils.sockserve import spawn_detached
+            spawn_detached([sys.executable, str(Path(__file__).resolve()), '--refill', kind])
+        except Exception:
+            pass
+
+    def record_refill(self, kind, added):
+        """Back off for FAILED_BACKOFF after a refill that added nothing."""
+        if not added:
+            until = time.time() + FAILED_BACKOFF - REFILL_RETRY
+            try:
+                os.utime(self.refill_marker(kind), (until, until))
+            except OSError:
+                pass
+
+
+def refill(kind, count=BATCH_SIZE, pool=None):
+    """
+    Generate one batch of messages into the pool.
+
+    Returns:
+        int: Messages added
+    """
+    from utils.llm.llm_client import completion_messages
+    generators = {'completion': completion_messages}
+    pool = pool or MessagePool()
+    added = pool.add(kind, generators[kind](count, deadline=REFILL_TIMEOUT))
+    pool.record_refill(kind, added)
+    return added
+
+
+def take(kind, refill=True, pool=None):
+    """
+    Take a pooled message, refilling in the background when the pool runs low.
+
+    Returns:
+        str: A message, or None if the pool is empty
+    """
+    pool = pool or MessagePool()
+    try:
+        message, left = pool.pop(kind)
+    except OSError:
+        return None
+    if refill and left < LOW_WATER:
+        pool.start_refill(kind)
+    return message
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-generated LLM message pool')
+    parser.add_argument('--status', action='store_true', help='Show messages per kind')
+    parser.add_argument('--take', choices=KINDS, help='Pop one message (no refill)')
+    parser.add_argument('--refill', choices=KINDS, help='Generate a batch now')
+    parser.add_argument('--count', type=int, default=BATCH_SIZE, help='Messages per batch')
+    args = parser.parse_args()
+
+    pool = MessagePool()
+    if args.refill:
+        print(f"Added {refill(args.refill, args.count, pool)} {args.refill} messages")
+    elif args.take:
+        print(take(args.take, refill=False, pool=pool) or '')
+    elif args.status:
+        for kind in KINDS:
+            print(f"{kind:<12} {pool.size(kind):>5} messages  ({pool.path})")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
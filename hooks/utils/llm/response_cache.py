@@ -0,0 +1,150 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+LRU cache of LLM responses keyed by prompt text.
+
+anth.py's prompt_llm() looks up (model, max_tokens, temperature, prompt)
+here before calling the API. Each anth.py call is a fresh process, so the
+cache lives on disk: one small JSON file per response, named by the hash
+of its key. A hit touches the file's mtime, and each store evicts the
+least-recently-used entries beyond the entry bound. A small in-memory
+layer in front serves repeats within one long-lived process.
+
+Usage:
+- ./response_cache.py stats
+- ./response_cache.py clear
+
+Environment variables:
+- CLAUDE_LLM_CACHE_DIR: Cache directory (default ~/.claude/cache/llm/responses)
+- CLAUDE_LLM_CACHE_MAX_ENTRIES: Entry bound (default 1000, 0 disables the cache)
+- CLAUDE_LLM_CACHE_TTL: Hours a response stays valid (default 24)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path('~/.claude/cache/llm/responses')
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL_HOURS = 24
+MEMORY_ENTRIES = 128
+
+
+def cache_key(model, prompt, max_tokens=None, temperature=None):
+    """Return the hex digest identifying one prompt and its sampling settings."""
+    raw = json.dumps([model, max_tokens, temperature, prompt], separators=(',', ':'),
+                     ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Entry-bounded LRU directory of LLM responses, with a memory layer."""
+
+    def __init__(self, root=None, max_entries=None, ttl=None):
+        self.root = Path(root or os.getenv('CLAUDE_LLM_CACHE_DIR') or DEFAULT_CACHE_DIR).expanduser()
+        if max_entries is None:
+            max_entries = int(os.getenv('CLAUDE_LLM_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        if ttl is None:
+            ttl = float(os.getenv('CLAUDE_LLM_CACHE_TTL', DEFAULT_TTL_HOURS)) * 3600
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def path_for(self, key):
+        return self.root / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached response and mark it recently used, or None."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is None:
+            path = self.path_for(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                return None
+        if self.ttl and now - entry.get('created', 0) > self.ttl:
+            self._memory.pop(key, None)
+            return None
+        self._remember(key, entry)
+        return entry.get('response')
+
+    def put(self, key, response):
+        """Store a response atomically, then evict to the entry bound."""
+        if not self.enabled or response is None:
+            return
+        entry = {'created': time.time(), 'response': response}
+        self._remember(key, entry)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self.path_for(key)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+            self.evict()
+        except OSError:
+            pass  # Caching is best-effort
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def entries(self):
+        """Return [(mtime, path)] for every cached response, oldest first."""
+        entries = []
+        try:
+            for entry in os.scandir(self.root):
+                if entry.is_file() and entry.name.endswith('.json'):
+                    entries.append((entry.stat().st_mtime, Path(entry.path)))
+        except OSError:
+            pass
+        return sorted(entries)
+
+    def evict(self):
+        """Delete least-recently-used responses beyond the entry bound."""
+        entries = self.entries()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LLM response cache')
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('stats', help='Show the number of cached responses')
+    sub.add_parser('clear', help='Delete every cached response')
+    args = parser.parse_args()
+
+    cache = ResponseCache()
+    if args.command == 'stats':
+        print(f"{cache.root}: {len(cache.entries())} responses of {cache.max_entries}")
+    elif args.command == 'clear':
+        for _, path in cache.entries():
+            path.unlink()
+        print(f"Cleared {cache.root}")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Indexed queries over the hook event logs.
+
+Keeps a SQLite index (.claude/logs/index.sqlite) of every event in the
+.claude/logs/<event>.jsonl logs, rotated segments included, so questions
+like "which Bash commands did session X run" are answered from the index
+instead of by scanning the logs.
+
+Indexed per event: log, session_id, hook_event_name, tool_name, logged_at
+(the time of the append, see eventlog.stamp_record), transcript_path and
+transcript_offset, plus a short detail (Bash command, file path, prompt,
+...) and where the full record lives (source file and byte offset).
+
+The index is brought up to date before every query. Each log's read
+position (inode and byte offset) is kept in the index, so only records
+appended since the last query are parsed, and segments rotated away in
+between are finished from where reading stopped. Hooks themselves never
+touch the index, which keeps logging O(1).
+
+Usage:
+- ./logquery.py --session abc123 --tool Bash               # Commands of one session
+- ./logquery.py --event PreToolUse --since 2h --format csv
+- ./logquery.py --tool Edit --grep src/parser --full --format json
+- ./logquery.py --count tool_name --since 7d               # Events per tool
+- ./logquery.py --update                                   # Only refresh the index
+- ./logquery.py --rebuild
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.eventlog import LOG_DIR, LOG_SUFFIX, MANIFEST_FILE, ROTATED_DIR
+from utils.hookmetrics import METRICS_FILE
+from utils.report import parse_since
+
+INDEX_FILE = 'index.sqlite'
+SCHEMA_VERSION = 1
+DETAIL_CHARS = 300
+BATCH = 5000
+ANALYZE_AFTER = 50000  # Refresh planner statistics after indexing this many events
+
+COLUMNS = ('id', 'log', 'session_id', 'hook_event_name', 'tool_name', 'logged_at',
+           'transcript_path', 'transcript_offset', 'detail', 'source', 'offset')
+COUNT_FIELDS = ('log', 'session_id', 'hook_event_name', 'tool_name')
+
+SCHEMA = f"""
+PRAGMA user_version = {SCHEMA_VERSION};
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    log TEXT NOT NULL,
+    session_id TEXT,
+    hook_event_name TEXT,
+    tool_name TEXT,
+    logged_at REAL,
+    transcript_path TEXT,
+    transcript_offset INTEGER,
+    detail TEXT,
+    source TEXT NOT NULL,
+    offset INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_session ON events (session_id, logged_at);
+CREATE INDEX IF NOT EXISTS events_tool ON events (tool_name, logged_at);
+CREATE INDEX IF NOT EXISTS events_event ON events (hook_event_name, logged_at);
+CREATE INDEX IF NOT EXISTS events_time ON events (logged_at, tool_name);
+CREATE TABLE IF NOT EXISTS positions (
+    log TEXT PRIMARY KEY,
+    inode INTEGER,
+    offset INTEGER NOT NULL,
+    segments TEXT NOT NULL
+);
+"""
+
+
+def open_index(log_dir, rebuild=False):
+    """Open (creating if needed) the index of a log directory."""
+    path = Path(log_dir) / INDEX_FILE
+    if rebuild:
+        for suffix in ('', '-wal', '-shm'):
+            Path(str(path) + suffix).unlink(missing_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript('DROP TABLE IF EXISTS events; DROP TABLE IF EXISTS positions;')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def event_detail(record):
+    """Return the one-line summary stored with an event."""
+    tool_input = record.get('tool_input')
+    if isinstance(tool_input, dict):
+        for key in ('command', 'file_path', 'notebook_path', 'path', 'pattern', 'url', 'query',
+                    'description', 'prompt'):
+            value = tool_input.get(key)
+            if isinstance(value, str):
+                return value[:DETAIL_CHARS]
+    for key in ('prompt', 'message', 'source', 'trigger'):
+        value = record.get(key)
+        if isinstance(value, str):
+            return value[:DETAIL_CHARS]
+    return None
+
+
+def _event_row(log, record, source, offset):
+    offset_value = record.get('transcript_offset')
+    return (log, record.get('session_id'), record.get('hook_event_name') or log,
+            record.get('tool_name'), record.get('logged_at'), record.get('transcript_path'),
+            offset_value if isinstance(offset_value, int) else None, event_detail(record),
+            source, offset)
+
+
+def _open_source(path):
+    if str(path).endswith('.gz'):
+        import gzip
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _insert(conn, rows):
+    conn.executemany(f"INSERT INTO events ({', '.join(COLUMNS[1:])}) "
+                     f"VALUES ({', '.join('?' * (len(COLUMNS) - 1))})", rows)
+
+
+def _ingest(conn, log, f, source, start, complete):
+    """
+    Index the records of an open file from byte `start`.
+
+    With complete=False (the live log) reading stops at the last full line.
+
+    Returns:
+        tuple: (offset just past the last indexed line, events added)
+    """
+    rows = []
+    added = 0
+    position = start
+    f.seek(start)  # Gzip files seek by decompressing
+    for line in f:
+        if not line.endswith(b'\n') and not complete:
+            break  # Still being written
+        line_start = position
+        position += len(line)
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # Torn line
+        if isinstance(record, dict):
+            rows.append(_event_row(log, record, source, line_start))
+        if len(rows) >= BATCH:
+            _insert(conn, rows)
+            added += len(rows)
+            rows = []
+    if rows:
+        _insert(conn, rows)
+        added += len(rows)
+    return position, added
+
+
+def _segment_file(rotated, name):
+    plain = rotated / name
+    return plain if plain.exists() else rotated / (name + '.gz')
+
+
+def update_index(conn, log_dir):
+    """
+    Index everything appended to the event logs since the last update.
+
+    Returns:
+        int: Number of new events
+    """
+    log_dir = Path(log_dir)
+    rotated = log_dir / ROTATED_DIR
+    try:
+        with open(rotated / MANIFEST_FILE, 'r') as f:
+            manifest_segments = json.load(f).get('segments', {})
+    except (OSError, ValueError):
+        manifest_segments = {}
+
+    names = {path.name for path in log_dir.glob(f"*{LOG_SUFFIX}")} | set(manifest_segments)
+    names.discard(METRICS_FILE)
+
+    added = 0
+    conn.execute('BEGIN IMMEDIATE')  # One updater at a time
+    try:
+        for name in sorted(names):
+            log = name[:-len(LOG_SUFFIX)]
+            row = conn.execute('SELECT inode, offset, segments FROM positions WHERE log = ?',
+                               (log,)).fetchone()
+            inode, offset, done = (row[0], row[1], set(json.loads(row[2]))) if row else (None, 0, set())
+
+            # Segments rotated since the last update; the one that was the
+            # live log then continues at the saved offset
+            segments = manifest_segments.get(name, [])
+            for entry in segments:
+                if entry['file'] in done:
+                    continue
+                start = offset if inode is not None and entry.get('inode') == inode else 0
+                if start:
+                    inode, offset = None, 0
+                try:
+                    with _open_source(_segment_file(rotated, entry['file'])) as f:
+                        added += _ingest(conn, log, f, f"{ROTATED_DIR}/{entry['file']}", start,
+                                         complete=True)[1]
+                except FileNotFoundError:
+                    pass  # Pruned before it was indexed
+                done.add(entry['file'])
+
+            try:
+                with open(log_dir / name, 'rb') as f:
+                    # The inode of what we opened, in case it was rotated meanwhile
+                    stat = os.fstat(f.fileno())
+                    if stat.st_ino != inode or stat.st_size < offset:
+                        offset = 0
+                    inode = stat.st_ino
+                    if stat.st_size > offset:
+                        offset, count = _ingest(conn, log, f, name, offset, complete=False)
+                        added += count
+            except FileNotFoundError:
+                pass
+
+            done &= {entry['file'] for entry in segments}
+            conn.execute('INSERT OR REPLACE INTO positions (log, inode, offset, segments) '
+                         'VALUES (?, ?, ?, ?)', (log, inode, offset, json.dumps(sorted(done))))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    if added > ANALYZE_AFTER:
+        conn.execute('ANALYZE')  # Let the planner pick the most selective index
+    return added
+
+
+def build_query(session=None, event=None, tool=None, since=None, until=None, grep=None,
+                log=None):
+    """
+    Return (where_sql, params) for the given filters.
+    """
+    clauses, params = [], []
+    for column, value in (('session_id', session), ('hook_event_name', event),
+                          ('tool_name', tool), ('log', log)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since:
+        clauses.append('logged_at >= ?')
+        params.append(since)
+    if until:
+        clauses.append('logged_at < ?')
+        params.append(until)
+    if grep:
+        clauses.append("detail LIKE ? ESCAPE '\\'")
+        params.append('%' + grep.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def query_events(conn, where, params, limit=None, newest_first=False):
+    """Yield matching events as dicts, oldest first unless newest_first."""
+    sql = (f"SELECT {', '.join(COLUMNS)} FROM events{where} "
+           f"ORDER BY logged_at {'DESC' if newest_first else 'ASC'}, id "
+           f"{'DESC' if newest_first else 'ASC'}")
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    for row in conn.execute(sql, params):
+        yield dict(zip(COLUMNS, row))
+
+
+def count_events(conn, field, where, params):
+    """Return [(value, count)] grouped by one indexed field, largest first."""
+    if field not in COUNT_FIELDS:
+        raise ValueError(f"Cannot count by {field}")
+    return conn.execute(f"SELECT {field}, COUNT(*) AS n FROM events{where} "
+                        f"GROUP BY {field} ORDER BY n DESC", params).fetchall()
+
+
+def load_record(log_dir, event):
+    """Read the full logged record of an indexed event from its source file."""
+    path = Path(log_dir) / event['source']
+    if not path.exists() and not str(path).endswith('.gz'):
+        path = path.with_name(path.name + '.gz')  # Compressed since it was indexed
+    try:
+        with _open_source(path) as f:
+            f.seek(event['offset'])
+            return json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+
+def _format_time(ts):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts)) if ts else '-'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the hook event logs through an index')
+    parser.add_argument('--log-dir', default=str(LOG_DIR), help='Log directory')
+    parser.add_argument('--session', help='session_id')
+    parser.add_argument('--event', help='hook_event_name (e.g. PreToolUse)')
+    parser.add_argument('--log', help='Event log name (e.g. pre_tool_use)')
+    parser.add_argument('--tool', help='tool_name (e.g. Bash)')
+    parser.add_argument('--since', help='Events at or after this (30m, 12h, 7d or ISO date)')
+    parser.add_argument('--until', help='Events before this (30m, 12h, 7d or ISO date)')
+    parser.add_argument('--grep', help='Substring of the detail (command, path, prompt, ...)')
+    parser.add_argument('--limit', type=int, help='At most this many events')
+    parser.add_argument('--newest', action='store_true', help='Newest events first')
+    parser.add_argument('--count', choices=COUNT_FIELDS, help='Count events per value of a field')
+    parser.add_argument('--full', action='store_true', help='Include the full logged record')
+    parser.add_argument('--format', choices=('table', 'json', 'csv'), default='table',
+                        help='Output format (json: one object per line)')
+    parser.add_argument('--no-update', action='store_true', help='Query the index as it is')
+    parser.add_argument('--update', action='store_true', help='Update the index and exit')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the index from scratch')
+    args = parser.parse_args()
+
+    if not Path(args.log_dir).is_dir():
+        print(f"No log directory at {args.log_dir}", file=sys.stderr)
+        sys.exit(1)
+    conn = open_index(args.log_dir, rebuild=args.rebuild)
+    if not args.no_update:
+        start = time.perf_counter()
+        added = update_index(conn, args.log_dir)
+        if args.update or args.rebuild:
+            print(f"Indexed {added} new events in {(time.perf_counter() - start) * 1000:.0f}ms",
+                  file=sys.stderr)
+    if args.update or (args.rebuild and not any((args.session, args.event, args.log, args.tool,
+                                                 args.since, args.until, args.grep, args.count))):
+        return
+
+    where, params = build_query(session=args.session, event=args.event, tool=args.tool,
+                                log=args.log, grep=args.grep,
+                                since=parse_since(args.since) if args.since else None,
+                                until=parse_since(args.until) if args.until else None)
+
+    if args.count:
+        rows = count_events(conn, args.count, where, params)
+        if args.format == 'json':
+            print(json.dumps([{args.count: value, 'count': n} for value, n in rows], indent=2))
+        elif args.format == 'csv':
+            writer = csv.writer(sys.stdout)
+            writer.writerow([args.count, 'count'])
+            writer.writerows(rows)
+        else:
+            for value, n in rows:
+                print(f"{n:>10}  {value if value is not None else '-'}")
+        return
+
+    events = query_events(conn, where, params, limit=args.limit, newest_first=args.newest)
+    fields = ('logged_at', 'session_id', 'hook_event_name', 'tool_name', 'detail',
+              'transcript_path', 'transcript_offset', 'log', 'source', 'offset')
+    if args.format == 'csv':
+        writer = csv.writer(sys.stdout)
+        writer.writerow(fields + (('record',) if args.full else ()))
+    try:
+        for event in events:
+            if args.full:
+                event['record'] = load_record(args.log_dir, event)
+            if args.format == 'json':
+                print(json.dumps({k: event[k] for k in fields + (('record',) if args.full else ())}))
+            elif args.format == 'csv':
+                writer.writerow([event[k] for k in fields] +
+                                ([json.dumps(event['record'])] if args.full else []))
+            else:
+                detail = (event['detail'] or '').replace('\n', ' ')
+                print(f"{_format_time(event['logged_at'])}  {(event['session_id'] or '-')[:8]:<8}  "
+                      f"{event['hook_event_name'] or '-':<18} {event['tool_name'] or '-':<12} {detail[:100]}")
+                if args.full:
+                    print('    ' + json.dumps(event['record']))
+    except BrokenPipeError:
+        sys.stderr.close()
+
+
+if __name__ == '__main__':
+    main()
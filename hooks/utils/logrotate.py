@@ -0,0 +1,335 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Rotation for the hook logs.
+
+Event logs (.claude/logs/<event>.jsonl) and hook_metrics.jsonl roll over:
+- by size: the append that takes a log past CLAUDE_HOOKS_LOG_MAX_BYTES
+  (default 16 MiB, 0 = never) rotates it
+- by age: a sweep rotates logs opened more than CLAUDE_HOOKS_LOG_MAX_AGE
+  hours ago (default 168, 0 = never). SessionStart starts a sweep in the
+  background at most once per SWEEP_INTERVAL
+
+A rotated log is renamed into .claude/logs/rotated/ and gzip-compressed by a
+detached helper, so no hook waits for compression. The newest
+CLAUDE_HOOKS_LOG_KEEP segments (default 10) are kept per log.
+
+rotated/manifest.json lists each log's segments oldest first, and
+eventlog.iter_log() / iter_events() read through them, so query tools see
+one continuous log.
+
+Sweeps also gzip the --snapshot transcript copies (transcript_*.json) in
+dated directories (.claude/logs/YYYYMMDD/) once their day is over. Pruning
+is opt-in: with CLAUDE_HOOKS_LOG_KEEP_DAYS set, compressed snapshots older
+than that many days are deleted, and a dated directory is removed once
+nothing else is left in it. Other files are never touched.
+
+Usage:
+- ./logrotate.py --status                 # Segments per log
+- ./logrotate.py --sweep                  # Age rotation, compression, pruning
+- ./logrotate.py --rotate pre_tool_use    # Rotate one event log now
+- ./logrotate.py --compress               # Compress rotated segments
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.eventlog import LOG_DIR, LOG_SUFFIX, MANIFEST_FILE, ROTATED_DIR, file_lock
+
+DEFAULT_MAX_AGE_HOURS = 168
+DEFAULT_KEEP = 10
+DEFAULT_KEEP_DAYS = 0    # Keep snapshots forever unless CLAUDE_HOOKS_LOG_KEEP_DAYS is set
+SNAPSHOT_PATTERN = 'transcript_*.json'
+SWEEP_INTERVAL = 3600   # Seconds between background sweeps
+COMPRESS_GRACE = 2.0    # Seconds a segment rests before compression, for in-flight appends
+
+
+def _env_number(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def get_max_age():
+    """Return the rotation age in seconds (0 = never)."""
+    return _env_number('CLAUDE_HOOKS_LOG_MAX_AGE', DEFAULT_MAX_AGE_HOURS) * 3600
+
+
+def get_keep():
+    """Return the number of rotated segments kept per log."""
+    return max(1, int(_env_number('CLAUDE_HOOKS_LOG_KEEP', DEFAULT_KEEP)))
+
+
+def rotated_dir(log_dir):
+    return Path(log_dir) / ROTATED_DIR
+
+
+def load_manifest(log_dir):
+    """Return the rotation manifest of a log directory (empty if missing)."""
+    try:
+        with open(rotated_dir(log_dir) / MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault('segments', {})
+    manifest.setdefault('opened', {})
+    return manifest
+
+
+def save_manifest(log_dir, manifest):
+    """Atomically replace the manifest; call with the rotation lock held."""
+    directory = rotated_dir(log_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = directory / f"{MANIFEST_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, directory / MANIFEST_FILE)
+
+
+def _lock(log_dir):
+    return file_lock(rotated_dir(log_dir) / '.lock')
+
+
+def _remove_segment(directory, name):
+    for path in (directory / name, directory / (name + '.gz')):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def rotate(path, max_bytes=None, background=True):
+    """
+    Move a log into rotated/ and start a fresh one.
+
+    Appends already in flight land in the rotated segment, which is why
+    compression waits COMPRESS_GRACE seconds.
+
+    Args:
+        path (Path): Live .jsonl log
+        max_bytes (int): Only rotate if the log is still larger than this
+            (another process may have rotated it first)
+        background (bool): Start the detached compressor
+
+    Returns:
+        Path: The rotated segment, or None if nothing was rotated
+    """
+    path = Path(path)
+    log_dir = path.parent
+    directory = rotated_dir(log_dir)
+    with _lock(log_dir):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        size = stat.st_size
+        if size == 0 or (max_bytes and size <= max_bytes):
+            return None
+
+        now = time.time()
+        stamp = datetime.fromtimestamp(now).strftime('%Y%m%dT%H%M%S.%f')
+        segment = directory / f"{path.stem}.{stamp}{path.suffix}"
+        os.replace(path, segment)
+
+        manifest = load_manifest(log_dir)
+        segments = manifest['segments'].setdefault(path.name, [])
+        segments.append({'file': segment.name, 'opened': manifest['opened'].get(path.name),
+                         'rotated': round(now, 3), 'bytes': size, 'inode': stat.st_ino,
+                         'compressed': False})
+        for old in segments[:-get_keep()]:
+            _remove_segment(directory, old['file'])
+        del segments[:-get_keep()]
+        manifest['opened'][path.name] = round(now, 3)
+        save_manifest(log_dir, manifest)
+
+    if background:
+        start_background(log_dir, '--compress')
+    return segment
+
+
+def start_background(log_dir, *args):
+    """Run this script detached (e.g. --compress or --sweep) for a log directory."""
+    try:
+        from utils.sockserve import spawn_detached
+        spawn_detached([sys.executable, str(Path(__file__).resolve()), *args,
+                        '--log-dir', str(Path(log_dir).resolve())])
+    except Exception:
+        pass  # The next sweep compresses whatever is left
+
+
+def _gzip_file(source, target):
+    """Compress source into target via a temporary file."""
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(source, 'rb') as src, gzip.open(tmp_path, 'wb', compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.replace(tmp_path, target)
+
+
+def compress_pending(log_dir, grace=COMPRESS_GRACE):
+    """
+    Gzip rotated segments that are not compressed yet.
+
+    Returns:
+        int: Number of segments compressed
+    """
+    directory = rotated_dir(log_dir)
+    with _lock(log_dir):
+        pending = [entry for segments in load_manifest(log_dir)['segments'].values()
+                   for entry in segments if not entry.get('compressed')]
+    if not pending:
+        return 0
+
+    wait = max(entry['rotated'] for entry in pending) + grace - time.time()
+    if wait > 0:
+        time.sleep(wait)
+
+    compressed = {}
+    for entry in pending:
+        source = directory / entry['file']
+        target = directory / (entry['file'] + '.gz')
+        try:
+            _gzip_file(source, target)
+        except FileNotFoundError:
+            continue  # Pruned or compressed by another helper
+        source.unlink(missing_ok=True)
+        compressed[entry['file']] = target.stat().st_size
+    count = len(compressed)
+
+    with _lock(log_dir):
+        manifest = load_manifest(log_dir)
+        for segments in manifest['segments'].values():
+            for entry in segments:
+                if entry['file'] in compressed:
+                    entry['compressed'] = True
+                    entry['compressed_bytes'] = compressed.pop(entry['file'])
+        for name in compressed:  # Pruned while we were compressing
+            _remove_segment(directory, name)
+        save_manifest(log_dir, manifest)
+    return count
+
+
+def rotate_aged(log_dir, max_age=None):
+    """
+    Rotate logs opened more than max_age seconds ago.
+
+    Logs seen for the first time start their age now.
+
+    Returns:
+        list: Rotated segment paths
+    """
+    log_dir = Path(log_dir)
+    max_age = get_max_age() if max_age is None else max_age
+    now = time.time()
+    due = []
+    with _lock(log_dir):
+        manifest = load_manifest(log_dir)
+        for path in sorted(log_dir.glob(f"*{LOG_SUFFIX}")):
+            opened = manifest['opened'].setdefault(path.name, round(now, 3))
+            if max_age and now - opened >= max_age:
+                due.append(path)
+        save_manifest(log_dir, manifest)
+    return [segment for segment in (rotate(path, background=False) for path in due) if segment]
+
+
+def sweep_snapshots(log_dir, keep_days=None):
+    """
+    Compress finished days of --snapshot transcripts and, when keep_days is
+    set, delete the compressed snapshots of expired days.
+
+    Returns:
+        tuple: (files compressed, snapshots removed)
+    """
+    log_dir = Path(log_dir)
+    keep_days = int(_env_number('CLAUDE_HOOKS_LOG_KEEP_DAYS', DEFAULT_KEEP_DAYS)
+                    if keep_days is None else keep_days)
+    today = datetime.now().strftime('%Y%m%d')
+    cutoff = (datetime.now() - timedelta(days=keep_days)).strftime('%Y%m%d')
+    compressed = removed = 0
+    for day_dir in sorted(log_dir.iterdir()):
+        name = day_dir.name
+        if not (day_dir.is_dir() and len(name) == 8 and name.isdigit()) or name >= today:
+            continue
+        for snapshot in day_dir.glob(SNAPSHOT_PATTERN):
+            _gzip_file(snapshot, snapshot.with_name(snapshot.name + '.gz'))
+            snapshot.unlink()
+            compressed += 1
+        if keep_days and name < cutoff:
+            for snapshot in day_dir.glob(SNAPSHOT_PATTERN + '.gz'):
+                snapshot.unlink()
+                removed += 1
+            try:
+                day_dir.rmdir()  # Only succeeds once the directory is empty
+            except OSError:
+                pass
+    return compressed, removed
+
+
+def sweep(log_dir):
+    """Run age rotation, compression and snapshot pruning once."""
+    log_dir = Path(log_dir)
+    if not log_dir.is_dir():
+        return {}
+    rotated = rotate_aged(log_dir)
+    compressed = compress_pending(log_dir)
+    snapshots, removed = sweep_snapshots(log_dir)
+    with _lock(log_dir):
+        manifest = load_manifest(log_dir)
+        manifest['swept'] = round(time.time(), 3)
+        save_manifest(log_dir, manifest)
+    return {'rotated': len(rotated), 'compressed': compressed,
+            'snapshots_compressed': snapshots, 'snapshots_removed': removed}
+
+
+def maybe_sweep(log_dir=None):
+    """Start a background sweep if the last one is older than SWEEP_INTERVAL."""
+    log_dir = Path(log_dir if log_dir is not None else LOG_DIR)
+    if time.time() - load_manifest(log_dir).get('swept', 0) >= SWEEP_INTERVAL:
+        start_background(log_dir, '--sweep')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hook log rotation')
+    parser.add_argument('--log-dir', default=str(LOG_DIR), help='Log directory')
+    parser.add_argument('--status', action='store_true', help='Show rotated segments per log')
+    parser.add_argument('--sweep', action='store_true', help='Rotate aged logs, compress and prune')
+    parser.add_argument('--rotate', metavar='EVENT', help='Rotate one event log now')
+    parser.add_argument('--compress', action='store_true', help='Compress rotated segments')
+    args = parser.parse_args()
+
+    if args.sweep:
+        print(json.dumps(sweep(args.log_dir)))
+    elif args.rotate:
+        segment = rotate(Path(args.log_dir) / f"{args.rotate}{LOG_SUFFIX}")
+        print(f"Rotated to {segment}" if segment else "Nothing to rotate")
+    elif args.compress:
+        print(f"Compressed {compress_pending(args.log_dir)} segments")
+    elif args.status:
+        manifest = load_manifest(args.log_dir)
+        for name, segments in sorted(manifest['segments'].items()):
+            total = sum(s.get('compressed_bytes', s['bytes']) for s in segments)
+            pending = sum(1 for s in segments if not s.get('compressed'))
+            print(f"{name:<28} {len(segments):>3} segments {total / 1024:10.1f} KiB on disk"
+                  f"{f' ({pending} uncompressed)' if pending else ''}")
+        if manifest.get('swept'):
+            print(f"Last sweep: {datetime.fromtimestamp(manifest['swept']).isoformat(timespec='seconds')}")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Pre-generated agent names for UserPromptSubmit --name-agent.
+
+Naming a session used to run Ollama and then Anthropic synchronously
+(up to 15 s) before Claude saw the prompt. Now the hook takes a name from
+a pool kept in the session store, which costs one small transaction. The
+claim also checks that no other session already uses the name.
+
+When the pool falls below LOW_WATER, the hook starts a detached refiller.
+It asks the LLM helper (utils/llm/llm_client.py, which falls back to
+anth.py) for BATCH_SIZE names in a single request, excluding names
+already in use. At most one refiller runs at a time, and a failed
+attempt is retried after REFILL_RETRY seconds. If the pool is
+empty (first use, or no API key), the session gets an unused built-in
+name, so the prompt still never waits on a model.
+
+Usage:
+- ./namepool.py --status
+- ./namepool.py --refill                 # Fetch a batch now (blocking)
+- ./namepool.py --add Orion Lyra Vega    # Seed names by hand
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.eventlog import file_lock
+from utils.sessionstore import DATA_DIR, SessionStore
+
+LOW_WATER = 5
+BATCH_SIZE = 20
+REFILL_TIMEOUT = 30
+REFILL_RETRY = 60       # Seconds before a failed or running refill is attempted again
+REFILL_LOCK = 'name_pool.lock'
+
+FALLBACK_NAMES = [
+    "Phoenix", "Sage", "Nova", "Echo", "Atlas", "Cipher", "Nexus",
+    "Oracle", "Quantum", "Zenith", "Aurora", "Vortex", "Nebula",
+    "Catalyst", "Prism", "Axiom", "Helix", "Flux", "Synth", "Vertex"
+]
+
+
+def is_valid_name(name):
+    """Check the shape the hooks accept: one alphanumeric word, 3-20 chars."""
+    return bool(name) and name.isalnum() and 3 <= len(name) <= 20
+
+
+def fallback_name(store):
+    """Return a built-in name no session uses yet (numbered once all are taken)."""
+    for suffix in [''] + [str(n) for n in range(2, 1000)]:
+        for name in FALLBACK_NAMES:
+            if not store.name_in_use(name + suffix):
+                return name + suffix
+    return None
+
+
+def assign_agent_name(store, session_id, refill=True):
+    """
+    Name a session's agent without waiting on a model.
+
+    Returns:
+        str: The session's agent name
+    """
+    name = store.claim_pool_name(session_id)
+    if name is None:
+        candidate = fallback_name(store)
+        if candidate and store.set_agent_name(session_id, candidate):
+            name = candidate
+        else:
+            name = store.agent_name(session_id)
+    if refill and store.pool_size() < LOW_WATER:
+        start_refill(store.data_dir)
+    return name
+
+
+def start_refill(data_dir):
+    """Start a detached refiller unless one ran within REFILL_RETRY seconds."""
+    lock_path = Path(data_dir) / REFILL_LOCK
+    try:
+        if time.time() - lock_path.stat().st_mtime < REFILL_RETRY:
+            return
+    except FileNotFoundError:
+        pass
+    try:
+        lock_path.touch()
+        from utils.sockserve import spawn_detached
+        spawn_detached([sys.executable, str(Path(__file__).resolve()), '--refill',
+                        '--data-dir', str(Path(data_dir).resolve())])
+    except Exception:
+        pass
+
+
+def fetch_names(count, exclude):
+    """
+    Ask the LLM helper (or anth.py when it is not running) for a batch of names.
+
+    Returns:
+        list: Validated names (empty on failure)
+    """
+    from utils.llm.llm_client import agent_names
+    return [name for name in agent_names(count, exclude, deadline=REFILL_TIMEOUT)
+            if is_valid_name(name)]
+
+
+def refill(data_dir=None, count=BATCH_SIZE):
+    """
+    Top the pool up with one batch of generated names.
+
+    Returns:
+        int: Names added, or None if another refill holds the lock
+    """
+    data_dir = Path(data_dir if data_dir is not None else DATA_DIR)
+    try:
+        with file_lock(data_dir / REFILL_LOCK, blocking=False):
+            os.utime(data_dir / REFILL_LOCK)
+            with SessionStore(data_dir) as store:
+                used = [name for (name,) in store.conn.execute(
+                    'SELECT agent_name FROM sessions WHERE agent_name IS NOT NULL '
+                    'UNION SELECT name FROM name_pool')]
+                names = fetch_names(count, used)
+                return store.add_pool_names(names)
+    except BlockingIOError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Agent name pool')
+    parser.add_argument('--data-dir', default=str(DATA_DIR), help='Data directory')
+    parser.add_argument('--status', action='store_true', help='Show the pool size')
+    parser.add_argument('--refill', action='store_true', help='Generate a batch of names now')
+    parser.add_argument('--count', type=int, default=BATCH_SIZE, help='Names per batch')
+    parser.add_argument('--add', nargs='+', metavar='NAME', help='Add names to the pool')
+    args = parser.parse_args()
+
+    if args.refill:
+        added = refill(args.data_dir, args.count)
+        print("Another refill is running" if added is None else f"Added {added} names")
+    elif args.add:
+        names = [name for name in args.add if is_valid_name(name)]
+        with SessionStore(args.data_dir) as store:
+            print(f"Added {store.add_pool_names(names)} names")
+    elif args.status:
+        with SessionStore(args.data_dir) as store:
+            names = [name for (name,) in store.conn.execute(
+                'SELECT name FROM name_pool ORDER BY added_at, rowid')]
+        print(f"{len(names)} pooled names{': ' + ', '.join(names) if names else ''}")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Declarative PreToolUse policy: tool/field/pattern rules with allow, deny
+or ask actions, loaded from hooks/policy.json (or a .toml file on Python
+3.11+, or the path in CLAUDE_HOOKS_POLICY).
+
+Policy file format:
+    {
+      "rules": [
+        {
+          "id": "env-file-access",
+          "tools": ["Read", "Edit"],        # or "*" for every tool
+          "field": "file_path",             # key in tool_input
+          "pattern": "\\.env",              # regex (re.search), or...
+          "matcher": "dangerous_rm",        # ...a builtin matcher instead
+          "action": "deny",                 # allow | deny | ask
+          "message": "BLOCKED: ..."
+        }
+      ]
+    }
+
+Rules are evaluated in file order and the first match wins. The policy is
+compiled into an index keyed by tool_name, so a Read call only looks at
+Read (and "*") rules, with one combined alternation per tool and field as
+a prefilter. Patterns that cannot be embedded in an alternation (global
+inline flags such as "(?i)", backreferences, named groups) skip the
+prefilter and are matched on their own. The index is cached on disk next to the policy (keyed by the
+policy file's mtime and size), and regexes are compiled lazily per tool,
+so a hook invocation never re-parses the policy or compiles rules for
+other tools. Long-lived processes (utils/hookd.py) pick up edits on the
+next call because load_policy() re-checks the file's mtime.
+
+Usage:
+- ./policy.py --check                         # Validate and compile the policy
+- ./policy.py Read '{"file_path": ".env"}'    # Show the decision for a call
+"""
+
+import argparse
+import json
+import marshal
+import os
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_POLICY = HOOKS_DIR / 'policy.json'
+CACHE_DIR = HOOKS_DIR / '.cache'
+
+ACTIONS = ('allow', 'deny', 'ask')
+
+# Bumped whenever compile_index() output changes shape
+INDEX_VERSION = 2
+
+# Global inline flags, backreferences and named groups change meaning (or
+# stop compiling) once a pattern is one branch of a combined alternation
+UNCOMBINABLE = re.compile(r'\(\?[aiLmsux]+\)|\(\?P[<=]|\\[1-9]|\\g<')
+
+Decision = namedtuple('Decision', ['action', 'rule_id', 'message'])
+
+
+def _dangerous_rm(value):
+    """Builtin matcher: destructive rm/find deletions (see utils/cmdsafety.py)."""
+    from utils.cmdsafety import scan_command
+    match = scan_command(value)
+    return match.rule if match else None
+
+
+# Builtin matchers return a detail string (appended to the message) or None
+MATCHERS = {
+    'dangerous_rm': _dangerous_rm,
+}
+
+
+def get_policy_path():
+    """Return the active policy file path."""
+    override = os.getenv('CLAUDE_HOOKS_POLICY')
+    return Path(override).expanduser() if override else DEFAULT_POLICY
+
+
+def _parse_policy_file(path):
+    """Read the raw policy document from JSON or TOML."""
+    if path.suffix == '.toml':
+        import tomllib  # Python 3.11+
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compile_index(document):
+    """
+    Build the per-tool index from a policy document.
+
+    Returns:
+        dict: {"tools": {tool: [rule, ...]}, "wildcard": [rule, ...],
+               "prefilters": {tool: {field: combined_pattern}}}
+    """
+    tools = {}
+    wildcard = []
+    for position, raw in enumerate(document.get('rules', [])):
+        action = raw.get('action', 'deny')
+        if action not in ACTIONS:
+            raise ValueError(f"Rule {position}: unknown action {action!r}")
+        if 'pattern' not in raw and raw.get('matcher') not in MATCHERS:
+            raise ValueError(f"Rule {position}: needs a pattern or a known matcher")
+        combined = False
+        if 'pattern' in raw:
+            # Fail at compile time, not at hook time
+            try:
+                re.compile(raw['pattern'])
+            except re.error as e:
+                raise ValueError(f"Rule {position}: bad pattern {raw['pattern']!r}: {e}")
+            combined = not UNCOMBINABLE.search(raw['pattern'])
+
+        rule = {
+            'id': raw.get('id', f"rule-{position}"),
+            'position': position,
+            'field': raw.get('field', 'command'),
+            'pattern': raw.get('pattern'),
+            'matcher': raw.get('matcher'),
+            'combined': combined,
+            'action': action,
+            'message': raw.get('message', f"Blocked by policy rule {raw.get('id', position)}"),
+        }
+        rule_tools = raw.get('tools', '*')
+        if rule_tools == '*' or rule_tools == ['*']:
+            wildcard.append(rule)
+        else:
+            for tool in ([rule_tools] if isinstance(rule_tools, str) else rule_tools):
+                tools.setdefault(tool, []).append(rule)
+
+    # Merge wildcard rules into each tool's list, preserving file order
+    for tool, rules in tools.items():
+        tools[tool] = sorted(rules + wildcard, key=lambda r: r['position'])
+
+    prefilters = {}
+    for tool, rules in list(tools.items()) + [('*', wildcard)]:
+        by_field = {}
+        for rule in rules:
+            if rule['combined']:
+                by_field.setdefault(rule['field'], []).append(f"(?:{rule['pattern']})")
+        prefilters[tool] = {field: '|'.join(parts) for field, parts in by_field.items()}
+        for field, pattern in prefilters[tool].items():
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Combined {field!r} prefilter for tool {tool!r} does not compile: {e}")
+
+    return {'tools': tools, 'wildcard': wildcard, 'prefilters': prefilters}
+
+
+class PolicyIndex:
+    """Compiled policy with lazily compiled per-tool regexes."""
+
+    def __init__(self, index, source=None):
+        self.source = source
+        self._tools = index['tools']
+        self._wildcard = index['wildcard']
+        self._prefilters = index['prefilters']
+        self._compiled = {}
+
+    def _compiled_for(self, tool_name):
+        """Compile (once) the prefilters and rule regexes for one tool."""
+        compiled = self._compiled.get(tool_name)
+        if compiled is None:
+            key = tool_name if tool_name in self._tools else '*'
+            rules = self._tools.get(tool_name, self._wildcard)
+            prefilters = {field: re.compile(pattern)
+                          for field, pattern in self._prefilters.get(key, {}).items()}
+            patterns = [re.compile(r['pattern']) if r['pattern'] is not None else None
+                        for r in rules]
+            compiled = (rules, prefilters, patterns)
+            self._compiled[tool_name] = compiled
+        return compiled
+
+    def evaluate(self, tool_name, tool_input):
+        """
+        Evaluate a tool call against the policy.
+
+        Args:
+            tool_name (str): Tool being called (e.g. "Bash")
+            tool_input (dict): The tool's input parameters
+
+        Returns:
+            Decision: The first matching rule's decision, or None
+        """
+        rules, prefilters, patterns = self._compiled_for(tool_name)
+        if not rules:
+            return None
+
+        # One combined scan per field rules out most calls immediately
+        hit_fields = set()
+        for field, prefilter in prefilters.items():
+            value = tool_input.get(field)
+            if isinstance(value, str) and prefilter.search(value):
+                hit_fields.add(field)
+
+        for rule, pattern in zip(rules, patterns):
+            value = tool_input.get(rule['field'])
+            if not isinstance(value, str):
+                continue
+            if pattern is not None:
+                if rule['combined'] and rule['field'] not in hit_fields:
+                    continue
+                if pattern.search(value):
+                    return Decision(rule['action'], rule['id'], rule['message'])
+            else:
+                detail = MATCHERS[rule['matcher']](value)
+                if detail:
+                    return Decision(rule['action'], rule['id'], f"{rule['message']} ({detail})")
+        return None
+
+
+def _cache_path(policy_path):
+    """Return the on-disk cache file for a policy path."""
+    tag = f"{sys.version_info[0]}{sys.version_info[1]}"
+    safe_name = str(policy_path.resolve()).strip('/').replace('/', '_').replace('\\', '_')
+    return CACHE_DIR / f"policy-{safe_name}-py{tag}.marshal"
+
+
+def _load_cached_index(policy_path, stamp):
+    """Return the cached index if it matches the policy file's stamp."""
+    try:
+        with open(_cache_path(policy_path), 'rb') as f:
+            cached = marshal.load(f)
+        if cached.get('stamp') == stamp and cached.get('version') == INDEX_VERSION:
+            return cached['index']
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _store_cached_index(policy_path, stamp, index):
+    """Write the compiled index atomically; failures are ignored."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file = _cache_path(policy_path)
+        tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            marshal.dump({'stamp': stamp, 'version': INDEX_VERSION, 'index': index}, f)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+
+_loaded = {}
+
+
+def load_policy(path=None):
+    """
+    Return the compiled policy, reusing in-memory and on-disk caches.
+
+    Returns:
+        PolicyIndex: Compiled policy (empty if the file does not exist)
+    """
+    path = Path(path) if path else get_policy_path()
+    try:
+        st = path.stat()
+    except OSError:
+        return PolicyIndex({'tools': {}, 'wildcard': [], 'prefilters': {}}, source=path)
+    stamp = [st.st_mtime_ns, st.st_size]
+
+    memo = _loaded.get(str(path))
+    if memo and memo[0] == stamp:
+        return memo[1]
+
+    index = _load_cached_index(path, stamp)
+    if index is None:
+        index = compile_index(_parse_policy_file(path))
+        _store_cached_index(path, stamp, index)
+
+    policy = PolicyIndex(index, source=path)
+    _loaded[str(path)] = (stamp, policy)
+    return policy
+
+
+def main():
+    if str(HOOKS_DIR) not in sys.path:
+        sys.path.insert(0, str(HOOKS_DIR))
+
+    parser = argparse.ArgumentParser(description='PreToolUse policy tools')
+    parser.add_argument('tool_name', nargs='?', help='Tool name to evaluate')
+    parser.add_argument('tool_input', nargs='?', default='{}', help='Tool input as JSON')
+    parser.add_argument('--policy', help='Policy file (default: hooks/policy.json)')
+    parser.add_argument('--check', action='store_true', help='Validate and compile the policy')
+    args = parser.parse_args()
+
+    path = Path(args.policy) if args.policy else get_policy_path()
+    if args.check:
+        index = compile_index(_parse_policy_file(path))
+        count = len({r['id'] for rules in index['tools'].values() for r in rules} |
+                    {r['id'] for r in index['wildcard']})
+        print(f"{path}: {count} rules for tools {sorted(index['tools'])}")
+    elif args.tool_name:
+        decision = load_policy(path).evaluate(args.tool_name, json.loads(args.tool_input))
+        print(json.dumps(decision._asdict() if decision else None))
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Hook latency report.
+
+Aggregates the per-invocation records written by utils/hookmetrics.py
+(.claude/logs/hook_metrics.jsonl) across sessions. For each hook event:
+- wall time: process startup (or, for daemon-served hooks, the client's
+  send-to-start delay) plus the hook's own work, as p50/p95/p99
+- each phase's p50/p95/p99 (stdin_parse, policy_check, log_write,
+  transcript_export, tts_dispatch, subprocess, ...)
+- the hook's share of all hook wall time, i.e. which hook dominates the
+  latency added to a turn
+
+--compare HOURS splits the records into a baseline (older) and the recent
+window and flags p95 regressions.
+
+Usage:
+- ./report.py                            # All recorded invocations
+- ./report.py --since 7d --hook stop     # Last week, one hook
+- ./report.py --compare 24               # Last 24 h vs. everything before
+- ./report.py --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.bench.benchlib import percentile
+from utils.eventlog import LOG_DIR, iter_log
+from utils.hookmetrics import METRICS_FILE
+
+REGRESSION_THRESHOLD = 0.2  # Flag a p95 that grew by more than 20%
+MIN_SAMPLES = 5             # Don't compare on fewer samples than this
+
+
+def parse_since(value):
+    """
+    Parse a --since value: "30m", "12h", "7d" or an ISO date/time.
+
+    Returns:
+        float: Epoch seconds
+    """
+    units = {'m': 60, 'h': 3600, 'd': 86400}
+    if value and value[-1] in units and value[:-1].replace('.', '', 1).isdigit():
+        return time.time() - float(value[:-1]) * units[value[-1]]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def wall_ms(record):
+    """Total latency of one invocation as seen by Claude."""
+    return record.get('ms', 0.0) + (record.get('startup_ms') or record.get('client_ms') or 0.0)
+
+
+def load_metrics(log_dirs, since=None, hooks=None, session=None):
+    """Yield metrics records from the given log directories, filtered."""
+    for log_dir in log_dirs:
+        for record in iter_log(Path(log_dir) / METRICS_FILE):
+            if since and record.get('ts', 0) < since:
+                continue
+            if hooks and record.get('hook') not in hooks:
+                continue
+            if session and record.get('session') != session:
+                continue
+            yield record
+
+
+def _stats(values):
+    return {'n': len(values), 'p50': percentile(values, 50), 'p95': percentile(values, 95),
+            'p99': percentile(values, 99)}
+
+
+def aggregate(records):
+    """
+    Compute per-hook and per-phase percentiles.
+
+    Returns:
+        dict: hook -> {"wall", "ms", "share", "via", "phases": {phase: stats}}
+    """
+    walls = defaultdict(list)
+    own = defaultdict(list)
+    phases = defaultdict(lambda: defaultdict(list))
+    via = defaultdict(lambda: defaultdict(int))
+    for record in records:
+        hook = record.get('hook', '?')
+        walls[hook].append(wall_ms(record))
+        own[hook].append(record.get('ms', 0.0))
+        via[hook][record.get('via', 'script')] += 1
+        for name, ms in (record.get('phases') or {}).items():
+            phases[hook][name].append(ms)
+
+    total = sum(sum(values) for values in walls.values()) or 1.0
+    return {
+        hook: {
+            'wall': _stats(walls[hook]),
+            'ms': _stats(own[hook]),
+            'share': sum(walls[hook]) / total,
+            'via': dict(via[hook]),
+            'phases': {name: _stats(values) for name, values in sorted(phases[hook].items())},
+        }
+        for hook in sorted(walls, key=lambda h: -sum(walls[h]))
+    }
+
+
+def compare(baseline, recent):
+    """
+    Compare p95 wall and phase times between two aggregate() results.
+
+    Returns:
+        list: (hook, metric, baseline_p95, recent_p95, change) for metrics
+        with enough samples on both sides, worst change first
+    """
+    rows = []
+    for hook, current in recent.items():
+        before = baseline.get(hook)
+        if not before:
+            continue
+        pairs = [('wall', before['wall'], current['wall'])]
+        pairs += [(name, before['phases'][name], stats) for name, stats in current['phases'].items()
+                  if name in before['phases']]
+        for metric, old, new in pairs:
+            if min(old['n'], new['n']) < MIN_SAMPLES or not old['p95']:
+                continue
+            rows.append((hook, metric, old['p95'], new['p95'], new['p95'] / old['p95'] - 1))
+    return sorted(rows, key=lambda row: -row[4])
+
+
+def _line(label, stats, indent=''):
+    return (f"{indent}{label:<{30 - len(indent)}} n={stats['n']:<6} p50={stats['p50']:8.2f}ms "
+            f"p95={stats['p95']:8.2f}ms p99={stats['p99']:8.2f}ms")
+
+
+def print_report(report):
+    if not report:
+        print("No hook metrics recorded")
+        return
+    for hook, entry in report.items():
+        via = ', '.join(f"{name} {count}" for name, count in sorted(entry['via'].items()))
+        print(f"{hook}  ({entry['share']:.0%} of hook time; {via})")
+        print(_line('wall', entry['wall'], '  '))
+        print(_line('hook work', entry['ms'], '  '))
+        for name, stats in entry['phases'].items():
+            print(_line(name, stats, '    '))
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hook latency percentiles per event and phase')
+    parser.add_argument('--log-dir', action='append',
+                        help=f'Log directory to read (repeatable, default {LOG_DIR})')
+    parser.add_argument('--since', help='Only records newer than this (30m, 12h, 7d or ISO date)')
+    parser.add_argument('--hook', action='append', help='Only these hooks (repeatable)')
+    parser.add_argument('--session', help='Only one session')
+    parser.add_argument('--compare', type=float, metavar='HOURS',
+                        help='Compare the last HOURS against the records before them')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    args = parser.parse_args()
+
+    records = list(load_metrics(args.log_dir or [LOG_DIR],
+                                since=parse_since(args.since) if args.since else None,
+                                hooks=set(args.hook) if args.hook else None,
+                                session=args.session))
+
+    if args.compare is None:
+        report = aggregate(records)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+        return
+
+    split = time.time() - args.compare * 3600
+    rows = compare(aggregate(r for r in records if r.get('ts', 0) < split),
+                   aggregate(r for r in records if r.get('ts', 0) >= split))
+    if args.json:
+        print(json.dumps([dict(zip(('hook', 'metric', 'baseline_p95', 'recent_p95', 'change'), row))
+                          for row in rows], indent=2))
+        return
+    if not rows:
+        print(f"Not enough samples on both sides of the last {args.compare:g} h to compare")
+    for hook, metric, old, new, change in rows:
+        flag = 'REGRESSION' if change > REGRESSION_THRESHOLD else ''
+        print(f"{hook:<20} {metric:<18} p95 {old:8.2f}ms -> {new:8.2f}ms {change:+7.1%} {flag}")
+
+
+if __name__ == '__main__':
+    main()
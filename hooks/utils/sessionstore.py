@@ -0,0 +1,354 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Session store for the UserPromptSubmit hook.
+
+Sessions, their prompts and agent names live in one SQLite database in WAL
+mode (.claude/data/sessions.sqlite) instead of one JSON file per session
+that is rewritten on every prompt:
+- appending a prompt is one indexed INSERT, however long the session is
+- lookups by session, by time and by prompt prefix use indexes, so
+  questions across sessions ("last 50 prompts", "sessions in repo X") do
+  not open thousands of files
+- concurrent hooks serialize on SQLite's write lock; readers never block
+
+Legacy .claude/data/sessions/<session_id>.json files are imported the first
+time their session is seen, or all at once with --migrate.
+
+The store also holds the pool of pre-generated agent names
+(utils/namepool.py); claiming a name and checking it against every
+session's name happen in one transaction.
+
+Usage:
+- ./sessionstore.py --recent 50                     # Last 50 prompts, all sessions
+- ./sessionstore.py --recent 20 --session abc123
+- ./sessionstore.py --prefix "Refactor" --since 7d
+- ./sessionstore.py --sessions --cwd /path/to/repo  # Sessions in one project
+- ./sessionstore.py --export abc123                 # Old <session_id>.json shape
+- ./sessionstore.py --migrate                       # Import .claude/data/sessions/*.json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+DATA_DIR = Path('.claude/data')
+STORE_FILE = 'sessions.sqlite'
+LEGACY_DIR = 'sessions'
+SCHEMA_VERSION = 2
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    agent_name TEXT,
+    cwd TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    prompt_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_cwd ON sessions (cwd, updated_at);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS prompts (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    prompt TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS prompts_session ON prompts (session_id, id);
+CREATE INDEX IF NOT EXISTS prompts_ts ON prompts (ts);
+CREATE INDEX IF NOT EXISTS prompts_text ON prompts (prompt);
+CREATE INDEX IF NOT EXISTS sessions_agent_name ON sessions (agent_name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS name_pool (
+    name TEXT PRIMARY KEY COLLATE NOCASE,
+    added_at REAL NOT NULL
+);
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+
+class SessionStore:
+    """Sessions, prompts and agent names in one SQLite database."""
+
+    def __init__(self, data_dir=None):
+        self.data_dir = Path(data_dir if data_dir is not None else DATA_DIR)
+        self.path = self.data_dir / STORE_FILE
+        self.legacy_dir = self.data_dir / LEGACY_DIR
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        # Autocommit; writes open their own IMMEDIATE transactions
+        self.conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000,
+                                    isolation_level=None)
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self.conn.execute('PRAGMA journal_mode = WAL')
+            self.conn.executescript(SCHEMA)
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, fn):
+        """Run fn(conn) in one IMMEDIATE transaction and return its result."""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(self.conn)
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+        return result
+
+    def _ensure_session(self, conn, session_id, ts, cwd=None):
+        """Create the session row (importing a legacy JSON file) if missing."""
+        if conn.execute('SELECT 1 FROM sessions WHERE session_id = ?', (session_id,)).fetchone():
+            return
+        legacy = self._load_legacy(self.legacy_dir / f"{session_id}.json")
+        prompts = legacy.get('prompts', []) if legacy else []
+        created = ts
+        if legacy:
+            created = legacy.get('_mtime', ts)
+            conn.executemany('INSERT INTO prompts (session_id, ts, prompt) VALUES (?, ?, ?)',
+                             [(session_id, created, str(p)) for p in prompts])
+        conn.execute('INSERT INTO sessions (session_id, agent_name, cwd, created_at, updated_at, '
+                     'prompt_count) VALUES (?, ?, ?, ?, ?, ?)',
+                     (session_id, legacy.get('agent_name') if legacy else None, cwd, created,
+                      created, len(prompts)))
+
+    @staticmethod
+    def _load_legacy(path):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get('prompts', []), list):
+            return None
+        try:
+            data['_mtime'] = os.path.getmtime(path)
+        except OSError:
+            pass
+        return data
+
+    def add_prompt(self, session_id, prompt, ts=None, cwd=None):
+        """Append a prompt to a session (created on first use)."""
+        ts = time.time() if ts is None else ts
+
+        def write(conn):
+            self._ensure_session(conn, session_id, ts, cwd)
+            conn.execute('INSERT INTO prompts (session_id, ts, prompt) VALUES (?, ?, ?)',
+                         (session_id, ts, prompt))
+            conn.execute('UPDATE sessions SET updated_at = ?, prompt_count = prompt_count + 1, '
+                         'cwd = COALESCE(cwd, ?) WHERE session_id = ?', (ts, cwd, session_id))
+        self._write(write)
+
+    def agent_name(self, session_id):
+        """Return the session's agent name, or None."""
+        row = self.conn.execute('SELECT agent_name FROM sessions WHERE session_id = ?',
+                                (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_agent_name(self, session_id, name):
+        """
+        Name a session's agent unless it already has a name.
+
+        Returns:
+            bool: True if the name was stored
+        """
+        def write(conn):
+            self._ensure_session(conn, session_id, time.time())
+            return conn.execute('UPDATE sessions SET agent_name = ? WHERE session_id = ? '
+                                'AND agent_name IS NULL', (name, session_id)).rowcount == 1
+        return self._write(write)
+
+    def name_in_use(self, name):
+        """Check whether any session already uses an agent name (case-insensitive)."""
+        return self.conn.execute('SELECT 1 FROM sessions WHERE agent_name = ? COLLATE NOCASE',
+                                 (name,)).fetchone() is not None
+
+    def pool_size(self):
+        """Return the number of names waiting in the agent name pool."""
+        return self.conn.execute('SELECT COUNT(*) FROM name_pool').fetchone()[0]
+
+    def add_pool_names(self, names):
+        """
+        Add names to the agent name pool, skipping ones already used or pooled.
+
+        Returns:
+            int: Number of names added
+        """
+        now = time.time()
+
+        def write(conn):
+            added = 0
+            for name in names:
+                if self.name_in_use(name):
+                    continue
+                added += conn.execute('INSERT OR IGNORE INTO name_pool (name, added_at) VALUES (?, ?)',
+                                      (name, now)).rowcount
+            return added
+        return self._write(write)
+
+    def claim_pool_name(self, session_id):
+        """
+        Give a session the oldest pooled name that no session uses yet.
+
+        Returns:
+            str: The session's agent name (an existing one is kept), or None
+            if the pool ran dry
+        """
+        def write(conn):
+            self._ensure_session(conn, session_id, time.time())
+            current = conn.execute('SELECT agent_name FROM sessions WHERE session_id = ?',
+                                   (session_id,)).fetchone()[0]
+            if current:
+                return current
+            while True:
+                row = conn.execute('SELECT name FROM name_pool ORDER BY added_at, rowid LIMIT 1').fetchone()
+                if row is None:
+                    return None
+                conn.execute('DELETE FROM name_pool WHERE name = ?', row)
+                if not self.name_in_use(row[0]):
+                    conn.execute('UPDATE sessions SET agent_name = ? WHERE session_id = ?',
+                                 (row[0], session_id))
+                    return row[0]
+        return self._write(write)
+
+    def get_session(self, session_id):
+        """Return a session in the legacy JSON shape, or None."""
+        row = self.conn.execute('SELECT agent_name FROM sessions WHERE session_id = ?',
+                                (session_id,)).fetchone()
+        if row is None:
+            return None
+        data = {'session_id': session_id,
+                'prompts': [p for (p,) in self.conn.execute(
+                    'SELECT prompt FROM prompts WHERE session_id = ? ORDER BY id', (session_id,))]}
+        if row[0]:
+            data['agent_name'] = row[0]
+        return data
+
+    def recent_prompts(self, limit=50, session_id=None, since=None, prefix=None):
+        """
+        Return the newest prompts, newest first, as dicts.
+
+        Args:
+            limit (int): Maximum number of prompts
+            session_id (str): Only this session
+            since (float): Only prompts at or after this epoch time
+            prefix (str): Only prompts starting with this text (case-sensitive)
+        """
+        clauses, params = [], []
+        if session_id:
+            clauses.append('session_id = ?')
+            params.append(session_id)
+        if since:
+            clauses.append('ts >= ?')
+            params.append(since)
+        if prefix:
+            # A range on the text index; LIKE would not use it
+            clauses.append('prompt >= ? AND prompt < ?')
+            params += [prefix, prefix + '\U0010ffff']
+        where = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+        rows = self.conn.execute(f"SELECT session_id, ts, prompt FROM prompts{where} "
+                                 f"ORDER BY ts DESC, id DESC LIMIT ?", params + [int(limit)])
+        return [{'session_id': s, 'ts': ts, 'prompt': p} for s, ts, p in rows]
+
+    def sessions(self, cwd=None, since=None, limit=100):
+        """Return sessions, most recently active first, as dicts."""
+        clauses, params = [], []
+        if cwd:
+            clauses.append('cwd = ?')
+            params.append(str(cwd))
+        if since:
+            clauses.append('updated_at >= ?')
+            params.append(since)
+        where = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+        columns = ('session_id', 'agent_name', 'cwd', 'created_at', 'updated_at', 'prompt_count')
+        rows = self.conn.execute(f"SELECT {', '.join(columns)} FROM sessions{where} "
+                                 f"ORDER BY updated_at DESC LIMIT ?", params + [int(limit)])
+        return [dict(zip(columns, row)) for row in rows]
+
+    def migrate_legacy(self):
+        """
+        Import every legacy <session_id>.json and rename it to *.json.migrated.
+
+        Returns:
+            int: Number of sessions imported
+        """
+        imported = 0
+        for path in sorted(self.legacy_dir.glob('*.json')):
+            session_id = path.stem
+
+            def write(conn):
+                exists = conn.execute('SELECT 1 FROM sessions WHERE session_id = ?',
+                                      (session_id,)).fetchone()
+                if not exists:
+                    self._ensure_session(conn, session_id, time.time())
+                return not exists
+            if self._write(write):
+                imported += 1
+            path.rename(path.with_name(path.name + '.migrated'))
+        return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Session store for the hooks')
+    parser.add_argument('--data-dir', default=str(DATA_DIR), help='Data directory')
+    parser.add_argument('--recent', type=int, metavar='N', help='Show the newest N prompts')
+    parser.add_argument('--session', help='Only this session')
+    parser.add_argument('--prefix', help='Only prompts starting with this text')
+    parser.add_argument('--since', help='Only activity since (30m, 12h, 7d or ISO date)')
+    parser.add_argument('--sessions', action='store_true', help='List sessions')
+    parser.add_argument('--cwd', help='With --sessions, only sessions in this directory')
+    parser.add_argument('--export', metavar='SESSION_ID', help='Print a session as legacy JSON')
+    parser.add_argument('--migrate', action='store_true', help='Import legacy per-session JSON files')
+    parser.add_argument('--json', action='store_true', help='Print JSON')
+    args = parser.parse_args()
+
+    since = None
+    if args.since:
+        hooks_dir = str(Path(__file__).resolve().parents[1])
+        if hooks_dir not in sys.path:
+            sys.path.insert(0, hooks_dir)
+        from utils.report import parse_since
+        since = parse_since(args.since)
+
+    with SessionStore(args.data_dir) as store:
+        if args.migrate:
+            print(f"Imported {store.migrate_legacy()} sessions")
+        elif args.export:
+            print(json.dumps(store.get_session(args.export), indent=2))
+        elif args.sessions:
+            rows = store.sessions(cwd=args.cwd, since=since)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            for row in [] if args.json else rows:
+                updated = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['updated_at']))
+                print(f"{updated}  {row['session_id']:<38} {row['prompt_count']:>5} prompts  "
+                      f"{row['agent_name'] or '-':<12} {row['cwd'] or ''}")
+        elif args.recent or args.prefix:
+            rows = store.recent_prompts(args.recent or 50, session_id=args.session, since=since,
+                                        prefix=args.prefix)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            for row in [] if args.json else rows:
+                stamp = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['ts']))
+                prompt = row['prompt'].replace('\n', ' ')
+                print(f"{stamp}  {row['session_id'][:8]:<8}  {prompt[:120]}")
+        else:
+            parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Minimal JSON-over-Unix-socket request/response helpers.
+
+Used by the resident helper processes (hook daemon, TTS worker, LLM helper)
+so short-lived hook processes can hand work to a warm interpreter. Each
+connection carries exactly one request line and one response line, both
+compact JSON.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+RUN_DIR = Path('~/.claude/run').expanduser()
+
+
+def socket_path(name, env_var=None):
+    """
+    Return the socket path for a named helper.
+
+    Args:
+        name (str): Helper name, e.g. "hookd"
+        env_var (str): Optional environment variable overriding the path
+
+    Returns:
+        Path: Socket path under ~/.claude/run unless overridden
+    """
+    if env_var and os.getenv(env_var):
+        return Path(os.getenv(env_var)).expanduser()
+    return RUN_DIR / f"{name}.sock"
+
+
+def _recv_line(sock):
+    """Read bytes from a socket until the first newline."""
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b'\n'):
+            break
+    return b''.join(chunks)
+
+
+def request(path, message, timeout=5.0):
+    """
+    Send one JSON request to a helper and return its JSON response.
+
+    Raises:
+        OSError: If the helper is not running or the socket times out
+        ValueError: If the response is not valid JSON
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n')
+        data = _recv_line(sock)
+    finally:
+        sock.close()
+    if not data:
+        raise ValueError("Empty response from helper")
+    return json.loads(data)
+
+
+def is_running(path):
+    """Return True if something is accepting connections on the socket."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(0.5)
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def spawn_detached(argv, cwd=None):
+    """
+    Start a helper process detached from the calling hook.
+
+    The child gets its own session and no inherited stdio, so the hook can
+    exit immediately without waiting for (or killing) the helper.
+    """
+    return subprocess.Popen(
+        argv,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(path, handler, idle_timeout=None):
+    """
+    Serve JSON requests on a Unix socket until shut down or idle.
+
+    The handler receives the decoded request dict and returns a response
+    dict. A request of {"command": "shutdown"} stops the server; "ping"
+    answers without calling the handler.
+
+    Args:
+        path (Path): Socket path (a stale socket file is replaced)
+        handler (callable): Function of (request) -> response
+        idle_timeout (float): Seconds without requests before exiting
+
+    Returns:
+        bool: False if another instance is already serving on the path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        if is_running(path):
+            return False
+        path.unlink()
+
+    state = {'last_request': time.monotonic()}
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            state['last_request'] = time.monotonic()
+            command = None
+            try:
+                message = json.loads(_recv_line(self.request))
+            except (json.JSONDecodeError, ValueError):
+                response = {'error': 'invalid request'}
+            else:
+                command = message.get('command')
+                if command == 'ping':
+                    response = {'ok': True, 'pid': os.getpid()}
+                elif command == 'shutdown':
+                    response = {'ok': True}
+                else:
+                    try:
+                        response = handler(message)
+                    except Exception as e:
+                        response = {'error': str(e)}
+            try:
+                self.request.sendall(
+                    json.dumps(response, separators=(',', ':')).encode('utf-8') + b'\n')
+            except OSError:
+                pass
+            if command == 'shutdown':
+                # Only after replying: the process may exit as soon as serving stops
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    server = _Server(str(path), Handler)
+    os.chmod(path, 0o600)
+
+    if idle_timeout:
+        def watch_idle():
+            while True:
+                time.sleep(min(idle_timeout, 30))
+                if time.monotonic() - state['last_request'] > idle_timeout:
+                    server.shutdown()
+                    return
+        threading.Thread(target=watch_idle, daemon=True).start()
+
+    try:
+        server.serve_forever(poll_interval=0.5)
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    return True
@@ -0,0 +1,285 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+Transcript helpers for the Stop and SubagentStop hooks.
+
+export_transcript() converts a Claude Code transcript (.jsonl) into a JSON
+array file one line at a time, so memory stays bounded by the largest
+single message rather than the whole session.
+
+archive_increment() keeps one append-only archive per session under
+.claude/logs/transcripts/. Each Stop copies only the transcript bytes added
+since the previous Stop (tracked as a high-water byte offset) and records
+the turn in a small index, so the hook's I/O is proportional to the turn,
+not the session. Any turn can be rebuilt from the archive and index.
+
+Files per session in the archive directory:
+- <session_id>.jsonl        Archived transcript lines
+- <session_id>.index.jsonl  One record per turn: offsets into transcript and archive
+- <session_id>.state.json   High-water offset and turn counter
+- <session_id>.lock         Serializes Stop and SubagentStop for the session
+
+Usage:
+- ./transcript.py export <transcript.jsonl> <output.json> [--verbatim]
+- ./transcript.py turns <session_id>
+- ./transcript.py rebuild <session_id> --turn 12 -o turn12.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.eventlog import append_record, file_lock, iter_records
+
+INDENT = '  '
+ARCHIVE_DIR = Path('.claude/logs/transcripts')
+COPY_CHUNK = 1024 * 1024
+
+
+def _format_pretty(line):
+    """Re-encode one transcript line the way json.dump(..., indent=2) nests it."""
+    record = json.loads(line)
+    return INDENT + json.dumps(record, indent=2).replace('\n', '\n' + INDENT)
+
+
+def _format_verbatim(line):
+    """Copy one transcript line as-is after a cheap shape check."""
+    if line[:1] != b'{' or line[-1:] != b'}':
+        raise ValueError("Not a JSON object line")
+    return INDENT + line.decode('utf-8')
+
+
+def export_transcript(transcript_path, output_path, verbatim=False, start=0, end=None):
+    """
+    Stream a JSONL transcript into a JSON array file.
+
+    Args:
+        transcript_path (str): Source .jsonl transcript
+        output_path (Path): Destination .json file
+        verbatim (bool): Copy lines without re-parsing them (compact output,
+            shape-checked only) instead of pretty-printing each record
+        start (int): Byte offset to start reading at
+        end (int): Byte offset to stop reading at (default: end of file)
+
+    Returns:
+        int: Number of records written
+    """
+    fmt = _format_verbatim if verbatim else _format_pretty
+    count = 0
+    position = start
+    with open(transcript_path, 'rb') as src, open(output_path, 'w', encoding='utf-8') as out:
+        src.seek(start)
+        out.write('[')
+        for line in src:
+            position += len(line)
+            if end is not None and position > end:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                text = fmt(line)
+            except (ValueError, UnicodeDecodeError):
+                continue  # Skip invalid lines
+            out.write(',\n' if count else '\n')
+            out.write(text)
+            count += 1
+        out.write('\n]' if count else ']')
+    return count
+
+
+def _last_line_end(f, start, size):
+    """Return the offset just past the last newline in [start, size), or start."""
+    position = size
+    while position > start:
+        block = min(65536, position - start)
+        f.seek(position - block)
+        data = f.read(block)
+        newline = data.rfind(b'\n')
+        if newline != -1:
+            return position - block + newline + 1
+        position -= block
+    return start
+
+
+def _archive_paths(archive_dir, session_id):
+    """Return (archive, index, state, lock) paths for a session."""
+    archive_dir = Path(archive_dir)
+    return (archive_dir / f"{session_id}.jsonl",
+            archive_dir / f"{session_id}.index.jsonl",
+            archive_dir / f"{session_id}.state.json",
+            archive_dir / f"{session_id}.lock")
+
+
+def _read_state(state_path):
+    """Return the session's archiving state (offset and turn counter)."""
+    try:
+        with open(state_path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError, ValueError):
+        return {'offset': 0, 'turn': 0}
+
+
+def _write_state(state_path, state):
+    """Replace the state file atomically."""
+    tmp = state_path.with_name(f"{state_path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, state_path)
+
+
+def archive_increment(transcript_path, session_id, archive_dir=None, source='stop'):
+    """
+    Append transcript lines added since the last call to the session archive.
+
+    Only complete lines are copied; a partially written trailing line is
+    left for the next Stop. If the transcript shrank (rewritten by Claude
+    Code), archiving restarts from offset 0 and the turn is marked as a
+    reset so rebuilds start from there.
+
+    Args:
+        transcript_path (str): Claude Code transcript (.jsonl)
+        session_id (str): Session the transcript belongs to
+        archive_dir (Path): Defaults to .claude/logs/transcripts
+        source (str): Hook that recorded the turn ("stop" or "subagent_stop")
+
+    Returns:
+        dict: The index record written for this turn
+    """
+    archive_dir = Path(archive_dir if archive_dir is not None else ARCHIVE_DIR)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    archive_path, index_path, state_path, lock_path = _archive_paths(archive_dir, session_id)
+
+    with file_lock(lock_path):
+        state = _read_state(state_path)
+        offset = state.get('offset', 0)
+        reset = False
+
+        with open(transcript_path, 'rb') as src, open(archive_path, 'ab') as archive:
+            size = os.fstat(src.fileno()).st_size
+            if size < offset or state.get('transcript_path', transcript_path) != transcript_path:
+                offset, reset = 0, True
+            end = _last_line_end(src, offset, size)
+
+            archive_start = archive.tell()
+            src.seek(offset)
+            remaining = end - offset
+            while remaining > 0:
+                chunk = src.read(min(COPY_CHUNK, remaining))
+                if not chunk:
+                    break
+                archive.write(chunk)
+                remaining -= len(chunk)
+            archive_end = archive.tell()
+
+        entry = {
+            'turn': state.get('turn', 0) + 1,
+            'source': source,
+            'timestamp': datetime.now().isoformat(),
+            'transcript_offset': end,
+            'archive_start': archive_start,
+            'archive_end': archive_end,
+            'reset': reset,
+        }
+        append_record(index_path, entry)
+        _write_state(state_path, {
+            'transcript_path': transcript_path,
+            'offset': end,
+            'turn': entry['turn'],
+        })
+    return entry
+
+
+def read_index(session_id, archive_dir=None):
+    """Return the list of turn records for a session."""
+    _, index_path, _, _ = _archive_paths(archive_dir or ARCHIVE_DIR, session_id)
+    return list(iter_records(index_path))
+
+
+def rebuild_turn(session_id, turn, output_path, archive_dir=None, verbatim=False):
+    """
+    Rebuild the transcript as it was at the end of a turn.
+
+    Args:
+        session_id (str): Archived session
+        turn (int): Turn number from the index
+        output_path (Path): Destination JSON array file
+
+    Returns:
+        int: Number of records written
+    """
+    archive_dir = archive_dir or ARCHIVE_DIR
+    archive_path, _, _, _ = _archive_paths(archive_dir, session_id)
+    entries = read_index(session_id, archive_dir)
+
+    target = next((e for e in entries if e['turn'] == turn), None)
+    if target is None:
+        raise ValueError(f"Turn {turn} not found for session {session_id}")
+
+    # The transcript as of this turn starts at the most recent reset
+    epoch_start = 0
+    for entry in entries:
+        if entry['turn'] > turn:
+            break
+        if entry.get('reset'):
+            epoch_start = entry['archive_start']
+
+    return export_transcript(archive_path, output_path, verbatim=verbatim,
+                             start=epoch_start, end=target['archive_end'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transcript export tools')
+    sub = parser.add_subparsers(dest='command')
+    export = sub.add_parser('export', help='Convert a .jsonl transcript to a JSON array')
+    export.add_argument('transcript')
+    export.add_argument('output')
+    export.add_argument('--verbatim', action='store_true',
+                        help='Copy lines without re-parsing them')
+    turns = sub.add_parser('turns', help='List archived turns for a session')
+    turns.add_argument('session_id')
+    turns.add_argument('--archive-dir', default=str(ARCHIVE_DIR))
+    rebuild = sub.add_parser('rebuild', help='Rebuild the transcript at a given turn')
+    rebuild.add_argument('session_id')
+    rebuild.add_argument('--turn', type=int, help='Turn number (default: latest)')
+    rebuild.add_argument('-o', '--output', required=True)
+    rebuild.add_argument('--archive-dir', default=str(ARCHIVE_DIR))
+    rebuild.add_argument('--verbatim', action='store_true')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        count = export_transcript(args.transcript, Path(args.output), verbatim=args.verbatim)
+        print(f"Exported {count} records to {args.output}")
+    elif args.command == 'turns':
+        for entry in read_index(args.session_id, Path(args.archive_dir)):
+            print(f"turn {entry['turn']:>4}  {entry['timestamp']}  {entry['source']:<13} "
+                  f"+{entry['archive_end'] - entry['archive_start']} bytes"
+                  f"{'  (reset)' if entry.get('reset') else ''}")
+    elif args.command == 'rebuild':
+        turn = args.turn
+        if turn is None:
+            entries = read_index(args.session_id, Path(args.archive_dir))
+            if not entries:
+                print(f"No archived turns for session {args.session_id}")
+                sys.exit(1)
+            turn = entries[-1]['turn']
+        count = rebuild_turn(args.session_id, turn, Path(args.output),
+                             Path(args.archive_dir), verbatim=args.verbatim)
+        print(f"Rebuilt turn {turn}: {count} records written to {args.output}")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+On-disk cache of synthesized TTS audio.
+
+The hooks speak phrases from small fixed lists, so the same text is
+synthesized over and over. elevenlabs_tts.py and gemini_tts.py look up
+(engine, voice id, model, speed, text) here before calling the remote API
+and store what they synthesize, so repeat announcements play locally with
+no API round-trip or cost.
+
+Entries are plain audio files named by the hash of their key. A hit
+touches the file's mtime, and each store evicts least-recently-used entries
+once the cache exceeds its size bound.
+
+Usage:
+- ./audio_cache.py stats
+- ./audio_cache.py prewarm --engine elevenlabs [--voice bellab]
+- ./audio_cache.py prewarm --engine gemini --phrases phrases.txt
+- ./audio_cache.py clear
+
+Environment variables:
+- CLAUDE_TTS_CACHE_DIR: Cache directory (default ~/.claude/cache/tts)
+- CLAUDE_TTS_CACHE_MAX_MB: Size bound in megabytes (default 100)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+TTS_DIR = Path(__file__).resolve().parent
+HOOKS_DIR = TTS_DIR.parents[1]
+DEFAULT_CACHE_DIR = Path('~/.claude/cache/tts').expanduser()
+DEFAULT_MAX_MB = 100
+
+ENGINE_SCRIPTS = {
+    'elevenlabs': TTS_DIR / 'elevenlabs_tts.py',
+    'gemini': TTS_DIR / 'gemini_tts.py',
+}
+
+
+def cache_key(engine, voice_id, model, speed, text):
+    """Return the hex digest identifying one synthesized utterance."""
+    raw = json.dumps([engine, voice_id or 'default', model or '', float(speed or 1.0), text],
+                     separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """Size-bounded LRU directory of synthesized audio clips."""
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = Path(root or os.getenv('CLAUDE_TTS_CACHE_DIR') or DEFAULT_CACHE_DIR).expanduser()
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv('CLAUDE_TTS_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+    def path_for(self, key, ext='mp3'):
+        return self.root / f"{key}.{ext}"
+
+    def get(self, key, ext='mp3'):
+        """
+        Return the cached clip's path and mark it recently used, or None.
+
+        Returns:
+            Path: Audio file path, or None on a miss
+        """
+        path = self.path_for(key, ext)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def get_bytes(self, key, ext='mp3'):
+        """Return the cached clip's bytes, or None on a miss."""
+        path = self.get(key, ext)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key, data, ext='mp3'):
+        """Store a clip atomically, then evict to the size bound."""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self.path_for(key, ext)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self.evict()
+            return path
+        except OSError:
+            return None  # Caching is best-effort
+
+    def entries(self):
+        """Return [(mtime, size, path)] for every cached clip, oldest first."""
+        entries = []
+        try:
+            for entry in os.scandir(self.root):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+        except OSError:
+            pass
+        return sorted(entries)
+
+    def evict(self):
+        """Delete least-recently-used clips until the cache fits its bound."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        return total
+
+
+def default_phrases():
+    """Collect every fixed phrase the hooks announce."""
+    if str(HOOKS_DIR) not in sys.path:
+        sys.path.insert(0, str(HOOKS_DIR))
+    import notification
+    import stop
+
+    phrases = list(stop.get_completion_messages())
+    phrases += notification.get_notification_messages()
+    phrases.append("Subagent Complete")
+    phrases += [f"{count} subagents complete" for count in range(2, 6)]
+    engineer_name = os.getenv('ENGINEER_NAME', '').strip()
+    if engineer_name:
+        phrases.append(f"{engineer_name}, your agent needs your input")
+    return list(dict.fromkeys(phrases))
+
+
+def prewarm(engine, phrases, extra_args=()):
+    """
+    Synthesize phrases into the cache without playing them.
+
+    Runs the engine script with --no-play once per phrase that is not
+    cached yet (the script computes the cache key for its own voice/speed).
+
+    Returns:
+        tuple: (synthesized, failed)
+    """
+    script = ENGINE_SCRIPTS[engine]
+    runner = ['uv', 'run', '--script'] if shutil.which('uv') else [sys.executable]
+    synthesized = failed = 0
+    for phrase in phrases:
+        result = subprocess.run(runner + [str(script), '--no-play', *extra_args, phrase],
+                                capture_output=True, text=True)
+        if result.returncode == 0:
+            synthesized += 1
+        else:
+            failed += 1
+            print(f"failed: {phrase!r}: {result.stdout.strip()[-200:]}")
+    return synthesized, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthesized TTS audio cache')
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('stats', help='Show cache size and entry count')
+    sub.add_parser('clear', help='Delete every cached clip')
+    warm = sub.add_parser('prewarm', help='Synthesize the hook phrases ahead of time')
+    warm.add_argument('--engine', choices=sorted(ENGINE_SCRIPTS), default='elevenlabs')
+    warm.add_argument('--phrases', help='File with one phrase per line (default: hook phrases)')
+    warm.add_argument('--voice', help='Voice name passed to the engine script')
+    warm.add_argument('--speed', help='Speaking rate passed to the engine script (gemini)')
+    args = parser.parse_args()
+
+    cache = AudioCache()
+    if args.command == 'stats':
+        entries = cache.entries()
+        total = sum(size for _, size, _ in entries)
+        print(f"{cache.root}: {len(entries)} clips, {total / 1024 / 1024:.1f} MB "
+              f"of {cache.max_bytes / 1024 / 1024:.0f} MB")
+    elif args.command == 'clear':
+        for _, _, path in cache.entries():
+            path.unlink()
+        print(f"Cleared {cache.root}")
+    elif args.command == 'prewarm':
+        if args.phrases:
+            with open(args.phrases, encoding='utf-8') as f:
+                phrases = [line.strip() for line in f if line.strip()]
+        else:
+            phrases = default_phrases()
+        extra = []
+        if args.voice:
+            extra += ['--voice', args.voice]
+        if args.speed:
+            extra += ['--speed', args.speed]
+        synthesized, failed = prewarm(args.engine, phrases, extra)
+        print(f"Prewarmed {synthesized}/{len(phrases)} phrases for {args.engine}"
+              f"{f' ({failed} failed)' if failed else ''}")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
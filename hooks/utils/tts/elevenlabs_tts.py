@@ -4,14 +4,135 @@
 # dependencies = [
 #     "elevenlabs",
 #     "python-dotenv",
+#     "sounddevice",
 # ]
 # ///
 
 import argparse
 import os
 import sys
+import time
 from pathlib import Path
-from dotenv import load_dotenv
+
+from audio_cache import AudioCache, cache_key
+from pipeline import speak_pipelined, split_chunks
+
+MODEL_ID = "eleven_turbo_v2_5"
+STREAM_FORMAT = "pcm_24000"  # Raw PCM so playback can start on the first chunk
+DEFAULT_STREAM_VOICE_ID = "pNInz6obpgDQGcFmaJgB"  # Adam, first of the fallbacks
+
+# Voice ID mapping
+VOICE_MAPPING = {
+    'adam': 'pNInz6obpgDQGcFmaJgB',
+    'rachel': '21m00Tcm4TlvDq8ikWAM',
+    'domi': 'AZnzlk1XvdvUeBnXmlld',
+    'bella': 'EXAVITQu4vr4xnSDxMaL',
+    'arabella': 'aEO01A4wXwd1O8GPgGlF',
+    'bellab': 'cNYrMw9glwJZXR8RwbuR',
+}
+
+
+def load_env():
+    """Load .claude/.env (found by walking up from this script), else ./.env."""
+    from dotenv import load_dotenv
+
+    current = Path(__file__).parent
+    while current.name != ".claude" and current.parent != current:
+        current = current.parent
+    if current.name == ".claude":
+        claude_env = current / ".env"
+        if claude_env.exists():
+            load_dotenv(claude_env)
+        else:
+            load_dotenv()  # Fall back to current directory
+    else:
+        load_dotenv()  # Fall back to current directory
+
+
+def create_client(api_key):
+    """Build an ElevenLabs client; it keeps one pooled HTTP connection for its lifetime."""
+    from elevenlabs.client import ElevenLabs
+    return ElevenLabs(api_key=api_key)
+
+
+def synthesize(client, text, voice_id, output_format=None, **context):
+    """
+    Synthesize text in one request.
+
+    Args:
+        output_format (str): e.g. STREAM_FORMAT for raw PCM; the API default is MP3
+        context: previous_text / next_text for intonation across chunks
+
+    Returns:
+        bytes: The audio. convert() returns a lazy chunk iterator and API
+        errors surface while reading it, so it is collected here
+    """
+    if output_format:
+        context['output_format'] = output_format
+    return b"".join(client.text_to_speech.convert(
+        text=text, voice_id=voice_id, model_id=MODEL_ID, **context))
+
+
+def stream_and_play(client, text, voice_id, cache=None, key=None):
+    """
+    Synthesize with the streaming endpoint and play while downloading.
+
+    Returns:
+        dict: Timing metrics (also appended to the TTS metrics file), or
+        None if the stream failed before any audio was received
+    """
+    from streaming import StreamPlayer, pcm_to_wav, record_metrics
+
+    # elevenlabs>=2 renamed convert_as_stream() to stream()
+    stream = getattr(client.text_to_speech, 'stream', None) or client.text_to_speech.convert_as_stream
+    started = time.perf_counter()
+    try:
+        chunks = stream(text=text, voice_id=voice_id, model_id=MODEL_ID,
+                        output_format=STREAM_FORMAT)
+        pcm, metrics = StreamPlayer().play(chunks, started)
+    except Exception:
+        return None
+    if not pcm:
+        return None
+    if cache and 'error' not in metrics:
+        cache.put(key, pcm_to_wav(pcm), ext='wav')
+    return record_metrics('elevenlabs', metrics, voice_id=voice_id, chars=len(text), mode='stream')
+
+
+def resolve_voice(args):
+    """
+    Return the voice to use: --voice-id, --voice, then ELEVENLABS_VOICE.
+
+    Returns:
+        tuple: (voice_id or None for the default, voice_name)
+    """
+    if args.voice_id:
+        # Use specific voice ID from argument
+        return args.voice_id, f"custom ({args.voice_id})"
+    if args.voice:
+        # Use voice name from argument
+        return VOICE_MAPPING[args.voice], args.voice
+    env_voice = (os.getenv('ELEVENLABS_VOICE') or '').lower()
+    if env_voice in VOICE_MAPPING:
+        # Use voice from environment variable
+        return VOICE_MAPPING[env_voice], env_voice
+    if env_voice:
+        # Assume it's a custom voice ID
+        return env_voice, f"env custom ({env_voice})"
+    return None, "default"
+
+
+def play_cached(cache, key, no_play, play):
+    """Play a cached clip; returns False on a cache miss."""
+    cached = cache.get_bytes(key) if cache else None
+    if cached is None:
+        return False
+    if not no_play:
+        print("🔊 Playing cached audio...")
+        play(cached)
+    print("✅ Playback complete (cached)!")
+    return True
+
 
 def main():
     """
@@ -25,6 +146,8 @@ def main():
     - ./elevenlabs_tts.py "Your custom text"                 # Uses provided text with default voice
     - ./elevenlabs_tts.py "Text" --voice rachel              # Uses Rachel voice
     - ./elevenlabs_tts.py "Text" --voice-id pNInz6obpgDQGcFmaJgB # Uses specific voice ID
+    - ./elevenlabs_tts.py "Text" --no-play                   # Only synthesize into the audio cache
+    - ./elevenlabs_tts.py "Long text" --stream               # Start playing on the first audio chunk
 
     Available voice names: adam, rachel, domi, bella
     Environment variable: ELEVENLABS_VOICE (adam, rachel, domi, bella, or voice ID)
@@ -36,56 +159,33 @@ def main():
     - Stable production model
     - Cost-effective for high-volume usage
     - Voice selection via argument or environment variable
+    - Synthesized clips are cached on disk (see audio_cache.py), so repeated
+      phrases play without an API call
+    - --stream uses the streaming endpoint and plays through a ring buffer
+      as chunks arrive; time-to-first-audio is printed and appended to
+      ~/.claude/logs/tts_metrics.jsonl (see streaming.py)
+    - Without --stream, multi-sentence text is synthesized sentence by
+      sentence, the next sentence rendering while the current one plays
+      (see pipeline.py)
     """
 
-    # Load environment variables
-    # First try .claude/.env, then fall back to current directory .env
-    # Find the .claude directory by going up from the script location
-    current = Path(__file__).parent
-    while current.name != ".claude" and current.parent != current:
-        current = current.parent
-    if current.name == ".claude":
-        claude_env = current / ".env"
-        if claude_env.exists():
-            load_dotenv(claude_env)
-        else:
-            load_dotenv()  # Fall back to current directory
-    else:
-        load_dotenv()  # Fall back to current directory
-
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='ElevenLabs TTS with voice selection')
     parser.add_argument('text', nargs='*', help='Text to convert to speech')
     parser.add_argument('--voice', choices=['adam', 'rachel', 'domi', 'bella', 'arabella', 'bellab'],
                        help='Voice name to use')
     parser.add_argument('--voice-id', help='Specific voice ID to use')
+    parser.add_argument('--no-play', action='store_true', help='Synthesize into the audio cache without playing')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the audio cache')
+    parser.add_argument('--stream', action='store_true', help='Stream synthesis and play while downloading')
+    parser.add_argument('--no-pipeline', action='store_true', help='Synthesize multi-sentence text as one request')
+    parser.add_argument('--no-fallback', action='store_true',
+                       help='Fail instead of trying other voices (the provider layer fails over itself)')
     args = parser.parse_args()
 
-    # Get API key from environment
-    api_key = os.getenv('ELEVENLABS_API_KEY')
-    if not api_key:
-        print("❌ Error: ELEVENLABS_API_KEY not found in environment variables")
-        print("Please add your ElevenLabs API key to .env file:")
-        print("ELEVENLABS_API_KEY=your_api_key_here")
-        sys.exit(1)
-
-    # Voice ID mapping
-    voice_mapping = {
-        'adam': 'pNInz6obpgDQGcFmaJgB',
-        'rachel': '21m00Tcm4TlvDq8ikWAM',
-        'domi': 'AZnzlk1XvdvUeBnXmlld',
-        'bella': 'EXAVITQu4vr4xnSDxMaL',
-        'arabella': 'aEO01A4wXwd1O8GPgGlF',
-        'bellab': 'cNYrMw9glwJZXR8RwbuR',
-    }
-
     try:
-        from elevenlabs.client import ElevenLabs
         from elevenlabs.play import play
 
-        # Initialize client
-        client = ElevenLabs(api_key=api_key)
-
         print("🎙️  ElevenLabs Turbo v2.5 TTS")
         print("=" * 40)
 
@@ -96,43 +196,105 @@ def main():
             text = "The first move is what sets everything in motion."
 
         # Determine voice ID to use
-        voice_id = None
-        voice_name = "default"
-
-        if args.voice_id:
-            # Use specific voice ID from argument
-            voice_id = args.voice_id
-            voice_name = f"custom ({voice_id})"
-        elif args.voice:
-            # Use voice name from argument
-            voice_id = voice_mapping[args.voice]
-            voice_name = args.voice
-        elif os.getenv('ELEVENLABS_VOICE'):
-            # Use voice from environment variable
-            env_voice = os.getenv('ELEVENLABS_VOICE').lower()
-            if env_voice in voice_mapping:
-                voice_id = voice_mapping[env_voice]
-                voice_name = env_voice
-            else:
-                # Assume it's a custom voice ID
-                voice_id = env_voice
-                voice_name = f"env custom ({voice_id})"
+        voice_id, voice_name = resolve_voice(args)
 
         print(f"🎯 Text: {text}")
         print(f"🎤 Voice: {voice_name}")
+        cache = None if args.no_cache else AudioCache()
+        key = cache_key('elevenlabs', voice_id, MODEL_ID, 1.0, text)
+        if play_cached(cache, key, args.no_play, play):
+            return
+
+        # Cache hits need neither .env (python-dotenv) nor an API key. If
+        # .env picks the voice, the cache is checked again for that voice.
+        env_voice = os.getenv('ELEVENLABS_VOICE')
+        load_env()
+        if not (args.voice or args.voice_id) and os.getenv('ELEVENLABS_VOICE') != env_voice:
+            voice_id, voice_name = resolve_voice(args)
+            print(f"🎤 Voice: {voice_name} (from .env)")
+            key = cache_key('elevenlabs', voice_id, MODEL_ID, 1.0, text)
+            if play_cached(cache, key, args.no_play, play):
+                return
+        requested_voice_id = voice_id
+
+        api_key = os.getenv('ELEVENLABS_API_KEY')
+        if not api_key:
+            print("❌ Error: ELEVENLABS_API_KEY not found in environment variables")
+            print("Please add your ElevenLabs API key to .env file:")
+            print("ELEVENLABS_API_KEY=your_api_key_here")
+            sys.exit(1)
+
+        # Initialize client (cache hits never need one)
+        client = create_client(api_key)
+
+        if args.stream and not args.no_play:
+            cached_wav = cache.get_bytes(key, ext='wav') if cache else None
+            if cached_wav is not None:
+                from streaming import StreamPlayer, wav_to_pcm
+                pcm, rate = wav_to_pcm(cached_wav)
+                StreamPlayer(rate).play([pcm])
+                print("✅ Playback complete (cached)!")
+                return
+
+            print("🔊 Streaming...")
+            metrics = stream_and_play(client, text, voice_id or DEFAULT_STREAM_VOICE_ID, cache, key)
+            if metrics:
+                print(f"⏱️  First audio after {metrics['first_audio_ms']} ms "
+                      f"(first chunk {metrics['first_chunk_ms']} ms, total {metrics['total_ms']} ms)")
+                print("✅ Playback complete!")
+                return
+            print("⚠️  Streaming failed, falling back to full synthesis...")
+
         print("🔊 Generating and playing...")
+        started = time.perf_counter()
+
+        chunks = [text] if args.no_play or args.no_pipeline or not voice_id else split_chunks(text)
+        if len(chunks) > 1:
+            played = []
+
+            def synthesize_chunk(chunk, previous, following):
+                chunk_key = cache_key('elevenlabs', voice_id, MODEL_ID, 1.0, chunk)
+                cached = cache.get_bytes(chunk_key) if cache else None
+                if cached is not None:
+                    return cached
+                # Neighbouring sentences keep intonation continuous across chunks
+                context = {}
+                if previous:
+                    context['previous_text'] = previous
+                if following:
+                    context['next_text'] = following
+                audio = synthesize(client, chunk, voice_id, **context)
+                if cache:
+                    cache.put(chunk_key, audio)
+                return audio
+
+            def play_chunk(audio):
+                play(audio)
+                played.append(audio)
+
+            try:
+                from streaming import record_metrics
+                metrics = speak_pipelined(chunks, synthesize_chunk, play_chunk)
+                record_metrics('elevenlabs', metrics, voice_id=voice_id, chars=len(text), mode='pipeline')
+                print(f"⏱️  First audio after {metrics['first_audio_ms']:.0f} ms "
+                      f"({metrics['chunks']} sentences, total {metrics['total_ms']:.0f} ms)")
+                print("✅ Playback complete!")
+                return
+            except Exception as e:
+                if played:
+                    print(f"❌ Error: {e}")
+                    sys.exit(1)
+                # Nothing played yet: fall back to one request with voice fallbacks
 
         try:
             # Generate and play audio directly
             if voice_id:
                 # Use specified voice
                 try:
-                    audio = client.text_to_speech.convert(
-                        text=text,
-                        voice_id=voice_id,
-                        model_id="eleven_turbo_v2_5"
-                    )
+                    audio = synthesize(client, text, voice_id)
                 except Exception as e:
+                    if args.no_fallback:
+                        raise
                     print(f"⚠️  Specified voice failed ({voice_name}), trying fallbacks...")
                     voice_id = None
 
@@ -142,19 +304,15 @@ def main():
                     "pNInz6obpgDQGcFmaJgB",  # Adam
                     "21m00Tcm4TlvDq8ikWAM",  # Rachel
                     "AZnzlk1XvdvUeBnXmlld",  # Domi
-                    "EXAVITQu4vr4xnSDxMaL"   # Bella
-                    "aEO01A4wXwd1O8GPgGlF"   # arabella
-                    'cNYrMw9glwJZXR8RwbuR'   # bellab
+                    "EXAVITQu4vr4xnSDxMaL",  # Bella
+                    "aEO01A4wXwd1O8GPgGlF",  # arabella
+                    "cNYrMw9glwJZXR8RwbuR",  # bellab
                 ]
 
                 audio = None
                 for fallback_voice_id in common_voice_ids:
                     try:
-                        audio = client.text_to_speech.convert(
-                            text=text,
-                            voice_id=fallback_voice_id,
-                            model_id="eleven_turbo_v2_5"
-                        )
+                        audio = synthesize(client, text, fallback_voice_id)
                         break
                     except Exception as e:
                         continue
@@ -162,11 +320,21 @@ def main():
                 if audio is None:
                     raise Exception("No available voices found")
 
-            play(audio)
+            if cache and voice_id == requested_voice_id:
+                # Don't cache a fallback voice under the requested voice's key
+                cache.put(key, audio)
+            if not args.no_play:
+                from streaming import record_metrics
+                synth_ms = (time.perf_counter() - started) * 1000
+                play(audio)
+                record_metrics('elevenlabs', {'first_audio_ms': synth_ms,
+                                              'total_ms': (time.perf_counter() - started) * 1000},
+                               voice_id=voice_id, chars=len(text), mode='full')
             print("✅ Playback complete!")
 
         except Exception as e:
             print(f"❌ Error: {e}")
+            sys.exit(1)
 
 
     except ImportError:
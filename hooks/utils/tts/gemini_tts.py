@@ -11,9 +11,33 @@
 import argparse
 import os
 import sys
-import tempfile
 from pathlib import Path
-from dotenv import load_dotenv
+
+from audio_cache import AudioCache, cache_key
+from pipeline import speak_pipelined, split_chunks
+from playback import SAMPLE_RATE, Player
+
+MODEL_ID = "chirp3-hd"
+
+# Voice ID mapping for Chirp 3 HD voices
+VOICE_MAPPING = {
+    'aoede': 'en-US-Chirp3-HD-Aoede',
+    'puck': 'en-US-Chirp3-HD-Puck',
+    'charon': 'en-US-Chirp3-HD-Charon',
+    'kore': 'en-US-Chirp3-HD-Kore',
+    'fenrir': 'en-US-Chirp3-HD-Fenrir',
+    'leda': 'en-US-Chirp3-HD-Leda',
+    'orus': 'en-US-Chirp3-HD-Orus',
+    'zephyr': 'en-US-Chirp3-HD-Zephyr',
+    'sulafat': 'en-US-Chirp3-HD-Sulafat',
+}
+
+# Service account keys tried before Application Default Credentials
+CREDENTIALS_PATHS = [
+    "C:\\Users\\nitro\\.claude\\hooks\\utils\\tts\\gen-lang-client-0718398491-6186cfe2ae0c.local.json",
+    "/mnt/c/Users/nitro/.claude/hooks/utils/tts/gen-lang-client-0718398491-6186cfe2ae0c.local.json",
+    "/home/meckert/.claude/hooks/utils/tts/gen-lang-client-0718398491-6186cfe2ae0c.local.json"
+]
 
 # Fix Windows Unicode encoding issues
 if sys.platform == "win32":
@@ -70,6 +94,120 @@ def setup_google_credentials():
 
     return google_creds_path
 
+def load_env():
+    """Load .claude/.env (found by walking up from this script), else ./.env."""
+    from dotenv import load_dotenv
+
+    current = Path(__file__).parent
+    while current.name != ".claude" and current.parent != current:
+        current = current.parent
+    if current.name == ".claude":
+        claude_env = current / ".env"
+        if claude_env.exists():
+            load_dotenv(claude_env)
+        else:
+            load_dotenv()  # Fall back to current directory
+    else:
+        load_dotenv()  # Fall back to current directory
+
+def create_client():
+    """
+    Build a Text-to-Speech client from the first service account key found,
+    falling back to Application Default Credentials.
+
+    The client holds one gRPC channel and its credentials object caches the
+    OAuth access token until it expires.
+    """
+    from google.cloud import texttospeech
+    from google.oauth2 import service_account
+
+    for cred_path in CREDENTIALS_PATHS:
+        try:
+            if os.path.exists(cred_path):
+                credentials = service_account.Credentials.from_service_account_file(cred_path)
+                client = texttospeech.TextToSpeechClient(credentials=credentials)
+                print(f"✅ Using credentials from: {cred_path}")
+                return client
+        except Exception:
+            continue
+    return texttospeech.TextToSpeechClient()
+
+def synthesize(client, text, voice_id, speed=1.0):
+    """
+    Synthesize text in one request.
+
+    Returns:
+        bytes: LINEAR16 WAV at SAMPLE_RATE, which decodes in memory without
+        an MP3 codec and at the mixer's native rate
+    """
+    from google.cloud import texttospeech
+
+    response = client.synthesize_speech(
+        input=texttospeech.SynthesisInput(text=text),
+        voice=texttospeech.VoiceSelectionParams(language_code="en-US", name=voice_id),
+        audio_config=texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+            sample_rate_hertz=SAMPLE_RATE,
+            speaking_rate=speed
+        )
+    )
+    return response.audio_content
+
+def apply_env_defaults(args):
+    """Fill in --voice/--voice-id and --speed from the environment when not given."""
+    if not args.voice and not args.voice_id:
+        env_voice = os.getenv('GEMINI_VOICE')
+        if env_voice:
+            if env_voice.lower() in VOICE_MAPPING:
+                args.voice = env_voice.lower()
+            else:
+                args.voice_id = env_voice
+
+    if args.speed is None:
+        env_speed = os.getenv('GEMINI_SPEED')
+        if env_speed:
+            try:
+                args.speed = float(env_speed)
+            except ValueError:
+                print(f"⚠️  Invalid GEMINI_SPEED value: {env_speed}, using default 1.0")
+                args.speed = 1.0
+        else:
+            args.speed = 1.0
+
+    # Validate speed parameter
+    if not (0.25 <= args.speed <= 2.0):
+        print("❌ Error: Speed must be between 0.25 and 2.0")
+        sys.exit(1)
+
+def resolve_voice(args):
+    """
+    Return the voice to use.
+
+    Returns:
+        tuple: (voice_id, voice_name)
+    """
+    if args.voice_id:
+        # Use specific voice ID from argument or environment
+        return args.voice_id, f"custom ({args.voice_id})"
+    if args.voice:
+        # Use voice name from argument or environment
+        return VOICE_MAPPING[args.voice], args.voice
+    # Default to Sulafat voice as requested
+    return VOICE_MAPPING['sulafat'], 'sulafat'
+
+def play_cached(cache, key, no_play):
+    """Play a cached clip; returns False on a cache miss."""
+    cached_path = cache.get(key, ext='wav') if cache else None
+    if cached_path is None:
+        return False
+    if not no_play:
+        print("🔊 Playing cached audio...")
+        player = Player()
+        player.play_file(cached_path)
+        player.close()
+    print("✅ Playback complete (cached)!")
+    return True
+
 def main():
     """
     Google Gemini Chirp 3 HD TTS Script
@@ -83,6 +221,7 @@ def main():
     - ./gemini_tts.py "Text" --voice sulafat                 # Uses Sulafat voice
     - ./gemini_tts.py "Text" --voice-id en-US-Chirp3-HD-Kore # Uses specific voice ID
     - ./gemini_tts.py "Text" --speed 1.5                     # Uses 1.5x speaking rate
+    - ./gemini_tts.py "Text" --no-play                       # Only synthesize into the audio cache
 
     Available voice names: aoede, puck, charon, kore, fenrir, leda, orus, zephyr, sulafat
     Environment variables (set in .claude/.env or .env file):
@@ -100,23 +239,12 @@ def main():
     - Adjustable speaking rate (0.25x to 2.0x speed)
     - Support for 40+ languages
     - Cost-effective for production use
+    - Synthesized clips are cached on disk (see audio_cache.py), so repeated
+      phrases play without an API call
+    - Multi-sentence text is synthesized sentence by sentence, the next
+      sentence rendering while the current one plays (see pipeline.py)
     """
 
-    # Load environment variables from .env files
-    # First try .claude/.env, then fall back to current directory .env
-    # Find the .claude directory by going up from the script location
-    current = Path(__file__).parent
-    while current.name != ".claude" and current.parent != current:
-        current = current.parent
-    if current.name == ".claude":
-        claude_env = current / ".env"
-        if claude_env.exists():
-            load_dotenv(claude_env)
-        else:
-            load_dotenv()  # Fall back to current directory
-    else:
-        load_dotenv()  # Fall back to current directory
-
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Google Gemini Chirp 3 HD TTS with voice selection')
     parser.add_argument('text', nargs='*', help='Text to convert to speech')
@@ -125,92 +253,17 @@ def main():
     parser.add_argument('--voice-id', help='Specific voice ID to use (e.g., en-US-Chirp3-HD-Sulafat)')
     parser.add_argument('--speed', type=float, help='Speaking rate (0.25-2.0, default: 1.0 or GEMINI_SPEED env var)')
     parser.add_argument('--stdin', action='store_true', help='Read text from stdin instead of arguments')
+    parser.add_argument('--no-play', action='store_true', help='Synthesize into the audio cache without playing')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the audio cache')
+    parser.add_argument('--no-pipeline', action='store_true', help='Synthesize multi-sentence text as one request')
     args = parser.parse_args()
 
-    # Apply environment variable defaults if arguments not provided
-    if not args.voice and not args.voice_id:
-        env_voice = os.getenv('GEMINI_VOICE')
-        if env_voice:
-            if env_voice.lower() in ['aoede', 'puck', 'charon', 'kore', 'fenrir', 'leda', 'orus', 'zephyr', 'sulafat']:
-                args.voice = env_voice.lower()
-            else:
-                args.voice_id = env_voice
-
-    if args.speed is None:
-        env_speed = os.getenv('GEMINI_SPEED')
-        if env_speed:
-            try:
-                args.speed = float(env_speed)
-            except ValueError:
-                print(f"⚠️  Invalid GEMINI_SPEED value: {env_speed}, using default 1.0")
-                args.speed = 1.0
-        else:
-            args.speed = 1.0
-
-    # Validate speed parameter
-    if not (0.25 <= args.speed <= 2.0):
-        print("❌ Error: Speed must be between 0.25 and 2.0")
-        sys.exit(1)
-
-    # Set up Google Cloud credentials for both WSL and Windows environments
-    google_creds_path = setup_google_credentials()
-
-    # Check for required authentication
-    if not google_creds_path and not os.getenv('GOOGLE_CLOUD_PROJECT'):
-        # Check if we can use Application Default Credentials
-        try:
-            import google.auth
-            credentials, project = google.auth.default()
-        except Exception:
-            print("❌ Error: Google Cloud authentication not configured")
-            print("Please set up authentication by either:")
-            print("1. Setting GOOGLE_APPLICATION_CREDENTIALS environment variable to your service account key file")
-            print("2. Running 'gcloud auth application-default login' for Application Default Credentials")
-            print("3. Setting GOOGLE_CLOUD_PROJECT if using other authentication methods")
-            print("See: https://cloud.google.com/docs/authentication/getting-started")
-            sys.exit(1)
-
-    # Voice ID mapping for Chirp 3 HD voices
-    voice_mapping = {
-        'aoede': 'en-US-Chirp3-HD-Aoede',
-        'puck': 'en-US-Chirp3-HD-Puck',
-        'charon': 'en-US-Chirp3-HD-Charon',
-        'kore': 'en-US-Chirp3-HD-Kore',
-        'fenrir': 'en-US-Chirp3-HD-Fenrir',
-        'leda': 'en-US-Chirp3-HD-Leda',
-        'orus': 'en-US-Chirp3-HD-Orus',
-        'zephyr': 'en-US-Chirp3-HD-Zephyr',
-        'sulafat': 'en-US-Chirp3-HD-Sulafat',
-    }
+    # Settings left to GEMINI_VOICE / GEMINI_SPEED are resolved again once
+    # .env is loaded, in case it sets them
+    given = argparse.Namespace(**vars(args))
+    apply_env_defaults(args)
 
     try:
-        from google.cloud import texttospeech
-        import pygame
-        from google.oauth2 import service_account
-
-        # Initialize client with explicit credentials
-        # Try multiple credential paths
-        credentials_paths = [
-            "C:\\Users\\nitro\\.claude\\hooks\\utils\\tts\\gen-lang-client-0718398491-6186cfe2ae0c.local.json",
-            "/mnt/c/Users/nitro/.claude/hooks/utils/tts/gen-lang-client-0718398491-6186cfe2ae0c.local.json",
-            "/home/meckert/.claude/hooks/utils/tts/gen-lang-client-0718398491-6186cfe2ae0c.local.json"
-        ]
-
-        client = None
-        for cred_path in credentials_paths:
-            try:
-                if os.path.exists(cred_path):
-                    credentials = service_account.Credentials.from_service_account_file(cred_path)
-                    client = texttospeech.TextToSpeechClient(credentials=credentials)
-                    print(f"✅ Using credentials from: {cred_path}")
-                    break
-            except Exception as e:
-                continue
-
-        if not client:
-            # Fall back to default client
-            client = texttospeech.TextToSpeechClient()
-
         print("🎙️  Google Gemini Chirp 3 HD TTS")
         print("=" * 40)
 
@@ -237,27 +290,61 @@ def main():
             text = "The first move is what sets everything in motion."
 
         # Determine voice ID to use
-        voice_id = None
-        voice_name = "default"
-
-        if args.voice_id:
-            # Use specific voice ID from argument or environment
-            voice_id = args.voice_id
-            voice_name = f"custom ({voice_id})"
-        elif args.voice:
-            # Use voice name from argument or environment
-            voice_id = voice_mapping[args.voice]
-            voice_name = args.voice
-        else:
-            # Default to Sulafat voice as requested
-            voice_id = voice_mapping['sulafat']
-            voice_name = 'sulafat'
+        voice_id, voice_name = resolve_voice(args)
 
         print(f"🎯 Text: {text}")
         print(f"🎤 Voice: {voice_name}")
         print(f"⚡ Speed: {args.speed}x")
+
+        # Repeated phrases play from the audio cache without building a client
+        cache = None if args.no_cache else AudioCache()
+        key = cache_key('gemini', voice_id, MODEL_ID, args.speed, text)
+        if play_cached(cache, key, args.no_play):
+            return
+
+        # .env (python-dotenv), credentials, the SDK and pygame (see
+        # playback.py) load only past the cache check
+        env_settings = (os.getenv('GEMINI_VOICE'), os.getenv('GEMINI_SPEED'))
+        load_env()
+        from_env = not (given.voice or given.voice_id) or given.speed is None
+        if from_env and (os.getenv('GEMINI_VOICE'), os.getenv('GEMINI_SPEED')) != env_settings:
+            args = given
+            apply_env_defaults(args)
+            voice_id, voice_name = resolve_voice(args)
+            print(f"🎤 Voice: {voice_name} (from .env)")
+            print(f"⚡ Speed: {args.speed}x")
+            key = cache_key('gemini', voice_id, MODEL_ID, args.speed, text)
+            if play_cached(cache, key, args.no_play):
+                return
+
+        # Set up Google Cloud credentials for both WSL and Windows environments
+        google_creds_path = setup_google_credentials()
+
+        # Check for required authentication
+        if not google_creds_path and not os.getenv('GOOGLE_CLOUD_PROJECT'):
+            # Check if we can use Application Default Credentials
+            try:
+                import google.auth
+                credentials, project = google.auth.default()
+            except Exception:
+                print("❌ Error: Google Cloud authentication not configured")
+                print("Please set up authentication by either:")
+                print("1. Setting GOOGLE_APPLICATION_CREDENTIALS environment variable to your service account key file")
+                print("2. Running 'gcloud auth application-default login' for Application Default Credentials")
+                print("3. Setting GOOGLE_CLOUD_PROJECT if using other authentication methods")
+                print("See: https://cloud.google.com/docs/authentication/getting-started")
+                sys.exit(1)
+
+        from google.cloud import texttospeech
+
+        # Initialize client with explicit credentials
+        client = create_client()
+
         print("🔊 Generating and playing...")
 
+        # One mixer for the primary and the fallback voice
+        player = Player()
+
         try:
             # Set up the synthesis input
             synthesis_input = texttospeech.SynthesisInput(text=text)
@@ -268,12 +355,48 @@ def main():
                 name=voice_id
             )
 
-            # Set up audio configuration
+            # Set up audio configuration; LINEAR16 (WAV) decodes in memory
+            # without an MP3 codec and at the mixer's native rate
             audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
+                audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+                sample_rate_hertz=SAMPLE_RATE,
                 speaking_rate=args.speed
             )
 
+            chunks = [text] if args.no_play or args.no_pipeline else split_chunks(text)
+            played = []
+            if len(chunks) > 1:
+                def synthesize_chunk(chunk, previous, following):
+                    chunk_key = cache_key('gemini', voice_id, MODEL_ID, args.speed, chunk)
+                    cached = cache.get_bytes(chunk_key, ext='wav') if cache else None
+                    if cached is not None:
+                        return cached
+                    audio = synthesize(client, chunk, voice_id, args.speed)
+                    if cache:
+                        cache.put(chunk_key, audio, ext='wav')
+                    return audio
+
+                def play_chunk(audio):
+                    player.play_bytes(audio)
+                    played.append(audio)
+
+                try:
+                    from streaming import record_metrics
+                    metrics = speak_pipelined(chunks, synthesize_chunk, play_chunk)
+                    record_metrics('gemini', metrics, voice_id=voice_id, chars=len(text), mode='pipeline')
+                    print(f"⏱️  First audio after {metrics['first_audio_ms']:.0f} ms "
+                          f"({metrics['chunks']} sentences, total {metrics['total_ms']:.0f} ms)")
+                    print("✅ Playback complete!")
+                    return
+                except Exception:
+                    # Retry as one request (and voice fallback), but only for the
+                    # sentences that have not played yet
+                    if played:
+                        rest = " ".join(chunks[len(played):])
+                        print(f"⚠️  Sentence {len(played) + 1} of {len(chunks)} failed, "
+                              "retrying the rest as one request...")
+                        synthesis_input = texttospeech.SynthesisInput(text=rest)
+
             # Generate speech
             response = client.synthesize_speech(
                 input=synthesis_input,
@@ -281,39 +404,25 @@ def main():
                 audio_config=audio_config
             )
 
-            # Create temporary file for audio playback
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_audio:
-                temp_audio.write(response.audio_content)
-                temp_audio_path = temp_audio.name
-
-            # Initialize pygame mixer for audio playback
-            pygame.mixer.init()
-            pygame.mixer.music.load(temp_audio_path)
-            pygame.mixer.music.play()
-
-            # Wait for playback to complete
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)
-
-            # Clean up
-            pygame.mixer.quit()
-            try:
-                os.unlink(temp_audio_path)
-            except (OSError, PermissionError):
-                # File might still be in use, try again after a short delay
-                pygame.time.wait(500)
-                try:
-                    os.unlink(temp_audio_path)
-                except (OSError, PermissionError):
-                    pass  # Leave the temp file if we can't delete it
+            if cache and not played:
+                # The audio covers the whole text only if no sentence played
+                cache.put(key, response.audio_content, ext='wav')
+            if args.no_play:
+                print("✅ Cached without playing")
+                return
 
+            player.play_bytes(response.audio_content)
             print("✅ Playback complete!")
 
         except Exception as e:
             error_msg = str(e)
+            if args.no_play:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
             if "permission" in error_msg.lower() or "authentication" in error_msg.lower():
                 print("❌ Authentication error. Please check your Google Cloud credentials.")
                 print("Make sure you have Text-to-Speech API enabled and proper permissions.")
+                sys.exit(1)
             elif "not found" in error_msg.lower() and voice_id:
                 print(f"⚠️  Voice '{voice_name}' not found. Trying default voice...")
                 # Retry with default voice
@@ -328,30 +437,16 @@ def main():
                         voice=voice,
                         audio_config=audio_config
                     )
-                    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_audio:
-                        temp_audio.write(response.audio_content)
-                        temp_audio_path = temp_audio.name
-
-                    pygame.mixer.music.load(temp_audio_path)
-                    pygame.mixer.music.play()
-                    while pygame.mixer.music.get_busy():
-                        pygame.time.wait(100)
-
-                    # Clean up
-                    pygame.mixer.quit()
-                    try:
-                        os.unlink(temp_audio_path)
-                    except (OSError, PermissionError):
-                        pygame.time.wait(500)
-                        try:
-                            os.unlink(temp_audio_path)
-                        except (OSError, PermissionError):
-                            pass
+                    player.play_bytes(response.audio_content)
                     print("✅ Playback complete with fallback voice!")
                 except Exception as fallback_error:
                     print(f"❌ Error with fallback voice: {fallback_error}")
+                    sys.exit(1)
             else:
                 print(f"❌ Error: {e}")
+                sys.exit(1)
+        finally:
+            player.close()
 
     except ImportError as import_error:
         missing_package = str(import_error).split("'")[1] if "'" in str(import_error) else "required package"
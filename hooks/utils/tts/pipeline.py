@@ -0,0 +1,126 @@
+"""
+Sentence-level pipelined synthesis for multi-sentence TTS text.
+
+The TTS output styles speak a paragraph at the end of each response.
+Synthesizing it as one request means nothing plays until the whole
+paragraph is rendered. speak_pipelined() splits the text into sentence
+chunks, synthesizes chunk N+1 on a worker thread while chunk N plays, and
+so starts speaking after only the first chunk's synthesis time.
+
+Prosody at the boundaries: chunks are whole sentences (or clause-sized
+pieces of very long sentences) and keep their own punctuation, so each
+ends with natural final intonation. Engines that accept surrounding
+context (ElevenLabs previous_text/next_text) receive the neighbouring
+chunks.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+FIRST_CHUNK_MIN = 20   # Avoid a tiny first request ("Done.") followed by a gap
+CHUNK_MIN = 60         # Merge shorter sentences with the next one
+CHUNK_MAX = 300        # Split longer sentences at clause boundaries
+
+# Sentence end: terminal punctuation (optionally closing quotes/brackets)
+# followed by whitespace and an uppercase letter, digit or quote. Common
+# abbreviations are rejected below.
+SENTENCE_END = re.compile(r'(?<=[.!?])["\')\]]*\s+(?=["\'(\[]?[A-Z0-9])')
+ABBREVIATIONS = re.compile(r'\b(?:e\.g|i\.e|etc|vs|Mr|Mrs|Ms|Dr|St|No|approx)\.$', re.IGNORECASE)
+CLAUSE_END = re.compile(r'(?<=[,;:])\s+')
+
+
+def _sentences(text):
+    """Split text into sentences, keeping abbreviations intact."""
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        candidate = text[start:match.start()]
+        if ABBREVIATIONS.search(candidate):
+            continue
+        sentences.append(candidate.strip())
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return [s for s in sentences if s]
+
+
+def _split_long(sentence):
+    """Break an over-long sentence at clause boundaries."""
+    if len(sentence) <= CHUNK_MAX:
+        return [sentence]
+    pieces, current = [], ''
+    for clause in CLAUSE_END.split(sentence):
+        if current and len(current) + len(clause) + 1 > CHUNK_MAX:
+            pieces.append(current)
+            current = clause
+        else:
+            current = f"{current} {clause}" if current else clause
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_chunks(text):
+    """
+    Split text into synthesis chunks.
+
+    Returns:
+        list: Sentence-sized chunks, short ones merged forward
+    """
+    chunks = []
+    current = ''
+    for sentence in _sentences(' '.join(text.split())):
+        for piece in _split_long(sentence):
+            if current and len(current) + len(piece) + 1 > CHUNK_MAX:
+                chunks.append(current)
+                current = ''
+            current = f"{current} {piece}" if current else piece
+            minimum = FIRST_CHUNK_MIN if not chunks else CHUNK_MIN
+            if len(current) >= minimum:
+                chunks.append(current)
+                current = ''
+    if current:
+        if chunks and len(current) < CHUNK_MIN and len(chunks[-1]) + len(current) < CHUNK_MAX:
+            chunks[-1] = f"{chunks[-1]} {current}"
+        else:
+            chunks.append(current)
+    return chunks
+
+
+def speak_pipelined(chunks, synthesize, play):
+    """
+    Synthesize chunk N+1 while chunk N plays.
+
+    Args:
+        chunks (list): Text chunks from split_chunks()
+        synthesize (callable): (chunk, previous_chunk, next_chunk) -> audio
+        play (callable): audio -> None, blocking until playback finishes
+
+    Returns:
+        dict: {"chunks", "first_audio_ms", "total_ms"}
+
+    Raises:
+        Exception: Whatever synthesize() raised; chunks already played stay played
+    """
+    started = time.perf_counter()
+    first_audio_ms = None
+
+    def job(i):
+        previous = chunks[i - 1] if i > 0 else None
+        following = chunks[i + 1] if i + 1 < len(chunks) else None
+        return synthesize(chunks[i], previous, following)
+
+    with ThreadPoolExecutor(max_workers=1) as worker:
+        pending = worker.submit(job, 0)
+        for i in range(len(chunks)):
+            audio = pending.result()
+            if i + 1 < len(chunks):
+                pending = worker.submit(job, i + 1)
+            if first_audio_ms is None:
+                first_audio_ms = (time.perf_counter() - started) * 1000
+            play(audio)
+
+    return {'chunks': len(chunks), 'first_audio_ms': first_audio_ms,
+            'total_ms': (time.perf_counter() - started) * 1000}
@@ -0,0 +1,67 @@
+"""
+In-memory audio playback for the TTS scripts.
+
+Clips are decoded straight from bytes (WAV/LINEAR16 from Google TTS) into a
+pygame Sound, so nothing touches the disk. The mixer is opened once at the
+synthesis sample rate and stays open across utterances (primary and
+fallback voice, pipelined sentences, a resident worker). Completion is
+awaited on a threading.Event for the clip's known duration instead of
+polling get_busy() every 100 ms; stop() wakes the wait early.
+"""
+
+import io
+import threading
+
+SAMPLE_RATE = 24000  # Chirp 3 HD native rate; request LINEAR16 at this rate
+TAIL_CHECK = 0.01    # Seconds between checks while the device drains
+
+
+class Player:
+    """A lazily opened, reusable pygame mixer."""
+
+    def __init__(self, frequency=SAMPLE_RATE, channels=1):
+        self.frequency = frequency
+        self.channels = channels
+        self._stop = threading.Event()
+        self._pygame = None
+
+    def _mixer(self):
+        if self._pygame is None:
+            import pygame
+            self._pygame = pygame
+        if not self._pygame.mixer.get_init():
+            self._pygame.mixer.init(frequency=self.frequency, size=-16, channels=self.channels)
+        return self._pygame.mixer
+
+    def open(self):
+        """Open the mixer now instead of on the first clip."""
+        self._mixer()
+
+    def play_bytes(self, data):
+        """Play an in-memory clip (WAV, or OGG/MP3 where SDL_mixer supports it)."""
+        self._play(self._mixer().Sound(file=io.BytesIO(data)))
+
+    def play_file(self, path):
+        """Play a clip from disk, e.g. an audio cache entry."""
+        self._play(self._mixer().Sound(file=str(path)))
+
+    def _play(self, sound):
+        """Start a sound and block until it has finished or stop() is called."""
+        self._stop.clear()
+        channel = sound.play()
+        if channel is None:
+            return
+        if self._stop.wait(sound.get_length()):
+            channel.stop()
+            return
+        # The device may still be draining its last buffer
+        while channel.get_busy() and not self._stop.wait(TAIL_CHECK):
+            pass
+
+    def stop(self):
+        """Interrupt the current clip."""
+        self._stop.set()
+
+    def close(self):
+        if self._pygame is not None and self._pygame.mixer.get_init():
+            self._pygame.mixer.quit()
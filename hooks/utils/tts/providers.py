@@ -0,0 +1,378 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+TTS provider selection with health tracking and failover.
+
+A provider is one engine script with one voice (e.g. "elevenlabs:bellab",
+"gemini:sulafat"). Every announcement goes through speak_with_failover(),
+which:
+- skips providers that are not configured (no API key / credentials /
+  script), using the same rules the old notification.get_tts_script_path()
+  used
+- skips engines whose circuit breaker is open: after FAILURE_THRESHOLD
+  consecutive failed announcements an engine and all its voices are
+  benched for a cooldown that doubles on each re-trip (up to COOLDOWN_MAX);
+  after the cooldown one trial request is let through. Within one
+  announcement an engine that failed is not retried with another voice,
+  since the usual causes (bad key, network, quota) are engine-wide
+- tries the rest in configured priority order, except that a provider
+  measurably slower than the fastest one (by SLOW_FACTOR) is demoted
+  behind the others. Speed is an EWMA of milliseconds per character spoken
+  (wall time of synthesis plus playback, normalized so short and long
+  phrases compare fairly). Priority is kept otherwise so the preferred voice
+  is used whenever it is healthy and not slow.
+
+ElevenLabs and Gemini providers are spoken through the resident TTS worker
+(tts_worker.py) when it is running, which keeps authenticated clients,
+connections and the mixer warm between announcements. When it is not,
+the announcement runs the engine script as before and the worker is
+started in the background for the next one. The worker is not used for
+scripts in the Windows home directory, which run through the Windows
+uv.exe: the Unix-socket worker would run on the Linux side rather than
+where those scripts play audio.
+
+Latency stats are kept per provider and breaker state per engine, in a
+small JSON state file shared by every process and updated under a lock.
+
+Usage:
+- ./providers.py                     # Show providers, health and ranking
+- ./providers.py --say "Text"        # Speak through the selection logic
+- ./providers.py --reset             # Forget all stats
+
+Environment variables:
+- CLAUDE_TTS_STATS: Stats file (default ~/.claude/cache/tts/provider_stats.json)
+- CLAUDE_TTS_UV: uv launcher used to run the engine scripts (default: the
+  Windows uv.exe for scripts in the Windows home directory, otherwise uv
+  on PATH)
+- CLAUDE_TTS_WORKER: Set to 0 to always run the engine scripts
+- ELEVENLABS_VOICE / GEMINI_VOICE: Preferred voice per engine
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+TTS_DIR = Path(__file__).resolve().parent
+HOOKS_DIR = TTS_DIR.parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.eventlog import file_lock
+from utils.sockserve import request, socket_path, spawn_detached
+
+DEFAULT_STATS_FILE = Path('~/.claude/cache/tts/provider_stats.json').expanduser()
+
+# The announcements have always gone through the Windows uv.exe and the
+# ElevenLabs script in the Windows home directory when running under WSL
+WINDOWS_UV = "/mnt/c/Users/nitro/.local/bin/uv.exe"
+WINDOWS_SCRIPTS = {
+    'elevenlabs_tts.py': "C:\\Users\\nitro\\elevenlabs_tts.py",
+}
+
+ELEVENLABS_VOICES = ['bellab', 'adam', 'rachel', 'domi', 'bella', 'arabella']
+GEMINI_VOICES = ['sulafat', 'charon']
+
+FAILURE_THRESHOLD = 3
+COOLDOWN = 60.0
+COOLDOWN_MAX = 900.0
+EWMA_ALPHA = 0.3
+SLOW_FACTOR = 1.5       # Demote providers this much slower than the fastest
+MIN_CHARS = 20          # Floor for the per-character normalization
+SPEAK_TIMEOUT = 30
+WORKER_ENGINES = ('elevenlabs', 'gemini')
+WORKER_RESPAWN = 60     # Seconds between attempts to start the worker
+
+Provider = namedtuple('Provider', ['name', 'engine', 'voice', 'script', 'priority'])
+
+_worker_spawned_at = 0.0
+
+
+def _script_location(script):
+    """Return the path the launcher should run for an engine script."""
+    if os.path.exists(WINDOWS_UV) and not os.getenv('CLAUDE_TTS_UV') and script in WINDOWS_SCRIPTS:
+        return WINDOWS_SCRIPTS[script]
+    return str(TTS_DIR / script)
+
+
+def _is_windows_script(location):
+    return location in WINDOWS_SCRIPTS.values()
+
+
+def _launcher(location=None):
+    """Return the argv prefix that runs the engine script at location."""
+    override = os.getenv('CLAUDE_TTS_UV')
+    if override:
+        return [override, 'run', '--script']
+    if location is not None and _is_windows_script(location):
+        return [WINDOWS_UV, 'run', '--script']
+    return ['uv', 'run', '--script'] if shutil.which('uv') else [sys.executable]
+
+
+def _engine_configured(engine, script):
+    """Mirror the old get_tts_script_path() availability rules."""
+    if script in WINDOWS_SCRIPTS and os.path.exists(WINDOWS_UV):
+        return True  # Credentials live in the Windows-side .env
+    if not (TTS_DIR / script).exists():
+        return False
+    if engine == 'elevenlabs':
+        return bool(os.getenv('ELEVENLABS_API_KEY'))
+    if engine == 'gemini':
+        return bool(os.getenv('GOOGLE_APPLICATION_CREDENTIALS') or os.getenv('GOOGLE_CLOUD_PROJECT'))
+    if engine == 'openai':
+        return bool(os.getenv('OPENAI_API_KEY'))
+    return True  # pyttsx3 needs no key
+
+
+def _preferred_first(voices, preferred):
+    preferred = (preferred or '').lower()
+    return ([preferred] if preferred in voices else []) + [v for v in voices if v != preferred]
+
+
+def configured_providers():
+    """
+    Return every usable provider in priority order.
+
+    Priority: ElevenLabs voices > Gemini voices > OpenAI > pyttsx3, with each
+    engine's preferred voice first.
+    """
+    candidates = []
+    for voice in _preferred_first(ELEVENLABS_VOICES, os.getenv('ELEVENLABS_VOICE')):
+        candidates.append(('elevenlabs', voice, 'elevenlabs_tts.py'))
+    for voice in _preferred_first(GEMINI_VOICES, os.getenv('GEMINI_VOICE')):
+        candidates.append(('gemini', voice, 'gemini_tts.py'))
+    candidates.append(('openai', None, 'openai_tts.py'))
+    candidates.append(('pyttsx3', None, 'pyttsx3_tts.py'))
+
+    providers = []
+    for engine, voice, script in candidates:
+        if _engine_configured(engine, script):
+            name = f"{engine}:{voice}" if voice else engine
+            providers.append(Provider(name, engine, voice, script, len(providers)))
+    return providers
+
+
+def provider_command(provider, text):
+    """Build the argv that speaks text with a provider."""
+    location = _script_location(provider.script)
+    argv = _launcher(location) + [location]
+    if provider.voice:
+        argv += ['--voice', provider.voice]
+    if provider.engine == 'elevenlabs' and not _is_windows_script(location):
+        argv.append('--no-fallback')  # Failover happens here; only our script has the flag
+    return argv + [text]
+
+
+def worker_socket_path():
+    """Return the resident TTS worker socket path."""
+    return socket_path('tts_worker', 'CLAUDE_TTS_WORKER_SOCKET')
+
+
+def _worker_enabled(provider=None):
+    if os.getenv('CLAUDE_TTS_WORKER', '1') == '0':
+        return False
+    if provider is not None and _is_windows_script(_script_location(provider.script)):
+        return False
+    # The worker needs its SDK dependencies, i.e. a uv on this side
+    return _launcher()[0] not in (WINDOWS_UV, sys.executable)
+
+
+def start_worker():
+    """Start the resident worker detached, at most once per WORKER_RESPAWN."""
+    global _worker_spawned_at
+    now = time.monotonic()
+    if _worker_spawned_at and now - _worker_spawned_at < WORKER_RESPAWN:
+        return
+    _worker_spawned_at = now
+    try:
+        spawn_detached(_launcher() + [str(TTS_DIR / 'tts_worker.py'), '--serve'])
+    except OSError:
+        pass
+
+
+def _speak_via_worker(provider, text, timeout):
+    """
+    Speak through the resident worker.
+
+    Returns:
+        tuple: (ok, error), or None if the worker is not running (it is
+        started for next time and the caller runs the engine script)
+    """
+    message = {'engine': provider.engine, 'voice': provider.voice, 'text': text}
+    try:
+        response = request(worker_socket_path(), message, timeout=timeout)
+    except (FileNotFoundError, ConnectionRefusedError):
+        start_worker()
+        return None
+    except (OSError, ValueError) as e:
+        return False, str(e)
+    if response.get('ok'):
+        return True, None
+    return False, response.get('error', 'worker error')
+
+
+class ProviderStats:
+    """
+    Rolling latency and error stats per provider and breaker state per
+    engine (under the 'breakers' key), persisted as JSON.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.getenv('CLAUDE_TTS_STATS') or DEFAULT_STATS_FILE).expanduser()
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, stats):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(stats, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def record(self, provider, ok, elapsed_ms, chars, error=None):
+        """Fold one outcome into the provider's stats and its engine's breaker."""
+        with file_lock(self.lock_path):
+            stats = self.load()
+            entry = stats.setdefault(provider.name, {'ok': 0, 'fail': 0, 'ms_per_char': None})
+            breaker = stats.setdefault('breakers', {}).setdefault(
+                provider.engine, {'consecutive_failures': 0, 'open_until': 0, 'trips': 0})
+            now = time.time()
+            if ok:
+                sample = elapsed_ms / max(chars, MIN_CHARS)
+                previous = entry['ms_per_char']
+                entry['ms_per_char'] = round(sample if previous is None
+                                             else previous + EWMA_ALPHA * (sample - previous), 2)
+                entry['ok'] += 1
+                breaker.update(consecutive_failures=0, open_until=0, trips=0)
+            else:
+                entry['fail'] += 1
+                entry['last_error'] = (error or '')[-200:]
+                breaker['consecutive_failures'] += 1
+                if breaker['consecutive_failures'] >= FAILURE_THRESHOLD:
+                    cooldown = min(COOLDOWN * (2 ** breaker['trips']), COOLDOWN_MAX)
+                    breaker['open_until'] = now + cooldown
+                    breaker['trips'] += 1
+            entry['last_used'] = now
+            self._save(stats)
+
+    def reset(self):
+        with file_lock(self.lock_path):
+            self._save({})
+
+
+def breaker_open(stats, engine, now=None):
+    """Return True if the engine is benched by its circuit breaker."""
+    now = now if now is not None else time.time()
+    return stats.get('breakers', {}).get(engine, {}).get('open_until', 0) > now
+
+
+def rank_providers(providers, stats, now=None):
+    """
+    Order the healthy providers for one announcement.
+
+    Returns:
+        list: Providers whose engine breaker is closed (or due a trial):
+        those within SLOW_FACTOR of the fastest in priority order, then the
+        slow ones fastest first
+    """
+    healthy = [p for p in providers if not breaker_open(stats, p.engine, now)]
+    measured = [stats[p.name]['ms_per_char'] for p in healthy
+                if stats.get(p.name, {}).get('ms_per_char') is not None]
+    fastest = min(measured) if measured else None
+
+    def key(provider):
+        value = stats.get(provider.name, {}).get('ms_per_char')
+        slow = value is not None and value > fastest * SLOW_FACTOR
+        return (slow, value if slow else 0, provider.priority)
+
+    return sorted(healthy, key=key)
+
+
+def speak_with_failover(text, providers=None, stats=None, timeout=SPEAK_TIMEOUT):
+    """
+    Speak text with the fastest healthy provider, failing over on errors.
+
+    Returns:
+        str: Name of the provider that spoke, or None if all failed
+    """
+    providers = configured_providers() if providers is None else providers
+    stats = stats or ProviderStats()
+    failed_engines = set()
+    for provider in rank_providers(providers, stats.load()):
+        if provider.engine in failed_engines:
+            continue
+        started = time.perf_counter()
+        outcome = None
+        if provider.engine in WORKER_ENGINES and _worker_enabled(provider):
+            outcome = _speak_via_worker(provider, text, timeout)
+        if outcome is not None:
+            ok, error = outcome
+        else:
+            try:
+                result = subprocess.run(provider_command(provider, text), capture_output=True,
+                                        text=True, timeout=timeout)
+                ok = result.returncode == 0
+                error = None if ok else (result.stdout + result.stderr).strip()
+            except (subprocess.TimeoutExpired, subprocess.SubprocessError, OSError) as e:
+                ok, error = False, str(e)
+        stats.record(provider, ok, (time.perf_counter() - started) * 1000, len(text), error)
+        if ok:
+            return provider.name
+        failed_engines.add(provider.engine)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TTS provider health and selection')
+    parser.add_argument('--say', help='Speak text through the selection logic')
+    parser.add_argument('--reset', action='store_true', help='Forget all provider stats')
+    args = parser.parse_args()
+
+    stats = ProviderStats()
+    if args.reset:
+        stats.reset()
+        print(f"Reset {stats.path}")
+    elif args.say:
+        spoken_by = speak_with_failover(args.say, stats=stats)
+        print(f"Spoken by {spoken_by}" if spoken_by else "All providers failed")
+        sys.exit(0 if spoken_by else 1)
+    else:
+        current = stats.load()
+        providers = configured_providers()
+        ranked = rank_providers(providers, current)
+        now = time.time()
+        for provider in providers:
+            entry = current.get(provider.name, {})
+            state = 'open' if breaker_open(current, provider.engine, now) else 'closed'
+            rank = ranked.index(provider) + 1 if provider in ranked else '-'
+            print(f"{rank!s:>2} {provider.name:<22} breaker={state:<6} "
+                  f"ms/char={entry.get('ms_per_char')} ok={entry.get('ok', 0)} "
+                  f"fail={entry.get('fail', 0)}")
+        if not providers:
+            print("No TTS providers configured")
+        elif not _worker_enabled():
+            print("Resident worker: disabled")
+        else:
+            try:
+                worker = request(worker_socket_path(), {'command': 'stats'}, timeout=2)
+                print(f"Resident worker: running {worker}")
+            except (OSError, ValueError):
+                print("Resident worker: not running (started on the next announcement)")
+
+
+if __name__ == '__main__':
+    main()
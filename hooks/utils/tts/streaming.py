@@ -0,0 +1,189 @@
+"""
+Play-while-downloading for streamed raw PCM.
+
+A streaming synthesis request yields audio chunks as they are generated.
+StreamPlayer writes them into a RingBuffer that a sounddevice output
+callback drains, so the first sound comes out as soon as the first chunk
+(plus a small pre-roll) has arrived instead of after the whole clip.
+Underruns play silence rather than stopping the stream.
+
+Each play records time-to-first-chunk (network + synthesis) and
+time-to-first-audio (first real samples handed to the device), both
+measured from when the request was issued, and appends them to the TTS
+metrics file.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+SAMPLE_RATE = 24000          # Matches the pcm_24000 output format
+SAMPLE_WIDTH = 2             # 16-bit signed little-endian mono
+RING_SECONDS = 10            # Ring capacity; the producer blocks when it is full
+PREROLL_SECONDS = 0.1        # Buffered audio before the device starts
+METRICS_FILE = Path('~/.claude/logs/tts_metrics.jsonl').expanduser()
+
+
+class RingBuffer:
+    """Fixed-size byte ring with a blocking writer and a non-blocking reader."""
+
+    def __init__(self, capacity):
+        self._buf = bytearray(capacity)
+        self._capacity = capacity
+        self._start = 0
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def write(self, data):
+        """Append bytes, blocking while the ring is full."""
+        view = memoryview(data)
+        while view:
+            with self._cond:
+                while self._size == self._capacity and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                end = (self._start + self._size) % self._capacity
+                n = min(len(view), self._capacity - self._size, self._capacity - end)
+                self._buf[end:end + n] = view[:n]
+                self._size += n
+                self._cond.notify_all()
+            view = view[n:]
+
+    def read_into(self, out):
+        """Copy up to len(out) bytes into out; returns the number copied."""
+        with self._cond:
+            n = min(len(out), self._size)
+            first = min(n, self._capacity - self._start)
+            out[:first] = self._buf[self._start:self._start + first]
+            out[first:n] = self._buf[:n - first]
+            self._start = (self._start + n) % self._capacity
+            self._size -= n
+            self._cond.notify_all()
+            return n
+
+    def wait_for(self, size, timeout=None):
+        """Block until at least `size` bytes are buffered or the writer finished."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._size >= size or self._closed, timeout)
+
+    def finish(self):
+        """Mark the end of the stream (readers drain what is left)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def finished(self):
+        with self._cond:
+            return self._closed and self._size == 0
+
+
+class StreamPlayer:
+    """Feeds an iterator of PCM chunks to the audio device as it arrives."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.bytes_per_second = sample_rate * SAMPLE_WIDTH
+
+    def play(self, chunks, started=None):
+        """
+        Play PCM chunks while they are still being downloaded.
+
+        Args:
+            chunks (iterable): Raw 16-bit mono PCM byte chunks
+            started (float): perf_counter() when the request was issued
+
+        Returns:
+            tuple: (pcm_bytes, metrics dict); metrics has an "error" key if
+            the stream failed part-way
+        """
+        import sounddevice
+
+        started = started if started is not None else time.perf_counter()
+        ring = RingBuffer(self.bytes_per_second * RING_SECONDS)
+        done = threading.Event()
+        metrics = {'first_chunk_ms': None, 'first_audio_ms': None, 'underruns': 0}
+        received = []
+
+        def callback(outdata, frames, time_info, status):
+            n = ring.read_into(outdata)
+            if n and metrics['first_audio_ms'] is None:
+                metrics['first_audio_ms'] = (time.perf_counter() - started) * 1000
+            if n < len(outdata):
+                outdata[n:] = b'\x00' * (len(outdata) - n)
+                if ring.finished:
+                    raise sounddevice.CallbackStop
+                metrics['underruns'] += 1
+
+        def produce():
+            try:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if metrics['first_chunk_ms'] is None:
+                        metrics['first_chunk_ms'] = (time.perf_counter() - started) * 1000
+                    received.append(chunk)
+                    ring.write(chunk)
+            except Exception as e:
+                metrics['error'] = str(e)
+            finally:
+                ring.finish()
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        ring.wait_for(int(self.bytes_per_second * PREROLL_SECONDS))
+        if ring.finished:
+            # Failed (or empty) before any audio arrived: don't open the device
+            producer.join()
+            return b'', metrics
+
+        stream = sounddevice.RawOutputStream(
+            samplerate=self.sample_rate, channels=1, dtype='int16',
+            callback=callback, finished_callback=done.set)
+        with stream:
+            done.wait()
+        producer.join()
+
+        pcm = b''.join(received)
+        metrics['total_ms'] = (time.perf_counter() - started) * 1000
+        metrics['audio_ms'] = len(pcm) / self.bytes_per_second * 1000
+        return pcm, metrics
+
+
+def pcm_to_wav(pcm, sample_rate=SAMPLE_RATE):
+    """Wrap raw 16-bit mono PCM in a WAV header (for the audio cache)."""
+    import io
+    import wave
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(SAMPLE_WIDTH)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+def wav_to_pcm(data):
+    """Return the PCM frames and sample rate of an in-memory WAV clip."""
+    import io
+    import wave
+    with wave.open(io.BytesIO(data), 'rb') as w:
+        return w.readframes(w.getnframes()), w.getframerate()
+
+
+def record_metrics(engine, metrics, **fields):
+    """Append one timing record to the TTS metrics file; failures are ignored."""
+    record = {'timestamp': datetime.now().isoformat(), 'engine': engine}
+    record.update(fields)
+    record.update({k: round(v, 1) if isinstance(v, float) else v for k, v in metrics.items()})
+    try:
+        METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(METRICS_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    except OSError:
+        pass
+    return record
@@ -0,0 +1,245 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# dependencies = [
+#     "elevenlabs",
+#     "google-cloud-texttospeech",
+#     "python-dotenv",
+#     "pygame",
+# ]
+# ///
+
+"""
+Resident TTS worker.
+
+Running an engine script per announcement pays the same setup every time:
+uv environment resolution, importing the SDKs, building an authenticated
+client, a fresh TLS connection (ElevenLabs) or gRPC channel plus OAuth
+token exchange (Google), and opening the audio device. That is 1-2 s
+before the first byte of audio is even requested.
+
+This worker does all of that once and then serves requests over a Unix
+socket. It keeps:
+- one client per engine, built on first use (or at startup for configured
+  engines). The ElevenLabs client holds a pooled keep-alive HTTP
+  connection; the Google client holds its gRPC channel, and its
+  credentials object caches the access token and only refreshes it when it
+  expires
+- one pygame mixer, opened at startup (see playback.py)
+- the audio cache, so repeated phrases are played without an API call
+
+Requests are {"engine": "elevenlabs" | "gemini", "voice": name or voice ID,
+"text": ...}. The response is sent after playback finished, so the caller
+(the provider layer, see providers.py) still measures the full latency and
+fails over on errors. Multi-sentence text is pipelined (see pipeline.py).
+Only one utterance plays at a time.
+
+Usage:
+- ./tts_worker.py --serve           # Run the worker in the foreground
+- ./tts_worker.py --say "Text" --engine gemini [--voice sulafat]
+- ./tts_worker.py --stop | --status
+
+Environment variables:
+- CLAUDE_TTS_WORKER_SOCKET: Socket path (default ~/.claude/run/tts_worker.sock)
+- CLAUDE_TTS_WORKER_IDLE: Seconds of inactivity before the worker exits (default 1800)
+- ELEVENLABS_API_KEY, GOOGLE_APPLICATION_CREDENTIALS, GEMINI_SPEED: As for
+  the engine scripts
+"""
+
+import argparse
+import os
+import sys
+import threading
+from pathlib import Path
+
+TTS_DIR = Path(__file__).resolve().parent
+HOOKS_DIR = TTS_DIR.parents[1]
+for path in (TTS_DIR, HOOKS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import elevenlabs_tts
+import gemini_tts
+from audio_cache import AudioCache, cache_key
+from pipeline import speak_pipelined, split_chunks
+from playback import Player
+from streaming import pcm_to_wav, record_metrics
+from utils.sockserve import request, serve, socket_path
+
+ENGINES = ('elevenlabs', 'gemini')
+DEFAULT_IDLE_TIMEOUT = 1800
+
+
+def get_socket_path():
+    """Return the worker socket path."""
+    return socket_path('tts_worker', 'CLAUDE_TTS_WORKER_SOCKET')
+
+
+def _gemini_speed():
+    try:
+        return float(os.getenv('GEMINI_SPEED') or 1.0)
+    except ValueError:
+        return 1.0
+
+
+class TTSWorker:
+    """Long-lived clients, mixer and cache shared by every request."""
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else AudioCache()
+        self.player = Player()
+        self._clients = {}
+        self._client_lock = threading.Lock()
+        self._speak_lock = threading.Lock()  # One utterance at a time on the shared mixer
+        self.spoken = 0
+        self.cache_hits = 0
+
+    def client(self, engine):
+        """Return the engine's client, building it on first use."""
+        with self._client_lock:
+            if engine not in self._clients:
+                if engine == 'elevenlabs':
+                    api_key = os.getenv('ELEVENLABS_API_KEY')
+                    if not api_key:
+                        raise RuntimeError("ELEVENLABS_API_KEY not set")
+                    self._clients[engine] = elevenlabs_tts.create_client(api_key)
+                elif engine == 'gemini':
+                    gemini_tts.setup_google_credentials()
+                    self._clients[engine] = gemini_tts.create_client()
+                else:
+                    raise ValueError(f"Unsupported engine: {engine}")
+            return self._clients[engine]
+
+    def warm(self, engines):
+        """Build clients and open the mixer ahead of the first request."""
+        for engine in engines:
+            try:
+                self.client(engine)
+            except Exception:
+                pass  # Reported on the first real request instead
+        try:
+            self.player.open()
+        except Exception:
+            pass
+
+    def synthesize(self, engine, voice_id, text, previous=None, following=None):
+        """
+        Return WAV audio for one chunk, from the audio cache when possible.
+
+        Cache keys match the engine scripts' (ElevenLabs PCM is stored as WAV
+        like its --stream mode), so the worker and the scripts share entries.
+        """
+        if engine == 'elevenlabs':
+            key = cache_key(engine, voice_id, elevenlabs_tts.MODEL_ID, 1.0, text)
+            cached = self.cache.get_bytes(key, ext='wav') or self.cache.get_bytes(key)
+        else:
+            key = cache_key(engine, voice_id, gemini_tts.MODEL_ID, _gemini_speed(), text)
+            cached = self.cache.get_bytes(key, ext='wav')
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        client = self.client(engine)
+        if engine == 'elevenlabs':
+            context = {}
+            if previous:
+                context['previous_text'] = previous
+            if following:
+                context['next_text'] = following
+            audio = pcm_to_wav(elevenlabs_tts.synthesize(
+                client, text, voice_id, output_format=elevenlabs_tts.STREAM_FORMAT, **context))
+        else:
+            audio = gemini_tts.synthesize(client, text, voice_id, _gemini_speed())
+        self.cache.put(key, audio, ext='wav')
+        return audio
+
+    def speak(self, engine, voice, text):
+        """
+        Synthesize and play text, blocking until playback finished.
+
+        Returns:
+            dict: Pipeline timing metrics
+        """
+        if engine == 'elevenlabs':
+            voice_id = elevenlabs_tts.VOICE_MAPPING.get(voice, voice) or elevenlabs_tts.DEFAULT_STREAM_VOICE_ID
+        elif engine == 'gemini':
+            voice_id = gemini_tts.VOICE_MAPPING.get(voice, voice) or gemini_tts.VOICE_MAPPING['sulafat']
+        else:
+            raise ValueError(f"Unsupported engine: {engine}")
+
+        chunks = split_chunks(text) or [text]
+        with self._speak_lock:
+            metrics = speak_pipelined(
+                chunks,
+                lambda chunk, previous, following: self.synthesize(engine, voice_id, chunk,
+                                                                    previous, following),
+                self.player.play_bytes)
+            self.spoken += 1
+        return record_metrics(engine, metrics, voice_id=voice_id, chars=len(text), mode='worker')
+
+
+def make_handler(worker):
+    """Build the socket request handler around the worker."""
+    def handle(message):
+        if message.get('command') == 'stats':
+            return {'pid': os.getpid(), 'spoken': worker.spoken, 'cache_hits': worker.cache_hits,
+                    'clients': sorted(worker._clients)}
+        text = message.get('text')
+        if not text:
+            return {'error': 'missing text'}
+        metrics = worker.speak(message.get('engine'), message.get('voice'), text)
+        return {'ok': True, 'first_audio_ms': metrics.get('first_audio_ms')}
+    return handle
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident TTS worker')
+    parser.add_argument('--serve', action='store_true', help='Run the worker in the foreground')
+    parser.add_argument('--say', help='Speak text through a running worker')
+    parser.add_argument('--engine', choices=ENGINES, default='elevenlabs', help='Engine for --say')
+    parser.add_argument('--voice', help='Voice name or ID for --say')
+    parser.add_argument('--stop', action='store_true', help='Stop a running worker')
+    parser.add_argument('--status', action='store_true', help='Report worker status')
+    args = parser.parse_args()
+
+    path = get_socket_path()
+
+    if args.serve:
+        elevenlabs_tts.load_env()
+        from utils.tts.providers import configured_providers
+        worker = TTSWorker()
+        configured = {p.engine for p in configured_providers()}
+        threading.Thread(target=worker.warm, args=([e for e in ENGINES if e in configured],),
+                         daemon=True).start()
+        idle = float(os.getenv('CLAUDE_TTS_WORKER_IDLE', DEFAULT_IDLE_TIMEOUT))
+        try:
+            serve(path, make_handler(worker), idle_timeout=idle)
+        finally:
+            worker.player.close()
+    elif args.say:
+        try:
+            response = request(path, {'engine': args.engine, 'voice': args.voice, 'text': args.say},
+                               timeout=60)
+        except (OSError, ValueError) as e:
+            print(f"tts_worker is not running: {e}")
+            sys.exit(1)
+        print(response)
+        sys.exit(0 if response.get('ok') else 1)
+    elif args.stop:
+        try:
+            request(path, {'command': 'shutdown'}, timeout=2)
+            print("Stopped tts_worker")
+        except (OSError, ValueError):
+            print("tts_worker is not running")
+    elif args.status:
+        try:
+            stats = request(path, {'command': 'stats'}, timeout=2)
+            print(f"tts_worker running on {path}: {stats}")
+        except (OSError, ValueError):
+            print("tts_worker is not running")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
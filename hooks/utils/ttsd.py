@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Fire-and-forget announcement queue for the TTS hooks.
+
+Stop, SubagentStop and Notification used to run the TTS command
+synchronously, blocking Claude for the whole synthesis and playback. They
+now call announce(), which hands the message to this daemon over a Unix
+socket and returns immediately. The daemon plays announcements one at a
+time on a worker thread.
+
+Announcements carry a coalescing key. While one is playing (and for a
+short window after the first arrives), a new announcement with the same key
+replaces the pending one instead of queuing behind it, so a burst of
+parallel subagents finishing produces one "3 subagents complete" instead of
+three stacked clips. Announcements left waiting longer than MAX_AGE are
+dropped.
+
+If the daemon is not running, announce() starts it detached with the
+message on its command line, so the first announcement is not lost and the
+hook still does not wait.
+
+Usage:
+- ./ttsd.py --serve               # Run the daemon in the foreground
+- ./ttsd.py --say "Text" [--key stop]
+- ./ttsd.py --stop | --status
+
+Environment variables:
+- CLAUDE_TTSD_SOCKET: Socket path (default ~/.claude/run/ttsd.sock)
+- CLAUDE_TTSD_IDLE: Seconds of inactivity before the daemon exits (default 1800)
+- CLAUDE_TTS_COMMAND: Command that speaks its last argument, bypassing
+  provider selection (default: utils/tts/providers.py picks the fastest
+  healthy provider and fails over)
+"""
+
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1]
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+from utils.sockserve import is_running, request, serve, socket_path, spawn_detached
+
+DEFAULT_IDLE_TIMEOUT = 1800
+COALESCE_WINDOW = 0.4  # Seconds to wait for more announcements before speaking
+MAX_AGE = 60           # Seconds before a pending announcement is stale
+SPEAK_TIMEOUT = 30
+
+
+def get_socket_path():
+    """Return the daemon socket path."""
+    return socket_path('ttsd', 'CLAUDE_TTSD_SOCKET')
+
+
+def speak(text):
+    """Speak synchronously through the provider layer; failures are ignored."""
+    override = os.getenv('CLAUDE_TTS_COMMAND')
+    if not override:
+        from utils.tts.providers import speak_with_failover
+        speak_with_failover(text, timeout=SPEAK_TIMEOUT)
+        return
+    try:
+        subprocess.run(shlex.split(override) + [text], capture_output=True, timeout=SPEAK_TIMEOUT)
+    except (subprocess.TimeoutExpired, subprocess.SubprocessError, OSError):
+        pass
+
+
+class AnnouncementQueue:
+    """Pending announcements keyed for coalescing, drained by one worker."""
+
+    def __init__(self, speaker=speak):
+        self._speaker = speaker
+        self._pending = OrderedDict()  # key -> announcement
+        self._cond = threading.Condition()
+        self.spoken = 0
+        self.coalesced = 0
+
+    def put(self, text, key=None, many=None):
+        """
+        Queue an announcement.
+
+        Args:
+            text (str): What to say
+            key (str): Coalescing key; defaults to the text itself
+            many (str): Template used when several announcements with this
+                key coalesce, e.g. "{count} subagents complete"
+        """
+        key = key or text
+        with self._cond:
+            entry = self._pending.get(key)
+            if entry:
+                entry['count'] += 1
+                entry['text'] = text
+                entry['many'] = many or entry['many']
+                self.coalesced += 1
+            else:
+                self._pending[key] = {'text': text, 'many': many, 'count': 1,
+                                      'queued': time.monotonic()}
+            self._cond.notify()
+
+    def _next(self):
+        """Block until an announcement is due, then pop it."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            first = next(iter(self._pending.values()))
+            # Let a burst of announcements arrive and coalesce. Every put()
+            # notifies, so keep waiting until the whole window has passed.
+            while True:
+                delay = first['queued'] + COALESCE_WINDOW - time.monotonic()
+                if delay <= 0:
+                    break
+                self._cond.wait(delay)
+            _, entry = self._pending.popitem(last=False)
+            return entry
+
+    def run(self):
+        """Worker loop: speak announcements one at a time."""
+        while True:
+            entry = self._next()
+            if time.monotonic() - entry['queued'] > MAX_AGE:
+                continue
+            text = entry['text']
+            if entry['count'] > 1 and entry['many']:
+                text = entry['many'].format(count=entry['count'])
+            self._speaker(text)
+            self.spoken += 1
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending)
+
+
+def make_handler(queue):
+    """Build the socket request handler around the announcement queue."""
+    def handle(message):
+        if message.get('command') == 'stats':
+            return {'pending': queue.pending(), 'spoken': queue.spoken,
+                    'coalesced': queue.coalesced}
+        text = message.get('text')
+        if not text:
+            return {'error': 'missing text'}
+        queue.put(text, message.get('key'), message.get('many'))
+        return {'ok': True}
+    return handle
+
+
+def announce(text, key=None, many=None):
+    """
+    Queue an announcement without waiting for it to be spoken.
+
+    Returns immediately: the message is sent to a running daemon, or a
+    daemon is started detached with the message as its first announcement.
+    """
+    message = {'text': text, 'key': key, 'many': many}
+    try:
+        request(get_socket_path(), message, timeout=0.5)
+        return
+    except (OSError, ValueError):
+        pass
+    argv = [sys.executable, str(Path(__file__).resolve()), '--serve', '--say', text]
+    if key:
+        argv += ['--key', key]
+    if many:
+        argv += ['--many', many]
+    try:
+        spawn_detached(argv)
+    except OSError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TTS announcement daemon')
+    parser.add_argument('--serve', action='store_true', help='Run the daemon in the foreground')
+    parser.add_argument('--say', help='Announcement to queue')
+    parser.add_argument('--key', help='Coalescing key for --say')
+    parser.add_argument('--many', help='Coalesced text template for --say, e.g. "{count} done"')
+    parser.add_argument('--stop', action='store_true', help='Stop a running daemon')
+    parser.add_argument('--status', action='store_true', help='Report daemon status')
+    args = parser.parse_args()
+
+    path = get_socket_path()
+
+    if args.serve:
+        message = {'text': args.say, 'key': args.key, 'many': args.many}
+        if is_running(path):
+            # Another instance won the startup race; hand it our announcement
+            if args.say:
+                request(path, message)
+            return
+
+        # Provider credentials and CLAUDE_TTS_COMMAND may live in .claude/.env
+        from utils.env import load_env
+        load_env()
+
+        queue = AnnouncementQueue()
+        if args.say:
+            queue.put(args.say, args.key, args.many)
+        threading.Thread(target=queue.run, daemon=True).start()
+        idle = float(os.getenv('CLAUDE_TTSD_IDLE', DEFAULT_IDLE_TIMEOUT))
+        try:
+            started = serve(path, make_handler(queue), idle_timeout=idle)
+        except OSError:
+            started = False
+        if not started and args.say:
+            # Another instance bound the socket between the check and the bind
+            request(path, message)
+    elif args.say:
+        announce(args.say, args.key, args.many)
+    elif args.stop:
+        try:
+            request(path, {'command': 'shutdown'}, timeout=2)
+            print("Stopped ttsd")
+        except (OSError, ValueError):
+            print("ttsd is not running")
+    elif args.status:
+        try:
+            stats = request(path, {'command': 'stats'}, timeout=2)
+            print(f"ttsd running on {path}: {stats}")
+        except (OSError, ValueError):
+            print("ttsd is not running")
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()